@@ -369,13 +369,14 @@ import streamlit as st
 from pathlib import Path
 import json
 from datetime import datetime
-import tempfile
-import os
 import pandas as pd
 
 from src.advanced_rag import AdvancedRAGSystem
 from src.pdf_extractor import PDFExtractor
-from src.comparator import EnhancedDocumentComparator
+from src.extraction_cache import get_extraction_cache
+from src.table_strategy import get_table_strategy_memo
+from src.comparator import EnhancedDocumentComparator, ItemComparisonTable
+from src.comparison_cache import get_comparison_cache
 from src.report_generator import generate_all_reports
 from src.llm_chains import LLMChainOrchestrator, MultiTurnChatChain
 from src.config import settings
@@ -408,19 +409,18 @@ def initialize_session():
         st.session_state.messages = []
 
 def extract_pdf_content(pdf_file):
-    extractor = PDFExtractor()
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(pdf_file.read())
-        tmp_path = tmp_file.name
+    extractor = PDFExtractor(
+        cache=get_extraction_cache(),
+        page_workers=settings.EXTRACTION_PAGE_WORKERS,
+        strategy_memo=get_table_strategy_memo()
+    )
 
     try:
-        doc = extractor.extract_pdf(Path(tmp_path))
+        # Parsed straight from the upload buffer, no temp file
+        doc = extractor.extract_pdf(pdf_file.getvalue(), name=pdf_file.name)
         return doc, None
     except Exception as e:
         return None, str(e)
-    finally:
-        os.unlink(tmp_path)
 
 def display_document_summary(doc):
     """Enhanced document summary with discount information"""
@@ -647,8 +647,20 @@ def handle_document_comparison():
         if po_doc and invoice_doc:
             if st.button("🔄 Compare Documents", key="compare_btn", type="primary"):
                 with st.spinner("Comparing documents..."):
-                    comparator = EnhancedDocumentComparator()
-                    comparison = comparator.compare(po_doc, invoice_doc)
+                    comparator = EnhancedDocumentComparator(cache=get_comparison_cache())
+                    comparison = comparator.cached_result(po_doc, invoice_doc)
+                    if comparison is None:
+                        stream = comparator.stream(po_doc, invoice_doc)
+                        progress = st.empty()
+                        chunks = []
+                        for chunk in stream.chunks():
+                            chunks.append(chunk)
+                            progress.caption(
+                                f"Compared {stream.totals.items_compared:,} items - "
+                                f"{stream.totals.discrepant_items:,} discrepancies so far"
+                            )
+                        progress.empty()
+                        comparison = stream.to_comparison(ItemComparisonTable.concat(chunks))
                     st.session_state.comparison_results = comparison
                     st.session_state.po_doc = po_doc
                     st.session_state.invoice_doc = invoice_doc
@@ -721,7 +733,9 @@ def handle_document_comparison():
                                     file_name = Path(path).name
 
                                     # Determine MIME type
-                                    if fmt == 'json':
+                                    if file_name.endswith(('.gz', '.zst')):
+                                        mime = "application/octet-stream"
+                                    elif fmt == 'json':
                                         mime = "application/json"
                                     elif fmt == 'csv':
                                         mime = "text/csv"
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark: EnhancedDocumentComparator per-item path vs vectorized engine.
+
+Builds synthetic PO / invoice LineItemTables from 10 up to 1,000,000 lines
+(a share of invoice lines altered, dropped or added, as in
+synthetic_corpus.py) and times compare() with vectorized=False and
+vectorized=True. At sizes up to --verify-max both results are checked to be
+identical item by item; the per-item path is skipped above --python-max.
+
+Usage:
+    python benchmarks/bench_compare.py
+    python benchmarks/bench_compare.py --sizes 1000 100000 --python-max 100000 --json compare.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItemTable
+from src.comparator import EnhancedDocumentComparator
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_documents(lines: int, discrepancy_rate: float, seed: int):
+    """PO and invoice documents with ~discrepancy_rate of invoice lines changed"""
+    rng = np.random.default_rng(seed)
+    quantity = rng.integers(1, 60, lines).astype(np.float64)
+    unit_price = np.round(rng.uniform(2, 400, lines), 2)
+    discount_pct = rng.choice([0.0, 0.0, 5.0, 6.0, 7.0, 10.0], lines)
+
+    def columns(skus, qty, price, pct):
+        subtotal = qty * price
+        discount = subtotal * pct / 100
+        taxable = subtotal - discount
+        return {
+            'item_no': skus,
+            'description': [f"Product {sku}" for sku in skus],
+            'unit': [''] * len(skus),
+            'quantity': qty, 'unit_price': price, 'discount_pct': pct,
+            'discount_amount': discount, 'taxable_amount': taxable, 'total_price': taxable,
+        }
+
+    skus = [f"A{1001 + i}" for i in range(lines)]
+    po = columns(skus, quantity, unit_price, discount_pct)
+
+    kind = np.where(rng.random(lines) < discrepancy_rate, rng.integers(0, 4, lines), -1)
+    inv_qty = np.where(kind == 1, np.maximum(1.0, quantity + 2), quantity)
+    inv_price = np.where(kind == 0, np.round(unit_price * 1.05, 2), unit_price)
+    inv_pct = np.where(kind == 2, np.maximum(0.0, discount_pct - 2), discount_pct)
+    keep = kind != 3
+    inv_skus = [sku for sku, k in zip(skus, keep) if k] + [f"X{9000 + lines}"]
+    invoice = columns(
+        inv_skus,
+        np.append(inv_qty[keep], 1.0),
+        np.append(inv_price[keep], 45.0),
+        np.append(inv_pct[keep], 0.0),
+    )
+
+    def document(cols, doc_type):
+        items = LineItemTable.from_columns(cols)
+        return ExtractedDocument(
+            metadata=DocumentMetadata(doc_type, "BENCH", "2025-12-12", "Bench Supplies", "Bench Customer"),
+            items=items,
+            subtotal=float(items.column('taxable_amount').sum()),
+            total=float(items.column('total_price').sum()),
+        )
+
+    return document(po, 'PURCHASE_ORDER'), document(invoice, 'PROFORMA_INVOICE')
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--discrepancy-rate', type=float, default=0.05)
+    parser.add_argument('--python-max', type=int, default=100_000,
+                        help='largest size to run the per-item path on')
+    parser.add_argument('--verify-max', type=int, default=10_000,
+                        help='largest size to check both paths give identical items')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', type=Path, help='also write results to this file')
+    args = parser.parse_args()
+
+    vectorized = EnhancedDocumentComparator(vectorized=True)
+    per_item = EnhancedDocumentComparator(vectorized=False)
+
+    results = []
+    for lines in args.sizes:
+        po_doc, invoice_doc = make_documents(lines, args.discrepancy_rate, args.seed)
+        fast, fast_seconds = timed(lambda: vectorized.compare(po_doc, invoice_doc))
+
+        slow_seconds = None
+        verified = None
+        if lines <= args.python_max:
+            slow, slow_seconds = timed(lambda: per_item.compare(po_doc, invoice_doc))
+            if lines <= args.verify_max:
+                verified = (
+                    [repr(asdict(item)) for item in fast.item_level_comparison]
+                    == [repr(asdict(item)) for item in slow.item_level_comparison]
+                    and fast.products_with_mismatches == slow.products_with_mismatches
+                    and fast.summary_text == slow.summary_text
+                )
+
+        results.append({
+            'lines': lines,
+            'items_compared': len(fast.item_level_comparison),
+            'discrepant_items': fast.discrepant_items,
+            'per_item_seconds': round(slow_seconds, 4) if slow_seconds is not None else None,
+            'vectorized_seconds': round(fast_seconds, 4),
+            'speedup': round(slow_seconds / fast_seconds, 1) if slow_seconds else None,
+            'vectorized_lines_per_second': round(lines / fast_seconds) if fast_seconds else None,
+            'identical': verified,
+        })
+
+    print(f"\n{'lines':>9} {'compared':>9} {'discrep':>8} {'per-item s':>11} {'vector s':>9} "
+          f"{'speedup':>8} {'lines/s':>11} {'identical':>9}")
+    for r in results:
+        per_item_s = f"{r['per_item_seconds']:.4f}" if r['per_item_seconds'] is not None else '-'
+        speedup = f"{r['speedup']:.1f}x" if r['speedup'] is not None else '-'
+        identical = {True: 'yes', False: 'NO', None: '-'}[r['identical']]
+        print(f"{r['lines']:>9} {r['items_compared']:>9} {r['discrepant_items']:>8} {per_item_s:>11} "
+              f"{r['vectorized_seconds']:>9.4f} {speedup:>8} {r['vectorized_lines_per_second'] or 0:>11} "
+              f"{identical:>9}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+    if any(r['identical'] is False for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
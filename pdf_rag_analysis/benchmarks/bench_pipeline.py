@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+End-to-end benchmark: extraction -> comparison -> reports, per size tier.
+
+For each tier a synthetic corpus of PO/PI pairs is generated (see
+synthetic_corpus.py), then a fresh Python process runs PDFExtractor,
+EnhancedDocumentComparator.compare and generate_all_reports over it so the
+reported peak RSS belongs to that tier alone. Throughput is given as
+extracted line items per second and pairs per second.
+
+Usage:
+    python benchmarks/bench_pipeline.py                      # default tiers
+    python benchmarks/bench_pipeline.py --tiers small medium --json bench.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+# name: (pairs, rows per document, rows per page, discrepancy rate)
+TIERS = {
+    'small': (10, 20, 25, 0.1),
+    'medium': (5, 200, 25, 0.1),
+    'large': (2, 1000, 40, 0.1),
+    'xlarge': (1, 5000, 40, 0.05),
+}
+DEFAULT_TIERS = ['small', 'medium', 'large']
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def run_tier(corpus_dir: Path) -> dict:
+    """Runs inside the child process: the measured pipeline over one corpus"""
+    from src.pdf_extractor import PDFExtractor
+    from src.comparator import EnhancedDocumentComparator
+    from src.report_generator import generate_all_reports
+
+    extractor = PDFExtractor()
+    comparator = EnhancedDocumentComparator()
+    reports_dir = corpus_dir / "reports"
+
+    timings = {'extract': 0.0, 'compare': 0.0, 'reports': 0.0}
+    # Per-format writer time within 'reports' (writers overlap, so these can sum past it)
+    report_seconds = {}
+    items = 0
+    pairs = 0
+    pages = 0
+
+    for po_path in sorted(corpus_dir.glob("Purchase_Order_*.pdf")):
+        pi_path = po_path.with_name(po_path.name.replace("Purchase_Order_", "Proforma_Invoice_"))
+
+        start = time.perf_counter()
+        po_doc = extractor.extract_pdf(po_path)
+        pi_doc = extractor.extract_pdf(pi_path)
+        timings['extract'] += time.perf_counter() - start
+        items += len(po_doc.items) + len(pi_doc.items)
+        pages += len(po_doc.raw_text.pages) + len(pi_doc.raw_text.pages)
+
+        start = time.perf_counter()
+        comparison = comparator.compare(po_doc, pi_doc)
+        timings['compare'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        report_timings = {}
+        generate_all_reports(comparison, reports_dir / po_path.stem, po_doc, pi_doc, timings=report_timings)
+        timings['reports'] += time.perf_counter() - start
+        for name, seconds in report_timings.items():
+            report_seconds[name] = report_seconds.get(name, 0.0) + seconds
+        pairs += 1
+
+    total = sum(timings.values())
+    return {
+        'pairs': pairs,
+        'pages': pages,
+        'line_items': items,
+        'seconds': {k: round(v, 4) for k, v in timings.items()},
+        'total_seconds': round(total, 4),
+        'report_seconds': {k: round(v, 4) for k, v in report_seconds.items()},
+        'items_per_second_extract': round(items / timings['extract'], 1) if timings['extract'] else None,
+        'pairs_per_second': round(pairs / total, 3) if total else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1) if peak_rss_mb() is not None else None,
+    }
+
+
+def benchmark_tier(name: str, work_dir: Path, seed: int) -> dict:
+    from synthetic_corpus import generate_pair
+
+    pairs, rows, rows_per_page, rate = TIERS[name]
+    corpus_dir = work_dir / name
+    for pair_id in range(pairs):
+        generate_pair(corpus_dir, pair_id, rows, discrepancy_rate=rate,
+                      rows_per_page=rows_per_page, seed=seed)
+
+    # Fresh interpreter so ru_maxrss is this tier's peak, not the generator's
+    proc = subprocess.run(
+        [sys.executable, __file__, '--run-tier', str(corpus_dir)],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"tier {name} failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result.update({'tier': name, 'rows_per_document': rows, 'discrepancy_rate': rate})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--tiers', nargs='+', choices=list(TIERS), default=DEFAULT_TIERS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', type=Path, help='also write results to this file')
+    parser.add_argument('--run-tier', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_tier:
+        # Child mode: keep stdout to the JSON result line
+        import contextlib
+        import io
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_tier(args.run_tier)
+        print(json.dumps(result))
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="pdf_bench_") as tmp:
+        for name in args.tiers:
+            print(f"  ⏱  tier {name} ...", flush=True)
+            results.append(benchmark_tier(name, Path(tmp), args.seed))
+
+    print(f"\n{'tier':<8} {'pairs':>5} {'rows':>6} {'pages':>6} {'extract s':>10} {'compare s':>10} "
+          f"{'reports s':>10} {'items/s':>10} {'pairs/s':>8} {'peak MB':>8}")
+    for r in results:
+        print(f"{r['tier']:<8} {r['pairs']:>5} {r['rows_per_document']:>6} {r['pages']:>6} "
+              f"{r['seconds']['extract']:>10.3f} {r['seconds']['compare']:>10.3f} "
+              f"{r['seconds']['reports']:>10.3f} {r['items_per_second_extract'] or 0:>10.1f} "
+              f"{r['pairs_per_second'] or 0:>8.3f} {r['peak_rss_mb'] or 0:>8.1f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark: PDFExtractor._parse_table_custom rows/second.
+
+Compares the previous per-cell parser (header rescanned for every table,
+re.sub on every cell) with the cached column plan + column-wise number
+parsing, on synthetic PO and PI tables. Also checks that both produce
+identical LineItems.
+
+Usage: python benchmarks/bench_table_parse.py [--rows 200] [--tables 500]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.pdf_extractor import PDFExtractor, LineItem
+
+PO_HEADER = ['SKU', 'Description', 'Qty', 'Unit Price', 'Discount %', 'Tax %',
+             'Line Subtotal', 'Discount Amount', 'Taxable Amount', 'Tax Amount', 'Line Total']
+PI_HEADER = ['SKU', 'Description', 'Qty', 'Unit Price (PI)', 'Discount % (PI)', 'Tax % (PI)',
+             'Line Subtotal (PI)', 'Discount Amount (PI)', 'Taxable Amount (PI)',
+             'Tax Amount (PI)', 'Line Total (PI)']
+
+
+def make_table(header, rows, rng):
+    table = [header]
+    for i in range(rows):
+        qty = rng.randint(1, 50)
+        price = round(rng.uniform(1, 500), 2)
+        disc = rng.choice([0, 5, 10])
+        subtotal = qty * price
+        disc_amt = subtotal * disc / 100
+        taxable = subtotal - disc_amt
+        tax = taxable * 0.075
+        table.append([
+            f"A{1000 + i}", f"Item {i}", str(qty), f"{price:,}", str(disc), '7.5',
+            f"{subtotal:.2f}", f"{disc_amt:.3f}", f"{taxable:.3f}", f"{tax:.4f}",
+            f"${taxable + tax:,.4f}",
+        ])
+    # The odd blank row and empty cell, as pdfplumber produces them
+    table.append(['', None, '', '', '', '', '', '', '', '', ''])
+    table[1][4] = ''
+    return table
+
+
+def legacy_parse_table(extractor, table):
+    """_parse_table_custom as it was before the column plan cache"""
+    items = []
+    if not table or len(table) < 2:
+        return items
+
+    header = table[0]
+    header_lower = [str(h).lower().strip() if h else "" for h in header]
+
+    sku_idx = extractor._find_exact_column(header_lower, ['sku'])
+    desc_idx = extractor._find_exact_column(header_lower, ['description'])
+    qty_idx = extractor._find_exact_column(header_lower, ['qty'])
+
+    def first_containing(fragment):
+        for i, h in enumerate(header_lower):
+            if fragment in h:
+                return i
+        return None
+
+    price_idx = first_containing('unit price')
+    discount_pct_idx = first_containing('discount %')
+    discount_amt_idx = first_containing('discount amount')
+    taxable_idx = first_containing('taxable amount')
+    total_idx = first_containing('line total')
+
+    def parse_number(value):
+        if not value or value == 'None':
+            return 0.0
+        try:
+            cleaned = re.sub(r'[^\d.-]', '', str(value))
+            return float(cleaned) if cleaned and cleaned != '-' else 0.0
+        except (ValueError, TypeError):
+            return 0.0
+
+    def cell(row, idx):
+        return parse_number(str(row[idx])) if idx is not None and idx < len(row) else 0.0
+
+    for row in table[1:]:
+        if not row or all(not c or str(c).strip() == '' for c in row):
+            continue
+        sku = str(row[sku_idx]).strip() if sku_idx is not None and sku_idx < len(row) and row[sku_idx] else "UNKNOWN"
+        desc = str(row[desc_idx]).strip() if desc_idx is not None and desc_idx < len(row) and row[desc_idx] else sku
+        qty = cell(row, qty_idx)
+        unit_price = cell(row, price_idx)
+        if qty > 0 and unit_price > 0:
+            items.append(LineItem(
+                item_no=sku, description=desc, unit="EA", quantity=qty, unit_price=unit_price,
+                discount_pct=cell(row, discount_pct_idx), discount_amount=cell(row, discount_amt_idx),
+                taxable_amount=cell(row, taxable_idx), total_price=cell(row, total_idx)
+            ))
+    return items
+
+
+def run(label, parse, tables):
+    rows = sum(len(t) - 1 for t in tables)
+    start = time.perf_counter()
+    for table in tables:
+        parse(table)
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed else float('inf')
+    print(f"  {label:<8} {rows:>9,} rows in {elapsed:7.3f}s  ->  {rate:>12,.0f} rows/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=200, help='rows per table')
+    parser.add_argument('--tables', type=int, default=500, help='tables per run')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tables = [make_table(PO_HEADER if i % 2 == 0 else PI_HEADER, args.rows, rng)
+              for i in range(args.tables)]
+    extractor = PDFExtractor()
+
+    for table in tables[:10]:
+        assert legacy_parse_table(extractor, table) == extractor._parse_table_custom(table)
+
+    print(f"\n_parse_table_custom: {args.tables} tables x {args.rows} rows")
+    before = run("before", lambda t: legacy_parse_table(extractor, t), tables)
+    after = run("after", extractor._parse_table_custom, tables)
+    print(f"  speedup  {after / before:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
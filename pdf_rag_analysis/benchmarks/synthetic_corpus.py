@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+"""
+Synthetic Purchase Order / Proforma Invoice PDF generator.
+
+Writes PO/PI pairs with ReportLab in the same layout as the sample documents
+in data/: landscape A4, a gridded line-item table with the exact PO and PI
+column headers _parse_table_custom expects, and a Metric/Amount summary
+table on its own page. Row count, rows per page (and so page count),
+whether the header repeats on continuation pages, and the share of PI lines
+that disagree with the PO are all configurable.
+
+Usage: python benchmarks/synthetic_corpus.py --out bench_corpus --pairs 5 --rows 200
+"""
+
+import argparse
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+except ImportError:
+    print("❌ ERROR: reportlab not installed!")
+    print("   Install it with: pip install reportlab")
+    sys.exit(1)
+
+PO_HEADER = ['SKU', 'Description', 'Qty', 'Unit Price', 'Discount %', 'Tax %',
+             'Line Subtotal', 'Discount Amount', 'Taxable Amount', 'Tax Amount', 'Line Total']
+PI_HEADER = ['SKU', 'Description', 'Qty', 'Unit Price (PI)', 'Discount % (PI)', 'Tax % (PI)',
+             'Line Subtotal (PI)', 'Discount Amount (PI)', 'Taxable Amount (PI)',
+             'Tax Amount (PI)', 'Line Total (PI)']
+
+PRODUCTS = ['Wireless Mouse', 'Mechanical Keyboard', 'USB-C Hub', 'Monitor 27in', 'Webcam HD',
+            'Laptop Stand', 'Portable SSD', 'HDMI Cable', 'Laser Printer', 'Office Chair',
+            'Desk Lamp', 'Headset', 'Docking Station', 'Toner Cartridge', 'Surge Protector']
+
+TAX_PCT = 7.5
+
+
+@dataclass
+class SyntheticLine:
+    sku: str
+    description: str
+    qty: float
+    unit_price: float
+    discount_pct: float
+
+    def cells(self) -> List[str]:
+        subtotal = self.qty * self.unit_price
+        discount = subtotal * self.discount_pct / 100
+        taxable = subtotal - discount
+        tax = taxable * TAX_PCT / 100
+        return [self.sku, self.description, f"{self.qty:g}", f"{self.unit_price:g}",
+                f"{self.discount_pct:g}", f"{TAX_PCT:g}", f"{subtotal:.2f}", f"{discount:.4f}",
+                f"{taxable:.4f}", f"{tax:.4f}", f"{taxable + tax:.4f}"]
+
+    def amounts(self) -> Tuple[float, float, float, float]:
+        subtotal = self.qty * self.unit_price
+        discount = subtotal * self.discount_pct / 100
+        taxable = subtotal - discount
+        return subtotal, discount, taxable, taxable * TAX_PCT / 100
+
+
+def make_lines(rows: int, discrepancy_rate: float, rng: random.Random) -> Tuple[List[SyntheticLine], List[SyntheticLine]]:
+    """PO lines and the matching PI lines with ~discrepancy_rate of them altered"""
+    po_lines = []
+    for i in range(rows):
+        po_lines.append(SyntheticLine(
+            sku=f"A{1001 + i}",
+            description=f"{PRODUCTS[i % len(PRODUCTS)]} #{i + 1}",
+            qty=float(rng.randint(1, 60)),
+            unit_price=round(rng.uniform(2, 400), 2),
+            discount_pct=float(rng.choice([0, 0, 5, 6, 7, 10])),
+        ))
+
+    pi_lines = []
+    for line in po_lines:
+        if rng.random() >= discrepancy_rate:
+            pi_lines.append(SyntheticLine(**vars(line)))
+            continue
+        kind = rng.choice(['price', 'qty', 'discount', 'missing'])
+        if kind == 'missing':
+            continue
+        altered = SyntheticLine(**vars(line))
+        if kind == 'price':
+            altered.unit_price = round(line.unit_price * rng.uniform(1.02, 1.3), 2)
+        elif kind == 'qty':
+            altered.qty = max(1.0, line.qty + rng.choice([-5, -2, 2, 5]))
+        else:
+            altered.discount_pct = max(0.0, line.discount_pct - 2)
+        pi_lines.append(altered)
+
+    # Occasional extra line only on the invoice
+    if discrepancy_rate > 0 and rows >= 10:
+        pi_lines.append(SyntheticLine(f"X{9000 + rows}", "Freight Surcharge", 1.0, 45.0, 0.0))
+
+    return po_lines, pi_lines
+
+
+def write_document(
+    path: Path,
+    title: str,
+    doc_ref: str,
+    header: List[str],
+    lines: List[SyntheticLine],
+    rows_per_page: int = 25,
+    repeat_header: bool = True
+):
+    styles = getSampleStyleSheet()
+    grid = TableStyle([
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+    ])
+
+    story = [
+        Paragraph("[Company Logo Here]", styles['Normal']),
+        Paragraph("Infinity Supplies", styles['Heading2']),
+        Paragraph("DIFC, Dubai, UAE", styles['Normal']),
+        Paragraph(title, styles['Title']),
+        Paragraph(doc_ref, styles['Normal']),
+        Paragraph("Date: 2025-12-12", styles['Normal']),
+        Paragraph("Details", styles['Heading3']),
+    ]
+
+    for start in range(0, max(len(lines), 1), rows_per_page):
+        chunk = [line.cells() for line in lines[start:start + rows_per_page]]
+        if start == 0 or repeat_header:
+            chunk = [header] + chunk
+        story.append(Table(chunk, style=grid))
+        story.append(PageBreak())
+
+    subtotal = discount = taxable = tax = 0.0
+    for line in lines:
+        s, d, t, x = line.amounts()
+        subtotal += s
+        discount += d
+        taxable += t
+        tax += x
+
+    story.append(Paragraph("Summary", styles['Heading3']))
+    story.append(Table([
+        ['Metric', 'Amount'],
+        ['Subtotal', f"{subtotal:.4f}"],
+        ['Discounts', f"{discount:.4f}"],
+        ['Taxable', f"{taxable:.4f}"],
+        ['Tax', f"{tax:.4f}"],
+        ['Grand Total', f"{taxable + tax:.4f}"],
+    ], style=grid))
+    story.append(Spacer(1, 12))
+    story.append(Paragraph("Confidential - Generated by Infinity Supplies System", styles['Normal']))
+
+    SimpleDocTemplate(str(path), pagesize=landscape(A4)).build(story)
+
+
+def generate_pair(
+    out_dir: Path,
+    pair_id: int,
+    rows: int,
+    discrepancy_rate: float = 0.1,
+    rows_per_page: int = 25,
+    repeat_header: bool = True,
+    seed: int = 0
+) -> Tuple[Path, Path]:
+    """Write one PO and its proforma invoice; returns (po_path, pi_path)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed * 100003 + pair_id)
+    po_lines, pi_lines = make_lines(rows, discrepancy_rate, rng)
+
+    po_number = 100000 + pair_id
+    po_path = out_dir / f"Purchase_Order_{po_number}.pdf"
+    pi_path = out_dir / f"Proforma_Invoice_{po_number}.pdf"
+
+    write_document(po_path, "Purchase Order", f"PO #{po_number}", PO_HEADER, po_lines,
+                   rows_per_page=rows_per_page, repeat_header=repeat_header)
+    write_document(pi_path, "Proforma Invoice", f"Against PO #{po_number}", PI_HEADER, pi_lines,
+                   rows_per_page=rows_per_page, repeat_header=repeat_header)
+    return po_path, pi_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--out', type=Path, default=Path('bench_corpus'))
+    parser.add_argument('--pairs', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=50)
+    parser.add_argument('--rows-per-page', type=int, default=25)
+    parser.add_argument('--discrepancy-rate', type=float, default=0.1)
+    parser.add_argument('--no-repeat-header', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for pair_id in range(args.pairs):
+        po_path, pi_path = generate_pair(
+            args.out, pair_id, args.rows,
+            discrepancy_rate=args.discrepancy_rate,
+            rows_per_page=args.rows_per_page,
+            repeat_header=not args.no_repeat_header,
+            seed=args.seed
+        )
+        print(f"  ✓ {po_path.name}, {pi_path.name}")
+
+
+if __name__ == "__main__":
+    main()
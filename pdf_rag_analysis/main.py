@@ -17,7 +17,7 @@ def main():
     
     parser.add_argument(
         '--mode',
-        choices=['pipeline', 'chat', 'agent', 'interactive'],
+        choices=['pipeline', 'chat', 'agent', 'interactive', 'watch'],
         default='pipeline',
         help='Mode of operation'
     )
@@ -76,6 +76,10 @@ def main():
         orchestrator.run_complete_pipeline()
         orchestrator.interactive_analysis()
 
+    elif args.mode == 'watch':
+        print(f"\n[RUNNING] Watch-folder ingestion on {orchestrator.data_dir} (Ctrl+C to stop)")
+        orchestrator.watch()
+
 
 if __name__ == "__main__":
     main()
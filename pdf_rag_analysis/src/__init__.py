@@ -1,5 +1,5 @@
 from src.config import settings
-from src.pdf_extractor import PDFExtractor, extract_all_pdfs
+from src.pdf_extractor import PDFExtractor, PDFParseSession, extract_all_pdfs
 from src.comparator import EnhancedDocumentComparator, compare_po_with_invoice
 from src.report_generator import EnhancedReportGenerator, generate_all_reports
 
@@ -26,6 +26,7 @@ from src.orchestrator import PDFAnalysisOrchestrator
 __all__ = [
     'settings',
     'PDFExtractor',
+    'PDFParseSession',
     'extract_all_pdfs',
     'DocumentComparator',
     'compare_po_with_invoice',
@@ -310,7 +310,7 @@ class AdvancedRAGSystem:
             'items_count': len(document.items)
         }
         
-        chunks = self.chunker.chunk_text(document.raw_text, doc_metadata, doc_id)
+        chunks = self.chunker.chunk_text(str(document.raw_text), doc_metadata, doc_id)
         self.chunks_store.extend(chunks)
         self.documents_store[doc_id] = document
         
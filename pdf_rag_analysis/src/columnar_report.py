@@ -0,0 +1,163 @@
+"""
+Typed columnar output of comparison results: Parquet or Arrow IPC.
+
+Two tables per comparison, both carrying po_id / invoice_id columns:
+
+- item_comparison: every ItemDiscrepancy field with its real type - float64
+  values and diffs, bool flags, and status / severity / reason
+  dictionary-encoded. Values are unrounded, unlike the CSV report.
+- summary_metrics: one row with the document counts, quantity and value
+  totals, every SummaryMetrics field and generated_at.
+
+append_to_dataset adds both tables to a Hive-partitioned dataset, one file
+per PO / invoice pair under date=YYYY-MM-DD, so re-running a pair on the same
+day replaces its rows rather than duplicating them:
+
+    SELECT * FROM read_parquet('dataset/item_comparison/*/*.parquet', hive_partitioning = true)
+
+pyarrow is optional; without it HAS_PYARROW is False and writing raises
+ImportError.
+"""
+
+import re
+from dataclasses import asdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.comparator import (
+    DocumentComparison,
+    ItemComparisonTable,
+    ITEM_DISCREPANCY_FIELDS,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+_CODED_FIELDS = ('status', 'severity', 'reason')
+_STRING_FIELDS = ('item_no', 'description')
+_FLAG_FIELDS = ('quantity_discrepancy', 'price_discrepancy', 'total_discrepancy', 'discount_discrepancy')
+_COUNT_FIELDS = ('total_items_po', 'total_items_invoice', 'matching_items', 'discrepant_items',
+                 'total_quantity_ordered', 'total_quantity_invoiced')
+
+_UNSAFE_NAME = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("Parquet / Arrow reports need pyarrow: pip install pyarrow")
+
+
+def _field_type(name: str):
+    if name in _CODED_FIELDS:
+        return pa.dictionary(pa.int8(), pa.string())
+    if name in _STRING_FIELDS:
+        return pa.string()
+    if name in _FLAG_FIELDS:
+        return pa.bool_()
+    return pa.float64()
+
+
+def _constant(value: str, length: int):
+    """A column repeating one string, stored as a single dictionary entry"""
+    return pa.DictionaryArray.from_arrays(pa.array(np.zeros(length, dtype=np.int8)), pa.array([value]))
+
+
+def item_comparison_table(comparison: DocumentComparison):
+    """Arrow table of the item-level comparison"""
+    _require_pyarrow()
+    items = comparison.item_level_comparison
+    if isinstance(items, ItemComparisonTable):
+        table = items.to_arrow()
+    else:
+        arrays = {}
+        for name in ITEM_DISCREPANCY_FIELDS:
+            values = [getattr(item, name) for item in items]
+            if name in _CODED_FIELDS:
+                arrays[name] = pa.array(values, type=pa.string()).dictionary_encode().cast(_field_type(name))
+            else:
+                arrays[name] = pa.array(values, type=_field_type(name))
+        table = pa.table(arrays)
+
+    length = table.num_rows
+    table = table.add_column(0, 'invoice_id', _constant(comparison.invoice_doc_id, length))
+    return table.add_column(0, 'po_id', _constant(comparison.po_doc_id, length))
+
+
+def summary_metrics_table(comparison: DocumentComparison, generated_at: Optional[datetime] = None):
+    """One-row Arrow table of document totals and summary metrics"""
+    _require_pyarrow()
+    row = {
+        'po_id': pa.array([comparison.po_doc_id], type=pa.string()),
+        'invoice_id': pa.array([comparison.invoice_doc_id], type=pa.string()),
+        'generated_at': pa.array([generated_at or datetime.now()], type=pa.timestamp('us')),
+    }
+    for name in _COUNT_FIELDS:
+        row[name] = pa.array([int(getattr(comparison, name))], type=pa.int64())
+    row['total_value_ordered'] = pa.array([float(comparison.total_value_ordered)], type=pa.float64())
+    row['total_value_invoiced'] = pa.array([float(comparison.total_value_invoiced)], type=pa.float64())
+    for name, value in asdict(comparison.summary_metrics).items():
+        row[name] = pa.array([float(value)], type=pa.float64())
+    return pa.table(row)
+
+
+def pair_file_stem(comparison: DocumentComparison) -> str:
+    """Filesystem-safe "<po_id>__<invoice_id>" naming one comparison's output files"""
+    return f"{_UNSAFE_NAME.sub('_', comparison.po_doc_id)}__{_UNSAFE_NAME.sub('_', comparison.invoice_doc_id)}"
+
+
+def write_table(table, path: Path, fmt: str = 'parquet'):
+    """Write an Arrow table as Parquet (zstd) or an uncompressed Arrow IPC file, which readers can memory-map"""
+    _require_pyarrow()
+    if fmt == 'parquet':
+        pq.write_table(table, str(path), compression='zstd')
+    elif fmt == 'arrow':
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown columnar format {fmt!r}; expected one of {sorted(COLUMNAR_FORMATS)}")
+
+
+def write_comparison(
+    comparison: DocumentComparison,
+    items_path: Path,
+    summary_path: Path,
+    fmt: str = 'parquet'
+) -> Tuple[Path, Path]:
+    write_table(item_comparison_table(comparison), items_path, fmt)
+    write_table(summary_metrics_table(comparison), summary_path, fmt)
+    return items_path, summary_path
+
+
+def append_to_dataset(
+    comparison: DocumentComparison,
+    dataset_dir: Path,
+    fmt: str = 'parquet',
+    partition_date: Optional[date] = None
+) -> Tuple[Path, Path]:
+    """
+    Add a comparison to the dataset under dataset_dir/{item_comparison,
+    summary_metrics}/date=<partition_date, default today>/ and return the
+    two files written
+    """
+    day = (partition_date or date.today()).isoformat()
+    suffix = COLUMNAR_FORMATS.get(fmt)
+    if suffix is None:
+        raise ValueError(f"Unknown columnar format {fmt!r}; expected one of {sorted(COLUMNAR_FORMATS)}")
+    name = f"{pair_file_stem(comparison)}{suffix}"
+
+    paths = []
+    for table_name in ('item_comparison', 'summary_metrics'):
+        partition = Path(dataset_dir) / table_name / f"date={day}"
+        partition.mkdir(parents=True, exist_ok=True)
+        paths.append(partition / name)
+    return write_comparison(comparison, paths[0], paths[1], fmt)
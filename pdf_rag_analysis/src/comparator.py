@@ -868,14 +868,22 @@
 #     """Main comparison function"""
 #     comparator = EnhancedDocumentComparator()
 #     return comparator.compare(po_doc, invoice_doc)
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Tuple, Optional
+from collections.abc import Sequence
+from dataclasses import dataclass, asdict, field, fields
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union
 import json
+import sys
+import numpy as np
 
 # Import from enhanced extractor
-from src.pdf_extractor import ExtractedDocument, LineItem
+from src.pdf_extractor import ExtractedDocument, LineItem, LineItemTable
+from src.item_matching import description_key_ids, match_line_items
 
-@dataclass
+# Result records are slotted where dataclasses support it (Python 3.10+):
+# no per-instance __dict__, so a list of ItemDiscrepancy is several times smaller
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class ItemDiscrepancy:
     """Enhanced discrepancy model with boolean flags"""
     item_no: str
@@ -914,7 +922,225 @@ class ItemDiscrepancy:
     severity: str = "NONE"
     reason: str = ""
 
-@dataclass
+ITEM_DISCREPANCY_FIELDS = tuple(f.name for f in fields(ItemDiscrepancy))
+
+STATUSES = ("MATCH", "PRICE_MISMATCH", "QUANTITY_MISMATCH", "TOTAL_MISMATCH",
+            "EXTRA_IN_INVOICE", "MISSING_FROM_INVOICE")
+SEVERITIES = ("NONE", "MEDIUM", "HIGH", "CRITICAL")
+# Codes 0-7 are the mismatch reasons by flag bits (1 quantity, 2 price, 4 discount)
+REASONS = tuple(
+    ", ".join(
+        text for bit, text in ((1, "Quantity mismatch"), (2, "Unit price mismatch"),
+                               (4, "Discount percentage mismatch leading to different line total"))
+        if code & bit
+    ) or "Line total mismatch"
+    for code in range(8)
+) + ("Perfect match", "Item not in Purchase Order", "Item missing from Invoice")
+REASON_MATCH, REASON_NOT_IN_PO, REASON_MISSING_FROM_INVOICE = 8, 9, 10
+
+# Fields ItemComparisonTable keeps as arrays; the rest are derived on access
+_PO_VALUE_FIELDS = ('po_quantity', 'po_unit_price', 'po_discount_pct', 'po_discount_amount', 'po_line_total')
+_INVOICE_VALUE_FIELDS = ('invoice_quantity', 'invoice_unit_price', 'invoice_discount_pct',
+                         'invoice_discount_amount', 'invoice_line_total')
+_FLAG_FIELDS = ('quantity_discrepancy', 'price_discrepancy', 'total_discrepancy', 'discount_discrepancy')
+_DIFF_FIELDS = ('quantity_diff', 'quantity_variance_pct', 'price_diff', 'price_variance_pct',
+                'total_diff', 'discount_diff')
+
+
+class ItemComparisonTable:
+    """
+    Item-level comparison stored column by column.
+
+    Produced by the vectorized engine: values, flags and diffs are NumPy
+    arrays and status / severity / reason are small codes. It behaves as a
+    read-only sequence of ItemDiscrepancy, each built only when accessed and
+    with exactly the values (and int/float types) the per-item path gives.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self._columns = columns
+
+    @classmethod
+    def concat(cls, tables: Iterable["ItemComparisonTable"]) -> "ItemComparisonTable":
+        """One table from consecutive chunks (e.g. those of a ComparisonStream)"""
+        tables = list(tables)
+        if not tables:
+            raise ValueError("ItemComparisonTable.concat needs at least one table")
+        return cls({
+            name: np.concatenate([table._columns[name] for table in tables])
+            for name in tables[0]._columns
+        })
+
+    def __len__(self) -> int:
+        return len(self._columns['status_code'])
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """Stored columns as-is (status / severity / reason as codes), e.g. for serialising"""
+        return dict(self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """Whole column; status, severity and reason come back as object arrays of strings"""
+        if name == 'status':
+            return np.asarray(STATUSES, dtype=object)[self._columns['status_code']]
+        if name == 'severity':
+            return np.asarray(SEVERITIES, dtype=object)[self._columns['severity_code']]
+        if name == 'reason':
+            return np.asarray(REASONS, dtype=object)[self._columns['reason_code']]
+        return self._columns[name]
+
+    def _record(self, index: int) -> ItemDiscrepancy:
+        c = self._columns
+        has_po = bool(c['has_po'][index])
+        has_invoice = bool(c['has_invoice'][index])
+        values = {
+            'item_no': c['item_no'][index],
+            'description': c['description'][index],
+            'status': STATUSES[c['status_code'][index]],
+            'severity': SEVERITIES[c['severity_code'][index]],
+            'reason': REASONS[c['reason_code'][index]],
+        }
+        # The per-item path fills the side a line is missing from with int 0
+        for name in _PO_VALUE_FIELDS:
+            values[name] = float(c[name][index]) if has_po else 0
+        for name in _INVOICE_VALUE_FIELDS:
+            values[name] = float(c[name][index]) if has_invoice else 0
+        for name in _FLAG_FIELDS:
+            values[name] = bool(c[name][index])
+        for name in _DIFF_FIELDS:
+            values[name] = float(c[name][index])
+        # ...and an undefined variance (PO value not > 0) is int 0 as well
+        if has_po and has_invoice:
+            if not c['quantity_variance_defined'][index]:
+                values['quantity_variance_pct'] = 0
+            if not c['price_variance_defined'][index]:
+                values['price_variance_pct'] = 0
+        return ItemDiscrepancy(**values)
+
+    @property
+    def mismatch_mask(self) -> np.ndarray:
+        """True for every row that is not a MATCH"""
+        return self._columns['status_code'] != 0
+
+    def mismatches(self) -> "MismatchList":
+        """products_with_mismatches view of the rows in mismatch_mask"""
+        return MismatchList(self)
+
+    def to_dataframe(self):
+        """
+        pandas DataFrame of every ItemDiscrepancy field. Numeric, flag and
+        diff columns share memory with the table instead of being copied;
+        status / severity / reason are categoricals over the stored codes.
+        Values of a side a line is missing from (and undefined variances)
+        read as 0.0 rather than int 0.
+        """
+        import pandas as pd
+
+        c = self._columns
+        data = {}
+        for name in ITEM_DISCREPANCY_FIELDS:
+            if name in ('status', 'severity', 'reason'):
+                categories = {'status': STATUSES, 'severity': SEVERITIES, 'reason': REASONS}[name]
+                data[name] = pd.Categorical.from_codes(c[f'{name}_code'], categories=categories)
+            else:
+                data[name] = c[name]
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        pyarrow Table of every ItemDiscrepancy field (pyarrow is optional).
+        Float and code columns are wrapped without copying; status /
+        severity / reason are dictionary-encoded on the stored codes.
+        """
+        import pyarrow as pa
+
+        c = self._columns
+        arrays = {}
+        for name in ITEM_DISCREPANCY_FIELDS:
+            if name in ('status', 'severity', 'reason'):
+                categories = {'status': STATUSES, 'severity': SEVERITIES, 'reason': REASONS}[name]
+                arrays[name] = pa.DictionaryArray.from_arrays(pa.array(c[f'{name}_code']), pa.array(categories))
+            elif c[name].dtype == object:
+                arrays[name] = pa.array(c[name], type=pa.string())
+            else:
+                arrays[name] = pa.array(c[name])
+        return pa.table(arrays)
+
+    def __iter__(self) -> Iterator[ItemDiscrepancy]:
+        for index in range(len(self)):
+            yield self._record(index)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return [self._record(index) for index in range(*key.indices(len(self)))]
+        length = len(self)
+        index = key + length if key < 0 else key
+        if not 0 <= index < length:
+            raise IndexError("ItemComparisonTable index out of range")
+        return self._record(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ItemComparisonTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ItemComparisonTable(rows={len(self)})"
+
+
+class MismatchList(Sequence):
+    """
+    products_with_mismatches over an ItemComparisonTable.
+
+    Holds the table and its mismatch mask instead of a parallel list of
+    dicts; each {"SKU", "Description", "Reason"} entry is built when read.
+    Compares equal to the equivalent list.
+    """
+
+    def __init__(self, table: ItemComparisonTable):
+        self._table = table
+        self._rows: Optional[np.ndarray] = None
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Indices of the mismatched rows in the table"""
+        if self._rows is None:
+            self._rows = np.flatnonzero(self._table.mismatch_mask)
+        return self._rows
+
+    def _entry(self, sku: str, description: str, code: int) -> Dict[str, str]:
+        return {"SKU": sku, "Description": description, "Reason": REASONS[code]}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, key: Union[int, slice]):
+        rows = self.rows[key]
+        if isinstance(key, slice):
+            return [self._entry(*values) for values in self._values(rows)]
+        c = self._table._columns
+        return self._entry(c['item_no'][rows], c['description'][rows], int(c['reason_code'][rows]))
+
+    def _values(self, rows: np.ndarray):
+        c = self._table._columns
+        return zip(c['item_no'][rows].tolist(), c['description'][rows].tolist(), c['reason_code'][rows].tolist())
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for values in self._values(self.rows):
+            yield self._entry(*values)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MismatchList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MismatchList(rows={len(self)})"
+
+@dataclass(**_SLOTS)
 class SummaryMetrics:
     """Summary comparison metrics"""
     subtotal_po: float
@@ -937,7 +1163,7 @@ class SummaryMetrics:
     grand_total_pi: float
     grand_total_difference: float
 
-@dataclass
+@dataclass(**_SLOTS)
 class DocumentComparison:
     """Complete comparison result"""
     po_doc_id: str
@@ -953,10 +1179,10 @@ class DocumentComparison:
     summary_metrics: SummaryMetrics
 
     # Detailed item comparison
-    item_level_comparison: List[ItemDiscrepancy]
+    item_level_comparison: Union[ItemComparisonTable, List[ItemDiscrepancy]]
 
-    # Products with mismatches
-    products_with_mismatches: List[Dict[str, str]]
+    # Products with mismatches (a MismatchList view for the array engine)
+    products_with_mismatches: Union["MismatchList", List[Dict[str, str]]]
 
     # Total quantities
     total_quantity_ordered: int
@@ -969,51 +1195,173 @@ class DocumentComparison:
     # Text summary
     summary_text: str = ""
 
+@dataclass
+class ComparisonTotals:
+    """Running summary of a ComparisonStream, updated chunk by chunk"""
+    items_compared: int = 0
+    matching_items: int = 0
+    discrepant_items: int = 0
+    status_counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(STATUSES, 0))
+    severity_counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(SEVERITIES, 0))
+    quantity_diff_total: float = 0.0
+    total_diff_total: float = 0.0
+
+    def add(self, table: ItemComparisonTable):
+        status_counts = np.bincount(table.column('status_code'), minlength=len(STATUSES)).tolist()
+        severity_counts = np.bincount(table.column('severity_code'), minlength=len(SEVERITIES)).tolist()
+        for status, count in zip(STATUSES, status_counts):
+            self.status_counts[status] += count
+        for severity, count in zip(SEVERITIES, severity_counts):
+            self.severity_counts[severity] += count
+        self.items_compared += len(table)
+        self.matching_items += status_counts[0]
+        self.discrepant_items += len(table) - status_counts[0]
+        self.quantity_diff_total += float(table.column('quantity_diff').sum())
+        self.total_diff_total += float(table.column('total_diff').sum())
+
+
+class ComparisonStream:
+    """
+    Item-level comparison computed chunk_size pairs at a time.
+
+    Header metrics (summary_metrics, quantity totals) are available straight
+    away; iterating yields ItemDiscrepancy records (chunks() yields whole
+    ItemComparisonTable chunks) while totals keeps a running count of
+    matches, statuses and severities. Only the row alignment is held for the
+    whole document, so memory stays bounded by the chunk size however many
+    lines the documents have. A stream can be consumed once.
+    """
+
+    def __init__(
+        self,
+        comparator: "EnhancedDocumentComparator",
+        po_doc: ExtractedDocument,
+        invoice_doc: ExtractedDocument,
+        chunk_size: int = 10_000
+    ):
+        self.comparator = comparator
+        self.po_doc = po_doc
+        self.invoice_doc = invoice_doc
+        self.chunk_size = max(1, chunk_size)
+        self.summary_metrics = comparator._calculate_summary_metrics(po_doc, invoice_doc)
+        self.total_quantity_ordered = int(comparator._column_total(po_doc.items, 'quantity'))
+        self.total_quantity_invoiced = int(comparator._column_total(invoice_doc.items, 'quantity'))
+        self.totals = ComparisonTotals()
+        self.exhausted = False
+        self._started = False
+
+    def chunks(self) -> Iterator[ItemComparisonTable]:
+        if self._started:
+            raise RuntimeError("ComparisonStream can only be consumed once")
+        self._started = True
+
+        po = self.comparator._as_table(self.po_doc.items)
+        invoice = self.comparator._as_table(self.invoice_doc.items)
+        po_row, invoice_row = self.comparator._align(po, invoice)
+        # At least one (possibly empty) chunk, so collected chunks always concat
+        for start in range(0, max(len(po_row), 1), self.chunk_size):
+            stop = start + self.chunk_size
+            table = self.comparator._compare_rows(po, invoice, po_row[start:stop], invoice_row[start:stop])
+            self.totals.add(table)
+            yield table
+        self.exhausted = True
+
+    def __iter__(self) -> Iterator[ItemDiscrepancy]:
+        for table in self.chunks():
+            yield from table
+
+    def summary_text(self) -> str:
+        return self.comparator._generate_summary_text(
+            self.totals.items_compared,
+            self.totals.matching_items,
+            self.totals.discrepant_items,
+            self.summary_metrics
+        )
+
+    def to_comparison(self, item_level_comparison: Optional[ItemComparisonTable] = None) -> DocumentComparison:
+        """
+        DocumentComparison for a fully consumed stream. Pass the collected
+        chunks (ItemComparisonTable.concat) to get the same result compare()
+        gives; without them item-level fields are left empty.
+        """
+        if not self.exhausted:
+            raise RuntimeError("ComparisonStream has not been consumed yet")
+        items = item_level_comparison if item_level_comparison is not None else []
+        comparison = DocumentComparison(
+            po_doc_id=self.po_doc.metadata.document_id,
+            invoice_doc_id=self.invoice_doc.metadata.document_id,
+            total_items_po=len(self.po_doc.items),
+            total_items_invoice=len(self.invoice_doc.items),
+            matching_items=self.totals.matching_items,
+            discrepant_items=self.totals.discrepant_items,
+            summary_metrics=self.summary_metrics,
+            item_level_comparison=items,
+            products_with_mismatches=items.mismatches() if item_level_comparison is not None else [],
+            total_quantity_ordered=self.total_quantity_ordered,
+            total_quantity_invoiced=self.total_quantity_invoiced,
+            total_value_ordered=self.po_doc.total,
+            total_value_invoiced=self.invoice_doc.total,
+            summary_text=self.summary_text()
+        )
+
+        # Only a complete result goes into the comparator's cache
+        cache = self.comparator.cache
+        if cache is not None and item_level_comparison is not None:
+            cache.put(cache.key_for(self.po_doc, self.invoice_doc, self.comparator, vectorized=True), comparison)
+        return comparison
+
 class EnhancedDocumentComparator:
     """Enhanced comparator that generates detailed output"""
 
-    def __init__(self, quantity_tolerance: float = 0.01, price_tolerance: float = 0.01):
+    def __init__(
+        self,
+        quantity_tolerance: float = 0.01,
+        price_tolerance: float = 0.01,
+        vectorized: bool = True,
+        match_by: str = "sku",
+        fuzzy_threshold: Optional[float] = 0.6,
+        cache=None
+    ):
         self.quantity_tolerance = quantity_tolerance
         self.price_tolerance = price_tolerance
+        # Array engine (ItemComparisonTable); False keeps the per-item path
+        self.vectorized = vectorized
+        # "sku": SKU, then exact description, then blocked fuzzy description
+        # (src.item_matching); "description": lowercased description only
+        if match_by not in ("sku", "description"):
+            raise ValueError(f"match_by must be 'sku' or 'description', got {match_by!r}")
+        self.match_by = match_by
+        # Minimum n-gram similarity for a fuzzy description match; None disables it
+        self.fuzzy_threshold = fuzzy_threshold
+        # Optional src.comparison_cache.ComparisonCache
+        self.cache = cache
 
     def compare(self, po_doc: ExtractedDocument, invoice_doc: ExtractedDocument) -> DocumentComparison:
         """Generate comprehensive comparison"""
 
-        # Create item maps
-        po_items_map = {item.description.lower(): item for item in po_doc.items}
-        invoice_items_map = {item.description.lower(): item for item in invoice_doc.items}
-
-        # Get all unique items
-        all_items = set(po_items_map.keys()) | set(invoice_items_map.keys())
-
-        # Compare items
-        item_comparisons = []
-        products_with_mismatches = []
-        matching_count = 0
-
-        for item_key in sorted(all_items):
-            po_item = po_items_map.get(item_key)
-            invoice_item = invoice_items_map.get(item_key)
-
-            comparison = self._compare_single_item(po_item, invoice_item, item_key)
-            item_comparisons.append(comparison)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(po_doc, invoice_doc, self)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-            # Track matching vs discrepant
-            if comparison.status == "MATCH":
-                matching_count += 1
-            else:
-                products_with_mismatches.append({
-                    "SKU": comparison.item_no,
-                    "Description": comparison.description,
-                    "Reason": comparison.reason
-                })
+        if self.vectorized:
+            item_comparisons, products_with_mismatches = self._compare_items_vectorized(
+                po_doc.items, invoice_doc.items
+            )
+        else:
+            item_comparisons, products_with_mismatches = self._compare_items(
+                po_doc.items, invoice_doc.items
+            )
+        matching_count = len(item_comparisons) - len(products_with_mismatches)
 
         # Calculate summary metrics
         summary_metrics = self._calculate_summary_metrics(po_doc, invoice_doc)
 
         # Calculate totals
-        total_qty_po = sum(item.quantity for item in po_doc.items)
-        total_qty_invoice = sum(item.quantity for item in invoice_doc.items)
+        total_qty_po = self._column_total(po_doc.items, 'quantity')
+        total_qty_invoice = self._column_total(invoice_doc.items, 'quantity')
 
         # Generate text summary
         summary_text = self._generate_summary_text(
@@ -1023,7 +1371,7 @@ class EnhancedDocumentComparator:
             summary_metrics
         )
 
-        return DocumentComparison(
+        comparison = DocumentComparison(
             po_doc_id=po_doc.metadata.document_id,
             invoice_doc_id=invoice_doc.metadata.document_id,
             total_items_po=len(po_doc.items),
@@ -1040,6 +1388,232 @@ class EnhancedDocumentComparator:
             summary_text=summary_text
         )
 
+        if cache_key is not None:
+            self.cache.put(cache_key, comparison)
+        return comparison
+
+    def cached_result(self, po_doc: ExtractedDocument, invoice_doc: ExtractedDocument) -> Optional[DocumentComparison]:
+        """The cached comparison of this pair, if there is a cache and it has one"""
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache.key_for(po_doc, invoice_doc, self))
+
+    def stream(
+        self,
+        po_doc: ExtractedDocument,
+        invoice_doc: ExtractedDocument,
+        chunk_size: int = 10_000
+    ) -> ComparisonStream:
+        """
+        Incremental comparison: records come out chunk by chunk with running
+        totals. Always uses the array engine; records are the same ones
+        compare() gives, in the same order.
+        """
+        return ComparisonStream(self, po_doc, invoice_doc, chunk_size)
+
+    def _compare_items(self, po_items, invoice_items) -> Tuple[List[ItemDiscrepancy], List[Dict[str, str]]]:
+        """Per-item path: one dict lookup and ItemDiscrepancy per description"""
+
+        if self.match_by != "description":
+            return self._compare_matched_items(po_items, invoice_items)
+
+        # Create item maps
+        po_items_map = {item.description.lower(): item for item in po_items}
+        invoice_items_map = {item.description.lower(): item for item in invoice_items}
+
+        # Get all unique items
+        all_items = set(po_items_map.keys()) | set(invoice_items_map.keys())
+
+        # Compare items
+        item_comparisons = []
+        products_with_mismatches = []
+
+        for item_key in sorted(all_items):
+            po_item = po_items_map.get(item_key)
+            invoice_item = invoice_items_map.get(item_key)
+
+            comparison = self._compare_single_item(po_item, invoice_item, item_key)
+            item_comparisons.append(comparison)
+
+            # Track discrepant items
+            if comparison.status != "MATCH":
+                products_with_mismatches.append({
+                    "SKU": comparison.item_no,
+                    "Description": comparison.description,
+                    "Reason": comparison.reason
+                })
+
+        return item_comparisons, products_with_mismatches
+
+    def _compare_matched_items(self, po_items, invoice_items) -> Tuple[List[ItemDiscrepancy], List[Dict[str, str]]]:
+        """Per-item path over the pairs found by SKU / fuzzy matching"""
+        po = self._as_table(po_items)
+        invoice = self._as_table(invoice_items)
+        po_rows, invoice_rows = self._align(po, invoice)
+
+        item_comparisons = []
+        products_with_mismatches = []
+        for po_row, invoice_row in zip(po_rows.tolist(), invoice_rows.tolist()):
+            po_item = po[po_row] if po_row >= 0 else None
+            invoice_item = invoice[invoice_row] if invoice_row >= 0 else None
+            key = (po_item or invoice_item).description.lower()
+
+            comparison = self._compare_single_item(po_item, invoice_item, key)
+            item_comparisons.append(comparison)
+            if comparison.status != "MATCH":
+                products_with_mismatches.append({
+                    "SKU": comparison.item_no,
+                    "Description": comparison.description,
+                    "Reason": comparison.reason
+                })
+
+        return item_comparisons, products_with_mismatches
+
+    def _as_table(self, items) -> LineItemTable:
+        return items if isinstance(items, LineItemTable) else LineItemTable.from_items(items)
+
+    def _align(self, po: LineItemTable, invoice: LineItemTable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aligned (po_row, invoice_row) pairs, -1 for a missing side, ordered by
+        lowercased description (the PO's when both sides are present)
+        """
+        description_ids = description_key_ids(po, invoice)
+        po_keys, invoice_keys, keys = description_ids
+
+        if self.match_by == "description":
+            # One row per key; the last row wins on duplicate keys, as with the
+            # dict maps. Shifted by one so empty descriptions (-1) get key 0
+            po_keys, invoice_keys, key_count = po_keys + 1, invoice_keys + 1, len(keys) + 1
+            po_row = np.full(key_count, -1, dtype=np.int64)
+            invoice_row = np.full(key_count, -1, dtype=np.int64)
+            np.maximum.at(po_row, po_keys, np.arange(len(po_keys), dtype=np.int64))
+            np.maximum.at(invoice_row, invoice_keys, np.arange(len(invoice_keys), dtype=np.int64))
+            present = np.flatnonzero((po_row >= 0) | (invoice_row >= 0))
+            return po_row[present], invoice_row[present]
+
+        po_rows, invoice_rows = match_line_items(
+            po, invoice, fuzzy_threshold=self.fuzzy_threshold, description_ids=description_ids
+        )
+        pair_keys = np.where(
+            po_rows >= 0,
+            po_keys[np.maximum(po_rows, 0)] if len(po_keys) else 0,
+            invoice_keys[np.maximum(invoice_rows, 0)] if len(invoice_keys) else 0
+        )
+        order = np.argsort(pair_keys, kind='stable')
+        return po_rows[order], invoice_rows[order]
+
+    def _compare_items_vectorized(
+        self,
+        po_items,
+        invoice_items
+    ) -> Tuple[ItemComparisonTable, List[Dict[str, str]]]:
+        """
+        Same result as _compare_items, computed on whole columns.
+
+        Both sides are aligned in one pass (_align), then diffs, variances,
+        tolerance flags, statuses and severities are array operations.
+        """
+        po = self._as_table(po_items)
+        invoice = self._as_table(invoice_items)
+        po_row, invoice_row = self._align(po, invoice)
+        table = self._compare_rows(po, invoice, po_row, invoice_row)
+        return table, table.mismatches()
+
+    def _compare_rows(
+        self,
+        po: LineItemTable,
+        invoice: LineItemTable,
+        po_row: np.ndarray,
+        invoice_row: np.ndarray
+    ) -> ItemComparisonTable:
+        """Array comparison of aligned (po_row, invoice_row) pairs, -1 for a missing side"""
+        has_po = po_row >= 0
+        has_invoice = invoice_row >= 0
+        both = has_po & has_invoice
+
+        def gather(table: LineItemTable, field: str, rows: np.ndarray, mask: np.ndarray) -> np.ndarray:
+            if len(table) == 0:
+                return np.zeros(len(rows), dtype=object if field in ('item_no', 'description') else np.float64)
+            values = table.take(field, np.where(mask, rows, 0))
+            return values if values.dtype == object else np.where(mask, values, 0.0)
+
+        columns = {}
+        for prefix, table, rows, mask in (('po', po, po_row, has_po), ('invoice', invoice, invoice_row, has_invoice)):
+            for name, field in (('quantity', 'quantity'), ('unit_price', 'unit_price'),
+                                ('discount_pct', 'discount_pct'), ('discount_amount', 'discount_amount'),
+                                ('line_total', 'total_price')):
+                columns[f'{prefix}_{name}'] = gather(table, field, rows, mask)
+        for field in ('item_no', 'description'):
+            columns[field] = np.where(
+                has_po, gather(po, field, po_row, has_po), gather(invoice, field, invoice_row, has_invoice)
+            )
+
+        po_qty, po_price = columns['po_quantity'], columns['po_unit_price']
+        zeros = np.zeros(len(po_row))
+        qty_diff = np.where(both, columns['invoice_quantity'] - po_qty, 0.0)
+        price_diff = np.where(both, columns['invoice_unit_price'] - po_price, 0.0)
+        total_diff = np.where(both, columns['invoice_line_total'] - columns['po_line_total'], 0.0)
+        discount_diff = np.where(both, columns['invoice_discount_amount'] - columns['po_discount_amount'], 0.0)
+        pct_diff = columns['invoice_discount_pct'] - columns['po_discount_pct']
+
+        qty_defined = both & (po_qty > 0)
+        price_defined = both & (po_price > 0)
+        qty_variance = np.divide(qty_diff, po_qty, out=zeros.copy(), where=qty_defined) * 100
+        price_variance = np.divide(price_diff, po_price, out=zeros.copy(), where=price_defined) * 100
+        abs_qty_variance = np.abs(qty_variance)
+        abs_price_variance = np.abs(price_variance)
+
+        qty_flag = np.where(both, abs_qty_variance > self.quantity_tolerance, True)
+        price_flag = np.where(both, abs_price_variance > self.price_tolerance, True)
+        total_flag = np.where(both, np.abs(total_diff) > 0.01, True)
+        discount_flag = both & ((np.abs(discount_diff) > 0.01) | (np.abs(pct_diff) > 0.01))
+        match = both & ~qty_flag & ~price_flag & ~total_flag
+
+        status_code = np.select(
+            [~has_po, ~has_invoice, match, price_flag, qty_flag],
+            [4, 5, 0, 1, 2],
+            default=3
+        ).astype(np.int8)
+        severity_code = np.select(
+            [~has_po, ~has_invoice, match,
+             (abs_qty_variance > 20) | (abs_price_variance > 20),
+             (abs_qty_variance > 10) | (abs_price_variance > 10)],
+            [2, 3, 0, 3, 2],
+            default=1
+        ).astype(np.int8)
+        reason_code = np.select(
+            [~has_po, ~has_invoice, match],
+            [REASON_NOT_IN_PO, REASON_MISSING_FROM_INVOICE, REASON_MATCH],
+            default=qty_flag.astype(np.int8) + 2 * price_flag + 4 * discount_flag
+        ).astype(np.int8)
+
+        columns.update({
+            'quantity_discrepancy': qty_flag,
+            'price_discrepancy': price_flag,
+            'total_discrepancy': total_flag,
+            'discount_discrepancy': discount_flag,
+            'quantity_diff': qty_diff,
+            'quantity_variance_pct': qty_variance,
+            'price_diff': price_diff,
+            'price_variance_pct': price_variance,
+            'total_diff': total_diff,
+            'discount_diff': discount_diff,
+            'status_code': status_code,
+            'severity_code': severity_code,
+            'reason_code': reason_code,
+            'has_po': has_po,
+            'has_invoice': has_invoice,
+            'quantity_variance_defined': qty_defined,
+            'price_variance_defined': price_defined,
+        })
+        return ItemComparisonTable(columns)
+
+    def _column_total(self, items, field: str) -> float:
+        """Sum one line-item field, straight off the array for a LineItemTable"""
+        if isinstance(items, LineItemTable):
+            return float(items.column(field).sum())
+        return sum(getattr(item, field) for item in items)
+
     def _compare_single_item(
         self, 
         po_item: Optional[LineItem], 
@@ -1227,5 +1801,15 @@ def compare_po_with_invoice(
     invoice_doc: ExtractedDocument
 ) -> DocumentComparison:
     """Main comparison function"""
-    comparator = EnhancedDocumentComparator()
+    from src.comparison_cache import get_comparison_cache
+
+    comparator = EnhancedDocumentComparator(cache=get_comparison_cache())
     return comparator.compare(po_doc, invoice_doc)
+
+def stream_po_with_invoice(
+    po_doc: ExtractedDocument,
+    invoice_doc: ExtractedDocument,
+    chunk_size: int = 10_000
+) -> ComparisonStream:
+    """Streaming counterpart of compare_po_with_invoice"""
+    return EnhancedDocumentComparator().stream(po_doc, invoice_doc, chunk_size)
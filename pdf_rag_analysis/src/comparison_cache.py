@@ -0,0 +1,306 @@
+"""
+Cache of PO / invoice comparison results.
+
+Entries are keyed by the content hashes of both documents (metadata, header
+totals and every line item - not the raw text, which compare() never reads)
+together with the comparator settings that affect the result: tolerances,
+match_by, the fuzzy threshold and the engine (the array engine returns an
+ItemComparisonTable, the per-item one a list).
+
+The cache never hands out the object it holds: put() stores a copy and
+get() returns a copy, so a caller editing its result cannot corrupt later
+hits.
+
+Results live in an in-memory LRU of max_entries comparisons; with a
+cache_dir they are also written to disk (a compressed JSON header plus the
+item comparison columns as raw arrays) so that separate
+pipeline runs reuse them. The disk side is kept under max_bytes by evicting
+least recently used entries (see extraction_cache.DiskBudget).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.config import settings
+from src.pdf_extractor import ExtractedDocument, LineItemTable, LINE_ITEM_NUMERIC_FIELDS, LINE_ITEM_STRING_FIELDS
+from src.extraction_cache import DiskBudget
+from src.comparator import (
+    DocumentComparison,
+    ItemComparisonTable,
+    ItemDiscrepancy,
+    MismatchList,
+    SummaryMetrics,
+)
+
+# Bump whenever comparison output changes so cached results are invalidated
+COMPARATOR_VERSION = 1
+
+COMPARISON_MAGIC = b"PDFC3"
+COMPARISON_SUFFIX = ".pdfc"
+
+_HEADER_FIELDS = ('subtotal', 'total_discount', 'taxable_amount', 'tax', 'tax_rate', 'total')
+
+
+def document_fingerprint(doc: ExtractedDocument) -> str:
+    """SHA-256 over everything compare() reads from a document"""
+    digest = hashlib.sha256()
+    header = {'metadata': asdict(doc.metadata), **{name: getattr(doc, name) for name in _HEADER_FIELDS}}
+    digest.update(json.dumps(header, sort_keys=True).encode('utf-8'))
+
+    items = doc.items if isinstance(doc.items, LineItemTable) else LineItemTable.from_items(doc.items)
+    digest.update(f"rows={len(items)};".encode())
+    for name in LINE_ITEM_NUMERIC_FIELDS:
+        digest.update(np.ascontiguousarray(items.column(name), dtype=np.float64).tobytes())
+    for name in LINE_ITEM_STRING_FIELDS:
+        codes, pool = items.string_codes(name)
+        digest.update(np.ascontiguousarray(codes, dtype=np.int32).tobytes())
+        digest.update("\x1f".join(pool).encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def copy_comparison(comparison: DocumentComparison) -> DocumentComparison:
+    """
+    Copy of a comparison that shares nothing mutable with it: table
+    columns and item records are copied, and the mismatch view is rebuilt
+    over the copied table
+    """
+    items = comparison.item_level_comparison
+    if isinstance(items, ItemComparisonTable):
+        items = ItemComparisonTable({name: values.copy() for name, values in items.to_columns().items()})
+    else:
+        items = [replace(item) for item in items]
+
+    mismatches = comparison.products_with_mismatches
+    if isinstance(mismatches, MismatchList) and isinstance(items, ItemComparisonTable):
+        mismatches = items.mismatches()
+    else:
+        mismatches = [dict(entry) for entry in mismatches]
+
+    return replace(
+        comparison,
+        summary_metrics=replace(comparison.summary_metrics),
+        item_level_comparison=items,
+        products_with_mismatches=mismatches
+    )
+
+
+def comparison_to_bytes(comparison: DocumentComparison) -> bytes:
+    """
+    Serialize a comparison: a JSON header, then for an ItemComparisonTable
+    the raw bytes of its numeric / flag / code columns (string columns stay
+    in the header), all zlib-compressed
+    """
+    record = {
+        f.name: getattr(comparison, f.name) for f in fields(DocumentComparison)
+        if f.name not in ('summary_metrics', 'item_level_comparison')
+    }
+    record['summary_metrics'] = asdict(comparison.summary_metrics)
+    # A MismatchList is rebuilt from the table's mask on load
+    if isinstance(comparison.products_with_mismatches, MismatchList):
+        record['products_with_mismatches'] = None
+    else:
+        record['products_with_mismatches'] = list(comparison.products_with_mismatches)
+
+    blobs = []
+    items = comparison.item_level_comparison
+    if isinstance(items, ItemComparisonTable):
+        record['item_table'] = {}
+        for name, values in items.to_columns().items():
+            if values.dtype == object:
+                record['item_table'][name] = {'dtype': 'object', 'values': values.tolist()}
+            else:
+                data = np.ascontiguousarray(values).tobytes()
+                record['item_table'][name] = {'dtype': values.dtype.str, 'nbytes': len(data)}
+                blobs.append(data)
+    else:
+        record['items'] = [asdict(item) for item in items]
+
+    header = json.dumps(record, separators=(',', ':')).encode('utf-8')
+    payload = len(header).to_bytes(8, 'little') + header + b''.join(blobs)
+    return COMPARISON_MAGIC + zlib.compress(payload, 1)
+
+
+def comparison_from_bytes(data: bytes) -> DocumentComparison:
+    """Inverse of comparison_to_bytes"""
+    if not data.startswith(COMPARISON_MAGIC):
+        raise ValueError("Not a comparison cache record")
+    payload = zlib.decompress(data[len(COMPARISON_MAGIC):])
+    header_size = int.from_bytes(payload[:8], 'little')
+    record = json.loads(payload[8:8 + header_size].decode('utf-8'))
+    offset = 8 + header_size
+
+    record['summary_metrics'] = SummaryMetrics(**record['summary_metrics'])
+    if 'item_table' in record:
+        columns = {}
+        for name, column in record.pop('item_table').items():
+            if column['dtype'] == 'object':
+                columns[name] = np.array(column['values'], dtype=object)
+            else:
+                end = offset + column['nbytes']
+                columns[name] = np.frombuffer(payload[offset:end], dtype=np.dtype(column['dtype'])).copy()
+                offset = end
+        record['item_level_comparison'] = ItemComparisonTable(columns)
+        if record['products_with_mismatches'] is None:
+            record['products_with_mismatches'] = record['item_level_comparison'].mismatches()
+    else:
+        record['item_level_comparison'] = [ItemDiscrepancy(**item) for item in record.pop('items')]
+    return DocumentComparison(**record)
+
+
+class ComparisonCache:
+    """In-memory LRU of DocumentComparison results, optionally backed by a size-bounded directory"""
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = 128 * 1024 * 1024
+    ):
+        self.max_entries = max(1, max_entries)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.budget = None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.budget = DiskBudget(self.cache_dir, (COMPARISON_SUFFIX,), max_bytes)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, DocumentComparison]" = OrderedDict()
+        # Streamlit reruns and reconciliation threads may share one instance
+        self._lock = threading.Lock()
+
+    def key_for(
+        self,
+        po_doc: ExtractedDocument,
+        invoice_doc: ExtractedDocument,
+        comparator,
+        vectorized: Optional[bool] = None
+    ) -> str:
+        """Key of a pair under comparator's settings; vectorized overrides the engine (streams always use arrays)"""
+        comparator_settings = {
+            'version': COMPARATOR_VERSION,
+            'quantity_tolerance': comparator.quantity_tolerance,
+            'price_tolerance': comparator.price_tolerance,
+            'match_by': comparator.match_by,
+            'fuzzy_threshold': comparator.fuzzy_threshold,
+            'vectorized': bool(comparator.vectorized if vectorized is None else vectorized),
+        }
+        digest = hashlib.sha256()
+        digest.update(document_fingerprint(po_doc).encode())
+        digest.update(document_fingerprint(invoice_doc).encode())
+        digest.update(json.dumps(comparator_settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[DocumentComparison]:
+        with self._lock:
+            comparison = self._entries.get(key)
+            if comparison is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if comparison is not None:
+            return copy_comparison(comparison)
+
+        comparison = self._read(key)
+        with self._lock:
+            if comparison is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, copy_comparison(comparison))
+        return comparison
+
+    def put(self, key: str, comparison: DocumentComparison):
+        with self._lock:
+            self._remember(key, copy_comparison(comparison))
+        if self.cache_dir is not None:
+            data = comparison_to_bytes(comparison)
+            if len(data) <= self.max_bytes:
+                self._write(self._path(key), data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.budget is not None:
+            self.budget.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, comparison: DocumentComparison):
+        self._entries[key] = comparison
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{COMPARISON_SUFFIX}"
+
+    def _read(self, key: str) -> Optional[DocumentComparison]:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            comparison = comparison_from_bytes(data)
+        except Exception:
+            # Corrupt or foreign record - drop it and recompare
+            path.unlink(missing_ok=True)
+            self.budget.removed(len(data))
+            return None
+
+        # Touch so eviction sees this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return comparison
+
+    def _write(self, path: Path, data: bytes):
+        previous = self.budget.size_of(path)
+        # Write-then-rename so concurrent readers never see a partial record
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.budget.wrote(len(data), previous)
+
+
+_comparison_cache: Optional[ComparisonCache] = None
+
+
+def get_comparison_cache() -> Optional[ComparisonCache]:
+    """
+    Process-wide cache configured from settings (shared across Streamlit
+    reruns), or None when COMPARISON_CACHE_ENABLED is off
+    """
+    global _comparison_cache
+    if not settings.COMPARISON_CACHE_ENABLED:
+        return None
+    if _comparison_cache is None:
+        _comparison_cache = ComparisonCache(
+            max_entries=settings.COMPARISON_CACHE_SIZE,
+            cache_dir=settings.COMPARISON_CACHE_DIR if settings.COMPARISON_CACHE_PERSIST else None,
+            max_bytes=settings.COMPARISON_CACHE_MAX_MB * 1024 * 1024
+        )
+    return _comparison_cache
@@ -15,6 +15,40 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "BAAI/bge-base-en-v1.5"
     EMBEDDING_DEVICE: str = "cpu"
     
+    EXTRACTION_WORKERS: int = 1
+    EXTRACTION_PAGE_WORKERS: int = 1
+    EXTRACTION_CACHE_ENABLED: bool = False
+    EXTRACTION_CACHE_DIR: Path = PROJECT_ROOT / "cache" / "extraction"
+    EXTRACTION_CACHE_MAX_MB: int = 256
+    EXTRACTION_PROFILING: bool = False
+    ADAPTIVE_TABLE_STRATEGIES: bool = False
+    TABLE_STRATEGY_MEMO_PATH: Path = PROJECT_ROOT / "cache" / "table_strategies.json"
+
+    WATCH_POLL_SECONDS: float = 2.0
+    WATCH_DEBOUNCE_SECONDS: float = 3.0
+    WATCH_MAX_PENDING: int = 8
+    WATCH_MAX_DOCUMENTS: int = 128
+
+    RECONCILE_WORKERS: int = 1
+    RECONCILE_DATE_WINDOW_DAYS: int = 45
+
+    COMPARISON_CACHE_ENABLED: bool = True
+    COMPARISON_CACHE_SIZE: int = 32
+    COMPARISON_CACHE_PERSIST: bool = False
+    COMPARISON_CACHE_DIR: Path = PROJECT_ROOT / "cache" / "comparison"
+    COMPARISON_CACHE_MAX_MB: int = 128
+
+    REPORT_WORKERS: int = 3
+    REPORT_JSON_STYLE: str = "pretty"
+    REPORT_JSON_COMPRESSION: str = ""
+    REPORT_EXCEL_FAST_EXPORT: bool = True
+    REPORT_COLUMNAR_FORMAT: str = "parquet"
+    REPORT_DATASET_ENABLED: bool = False
+    REPORT_DATASET_DIR: Path = PROJECT_ROOT / "reports" / "dataset"
+
+    HISTORY_STORE_ENABLED: bool = False
+    HISTORY_DB_PATH: Path = PROJECT_ROOT / "history" / "reconciliation.duckdb"
+
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
     
@@ -14,11 +14,11 @@ Run this and share the OUTPUT with me!
 from pathlib import Path
 import sys
 
-try:
-    import pdfplumber
-    HAS_PDFPLUMBER = True
-except ImportError:
-    HAS_PDFPLUMBER = False
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.pdf_extractor import PDFParseSession, HAS_PDFPLUMBER
+
+if not HAS_PDFPLUMBER:
     print("❌ ERROR: pdfplumber not installed!")
     print("   Install it with: pip install pdfplumber")
     sys.exit(1)
@@ -30,16 +30,17 @@ def diagnose_pdf_extraction(pdf_path: Path):
     print('='*80)
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            print(f"\n📄 Total pages: {len(pdf.pages)}")
+        with PDFParseSession(pdf_path) as session:
+            print(f"\n📄 Total pages: {session.page_count}")
 
-            for page_num, page in enumerate(pdf.pages, 1):
+            for page_index in range(session.page_count):
+                page_num = page_index + 1
                 print(f"\n{'─'*80}")
                 print(f"PAGE {page_num}")
                 print('─'*80)
 
-                # Extract text sample
-                text = page.extract_text()
+                # Extract text sample (same text the extractor sees)
+                text = session.page_text(page_index)
                 if text:
                     print(f"\n📝 Text sample (first 500 characters):")
                     print("-" * 40)
@@ -54,7 +55,7 @@ def diagnose_pdf_extraction(pdf_path: Path):
 
                 # Strategy 1: Default extraction
                 try:
-                    tables = page.extract_tables()
+                    tables = session.page_tables(page_index)
                     print(f"\n  Strategy 1 (Default):")
                     print(f"    Tables found: {len(tables) if tables else 0}")
 
@@ -93,11 +94,11 @@ def diagnose_pdf_extraction(pdf_path: Path):
                         "vertical_strategy": "lines",
                         "horizontal_strategy": "lines",
                     }
-                    tables = page.extract_tables(table_settings=table_settings)
+                    tables = session.page_tables(page_index, table_settings)
                     print(f"\n  Strategy 2 (Lines-based):")
                     print(f"    Tables found: {len(tables) if tables else 0}")
 
-                    if tables and not page.extract_tables():
+                    if tables and not session.page_tables(page_index):
                         # Only show if different from default
                         for table_num, table in enumerate(tables, 1):
                             print(f"    TABLE {table_num}: {len(table)} rows, {len(table[0]) if table else 0} cols")
@@ -111,7 +112,7 @@ def diagnose_pdf_extraction(pdf_path: Path):
                         "vertical_strategy": "text",
                         "horizontal_strategy": "text",
                     }
-                    tables = page.extract_tables(table_settings=table_settings)
+                    tables = session.page_tables(page_index, table_settings)
                     print(f"\n  Strategy 3 (Text-based):")
                     print(f"    Tables found: {len(tables) if tables else 0}")
 
@@ -0,0 +1,254 @@
+"""
+Content-addressed on-disk cache for extracted documents.
+
+Entries are keyed by the SHA-256 of the PDF bytes plus EXTRACTOR_VERSION
+(and the extraction mode when table strategies are adaptive), so
+re-uploading or re-running the pipeline on an unchanged file skips pypdf and
+pdfplumber entirely. Records are stored as zlib-compressed JSON with line
+items laid out column by column, and the directory is kept under a byte
+budget by evicting least recently used entries. DiskBudget keeps a running
+total of the directory's size, so a write only scans the directory when it
+pushes the total over the budget.
+
+Alongside whole documents the cache keeps one record per page content hash
+(page text plus the rows each table strategy produced), which lets
+PDFExtractor re-parse only the changed pages of a revised document.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.config import settings
+from src.pdf_extractor import (
+    EXTRACTOR_VERSION, DocumentMetadata, DocumentText, ExtractedDocument, LineItem, LineItemTable
+)
+
+CACHE_MAGIC = b"PDFX3"
+CACHE_SUFFIX = ".pdfx"
+PAGE_MAGIC = b"PDFP1"
+PAGE_SUFFIX = ".pdfp"
+
+LINE_ITEM_FIELDS = [f.name for f in fields(LineItem)]
+
+
+def document_to_bytes(doc: ExtractedDocument) -> bytes:
+    """Serialize a document with its line items stored column-wise"""
+    record = {
+        f.name: getattr(doc, f.name) for f in fields(ExtractedDocument)
+        if f.name not in ('metadata', 'items', 'raw_text')
+    }
+    record['metadata'] = asdict(doc.metadata)
+    items = doc.items
+    raw_text = doc.raw_text
+    record['raw_text'] = list(raw_text.pages) if isinstance(raw_text, DocumentText) else [raw_text]
+    if isinstance(items, LineItemTable):
+        record['items'] = {name: items.column(name).tolist() for name in LINE_ITEM_FIELDS}
+    else:
+        record['items'] = {
+            name: [getattr(item, name) for item in items]
+            for name in LINE_ITEM_FIELDS
+        }
+    payload = json.dumps(record, separators=(',', ':')).encode('utf-8')
+    return CACHE_MAGIC + zlib.compress(payload, 6)
+
+
+def document_from_bytes(data: bytes) -> ExtractedDocument:
+    """Inverse of document_to_bytes"""
+    if not data.startswith(CACHE_MAGIC):
+        raise ValueError("Not an extraction cache record")
+    record = json.loads(zlib.decompress(data[len(CACHE_MAGIC):]).decode('utf-8'))
+
+    items = LineItemTable.from_columns(record.pop('items'))
+    metadata = DocumentMetadata(**record.pop('metadata'))
+    record['raw_text'] = DocumentText(record['raw_text'])
+    return ExtractedDocument(metadata=metadata, items=items, **record)
+
+
+class DiskBudget:
+    """
+    Running byte total of the cache files in a directory.
+
+    Writes adjust the total instead of re-listing the directory. The first
+    write, and any write that takes the total over max_bytes, scans the
+    directory. An over-budget scan deletes least recently used files until
+    the total is at most low_water * max_bytes, so the next eviction is
+    many writes away. Files written by other processes are counted at the
+    next scan.
+    """
+
+    def __init__(self, directory: Path, suffixes: Sequence[str], max_bytes: int, low_water: float = 0.9):
+        self.directory = Path(directory)
+        self.suffixes = tuple(suffixes)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self._total: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def size_of(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def files(self) -> Iterator[Path]:
+        for suffix in self.suffixes:
+            yield from self.directory.glob(f"*{suffix}")
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def wrote(self, size: int, previous: int = 0):
+        """Account for a file of size bytes that replaced one of previous bytes; evict if over budget"""
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._scan())
+            else:
+                self._total += size - previous
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def removed(self, size: int):
+        with self._lock:
+            if self._total is not None:
+                self._total = max(0, self._total - size)
+
+    def _evict(self):
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            target = self.max_bytes * self.low_water
+            for _, size, path in sorted(entries):
+                path.unlink(missing_ok=True)
+                total -= size
+                if total <= target:
+                    break
+        self._total = total
+
+    def clear(self):
+        with self._lock:
+            for path in self.files():
+                path.unlink(missing_ok=True)
+            self._total = 0
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of ExtractedDocument records on disk"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.budget = DiskBudget(self.cache_dir, (CACHE_SUFFIX, PAGE_SUFFIX), max_bytes)
+
+    def key_for(self, data: bytes, variant: str = '') -> str:
+        """
+        Key of a document's bytes; variant names the extraction mode
+        (e.g. 'adaptive') when it can change the result
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{digest}-v{EXTRACTOR_VERSION}" + (f"-{variant}" if variant else "")
+
+    def _path(self, key: str, suffix: str = CACHE_SUFFIX) -> Path:
+        return self.cache_dir / f"{key}{suffix}"
+
+    def get(self, key: str) -> Optional[ExtractedDocument]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            doc = document_from_bytes(data)
+        except Exception:
+            # Corrupt or foreign record - drop it and re-extract
+            path.unlink(missing_ok=True)
+            self.budget.removed(len(data))
+            return None
+
+        # Touch so eviction sees this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return doc
+
+    def put(self, key: str, doc: ExtractedDocument):
+        data = document_to_bytes(doc)
+        if len(data) > self.max_bytes:
+            return
+
+        self._write(self._path(key), data)
+
+    def get_page(self, page_hash: str) -> Optional[Dict]:
+        """Stored record for a page content hash: {'text': ..., 'tables': {strategy: rows}}"""
+        path = self._path(f"{page_hash}-v{EXTRACTOR_VERSION}", PAGE_SUFFIX)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            if not data.startswith(PAGE_MAGIC):
+                raise ValueError("Not a page cache record")
+            record = json.loads(zlib.decompress(data[len(PAGE_MAGIC):]).decode('utf-8'))
+        except Exception:
+            path.unlink(missing_ok=True)
+            self.budget.removed(len(data))
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return record
+
+    def put_pages(self, records: Dict[str, Dict]):
+        """Store page records keyed by page content hash"""
+        for page_hash, record in records.items():
+            payload = json.dumps(record, separators=(',', ':')).encode('utf-8')
+            self._write(
+                self._path(f"{page_hash}-v{EXTRACTOR_VERSION}", PAGE_SUFFIX),
+                PAGE_MAGIC + zlib.compress(payload, 6)
+            )
+
+    def _write(self, path: Path, data: bytes):
+        previous = self.budget.size_of(path)
+        # Write-then-rename so concurrent readers never see a partial record
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.budget.wrote(len(data), previous)
+
+    def clear(self):
+        self.budget.clear()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Cache configured from settings, or None when EXTRACTION_CACHE_ENABLED is off"""
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return None
+    return ExtractionCache(
+        settings.EXTRACTION_CACHE_DIR,
+        max_bytes=settings.EXTRACTION_CACHE_MAX_MB * 1024 * 1024
+    )
@@ -0,0 +1,141 @@
+"""
+Per-stage instrumentation for PDFExtractor.
+
+An ExtractionProfiler handed to PDFExtractor (or extract_all_pdfs) records,
+for every document, wall time and optionally allocations of each stage
+(open, page_cache, text, tables, metadata, totals, notes) plus pages
+touched, pages reused from the page cache and table rows parsed. Finished
+DocumentProfiles are kept on the profiler and passed to any registered
+callbacks; summary() aggregates them for a JSON report. Allocation tracking
+starts tracemalloc only if it is not already running, and stops it again
+once the document's profile is recorded.
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+EXTRACTION_STAGES = ('open', 'page_cache', 'text', 'tables', 'metadata', 'totals', 'notes')
+
+
+@dataclass
+class StageStats:
+    """Accumulated cost of one stage within one document"""
+    seconds: float = 0.0
+    calls: int = 0
+    allocated_bytes: int = 0
+    peak_bytes: int = 0
+
+
+@dataclass
+class DocumentProfile:
+    """Stage timings and counters for one extracted document"""
+    document: str
+    doc_type: str = ""
+    vendor: str = ""
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    pages_touched: int = 0
+    pages_reused: int = 0
+    rows_parsed: int = 0
+    items_extracted: int = 0
+    table_strategy: str = ""
+    total_seconds: float = 0.0
+    error: str = ""
+    track_allocations: bool = False
+    started_tracing: bool = field(default=False, repr=False)
+
+    @contextmanager
+    def stage(self, name: str):
+        stats = self.stages.setdefault(name, StageStats())
+        if self.track_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            if self.track_allocations:
+                after, peak = tracemalloc.get_traced_memory()
+                stats.allocated_bytes += max(after - before, 0)
+                stats.peak_bytes = max(stats.peak_bytes, peak - before)
+
+    def finish(self):
+        """Stop tracemalloc if this profile started it; tracing someone else began is left running"""
+        if self.started_tracing:
+            self.started_tracing = False
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    def to_dict(self) -> Dict:
+        record = asdict(self)
+        record.pop('track_allocations')
+        record.pop('started_tracing')
+        return record
+
+
+class ExtractionProfiler:
+    """Collects DocumentProfiles and notifies callbacks as each document finishes"""
+
+    def __init__(
+        self,
+        track_allocations: bool = False,
+        callbacks: Optional[List[Callable[[DocumentProfile], None]]] = None
+    ):
+        self.track_allocations = track_allocations
+        self.callbacks = list(callbacks or [])
+        self.profiles: List[DocumentProfile] = []
+
+    def add_callback(self, callback: Callable[[DocumentProfile], None]):
+        self.callbacks.append(callback)
+
+    def begin_document(self, name: str) -> DocumentProfile:
+        return DocumentProfile(document=name, track_allocations=self.track_allocations)
+
+    def record(self, profile: DocumentProfile):
+        """Store a finished profile (also used for profiles returned by worker processes)"""
+        profile.finish()
+        self.profiles.append(profile)
+        for callback in self.callbacks:
+            callback(profile)
+
+    def summary(self) -> Dict:
+        stage_totals = {}
+        for profile in self.profiles:
+            for name, stats in profile.stages.items():
+                total = stage_totals.setdefault(name, StageStats())
+                total.seconds += stats.seconds
+                total.calls += stats.calls
+                total.allocated_bytes += stats.allocated_bytes
+                total.peak_bytes = max(total.peak_bytes, stats.peak_bytes)
+
+        ordered = [s for s in EXTRACTION_STAGES if s in stage_totals]
+        ordered += [s for s in stage_totals if s not in EXTRACTION_STAGES]
+
+        return {
+            'documents': len(self.profiles),
+            'total_seconds': round(sum(p.total_seconds for p in self.profiles), 6),
+            'pages_touched': sum(p.pages_touched for p in self.profiles),
+            'pages_reused': sum(p.pages_reused for p in self.profiles),
+            'rows_parsed': sum(p.rows_parsed for p in self.profiles),
+            'items_extracted': sum(p.items_extracted for p in self.profiles),
+            'stages': {name: asdict(stage_totals[name]) for name in ordered},
+            'per_document': [p.to_dict() for p in self.profiles],
+        }
+
+    def summary_json(self, indent: int = 2) -> str:
+        return json.dumps(self.summary(), indent=indent)
+
+    def write_json(self, path: Path) -> str:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.summary_json())
+        return str(path)
@@ -0,0 +1,327 @@
+"""
+Persistent history of PO / invoice comparisons in DuckDB.
+
+Reports in reports/ are overwritten on every run; the store keeps one
+record per compared pair so trends can be queried later. Tables:
+
+- documents: one row per PO / invoice of a comparison - ids, vendor,
+  customer, parsed date and header totals
+- line_items: every extracted line of both documents
+- discrepancies: every item-level comparison row that is not a MATCH, with
+  the PO's vendor and date so drift can be grouped by supplier and time
+
+All rows carry a comparison_id derived from the content of both documents:
+recording the same pair again replaces its documents and discrepancies rows
+(its line items, fixed by the content, are kept) rather than duplicating
+them. A pair's first recording only inserts; the keyed deletes run for
+pairs already in the store, and never touch line_items. Rows are appended in bulk from Arrow tables, one transaction per
+comparison, and SKU / vendor / date columns are indexed.
+
+duckdb and pyarrow are optional; without them HAS_DUCKDB is False and
+opening a store raises ImportError.
+"""
+
+import hashlib
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from src.config import settings
+from src.pdf_extractor import ExtractedDocument, LineItemTable, LINE_ITEM_NUMERIC_FIELDS, LINE_ITEM_STRING_FIELDS
+from src.comparator import DocumentComparison
+from src.reconciliation import document_date
+
+try:
+    import duckdb
+    import pyarrow as pa
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    comparison_id VARCHAR,
+    recorded_at TIMESTAMP,
+    role VARCHAR,
+    document_id VARCHAR,
+    doc_type VARCHAR,
+    vendor VARCHAR,
+    customer VARCHAR,
+    doc_date DATE,
+    line_count BIGINT,
+    subtotal DOUBLE,
+    total_discount DOUBLE,
+    taxable_amount DOUBLE,
+    tax DOUBLE,
+    total DOUBLE
+);
+CREATE TABLE IF NOT EXISTS line_items (
+    comparison_id VARCHAR,
+    role VARCHAR,
+    document_id VARCHAR,
+    vendor VARCHAR,
+    doc_date DATE,
+    line_no BIGINT,
+    item_no VARCHAR,
+    description VARCHAR,
+    unit VARCHAR,
+    quantity DOUBLE,
+    unit_price DOUBLE,
+    discount_pct DOUBLE,
+    discount_amount DOUBLE,
+    taxable_amount DOUBLE,
+    total_price DOUBLE
+);
+CREATE TABLE IF NOT EXISTS discrepancies (
+    comparison_id VARCHAR,
+    recorded_at TIMESTAMP,
+    po_id VARCHAR,
+    invoice_id VARCHAR,
+    vendor VARCHAR,
+    doc_date DATE,
+    sku VARCHAR,
+    description VARCHAR,
+    status VARCHAR,
+    severity VARCHAR,
+    reason VARCHAR,
+    po_quantity DOUBLE,
+    invoice_quantity DOUBLE,
+    po_unit_price DOUBLE,
+    invoice_unit_price DOUBLE,
+    quantity_diff DOUBLE,
+    price_diff DOUBLE,
+    price_variance_pct DOUBLE,
+    total_diff DOUBLE,
+    discount_diff DOUBLE
+);
+CREATE INDEX IF NOT EXISTS documents_vendor ON documents (vendor);
+CREATE INDEX IF NOT EXISTS documents_date ON documents (doc_date);
+CREATE INDEX IF NOT EXISTS line_items_sku ON line_items (item_no);
+CREATE INDEX IF NOT EXISTS line_items_vendor ON line_items (vendor);
+CREATE INDEX IF NOT EXISTS line_items_date ON line_items (doc_date);
+CREATE INDEX IF NOT EXISTS discrepancies_sku ON discrepancies (sku);
+CREATE INDEX IF NOT EXISTS discrepancies_vendor ON discrepancies (vendor);
+CREATE INDEX IF NOT EXISTS discrepancies_date ON discrepancies (doc_date);
+"""
+
+# Columns of the comparison's Arrow table copied into discrepancies
+_DISCREPANCY_COLUMNS = (
+    'item_no', 'description', 'status', 'severity', 'reason',
+    'po_quantity', 'invoice_quantity', 'po_unit_price', 'invoice_unit_price',
+    'quantity_diff', 'price_diff', 'price_variance_pct', 'total_diff', 'discount_diff',
+)
+
+
+def comparison_id(po_doc: ExtractedDocument, invoice_doc: ExtractedDocument) -> str:
+    """Stable id of a PO / invoice pair, from the content of both documents"""
+    from src.comparison_cache import document_fingerprint
+
+    digest = hashlib.sha256()
+    digest.update(document_fingerprint(po_doc).encode())
+    digest.update(document_fingerprint(invoice_doc).encode())
+    return digest.hexdigest()[:32]
+
+
+def _line_items_table(doc: ExtractedDocument):
+    """The document's lines as Arrow columns; strings stay dictionary-encoded on the table's pools"""
+    items = doc.items if isinstance(doc.items, LineItemTable) else LineItemTable.from_items(doc.items)
+    columns = {'line_no': pa.array(np.arange(1, len(items) + 1, dtype=np.int64))}
+    for name in LINE_ITEM_STRING_FIELDS:
+        codes, pool = items.string_codes(name)
+        columns[name] = pa.DictionaryArray.from_arrays(
+            pa.array(np.asarray(codes, dtype=np.int32)), pa.array(pool, type=pa.string())
+        )
+    for name in LINE_ITEM_NUMERIC_FIELDS:
+        columns[name] = pa.array(np.asarray(items.column(name), dtype=np.float64))
+    return pa.table(columns)
+
+
+class ReconciliationStore:
+    """DuckDB database of compared documents, their lines and discrepancies"""
+
+    def __init__(self, path: Optional[Path] = None):
+        if not HAS_DUCKDB:
+            raise ImportError("The reconciliation history store needs duckdb and pyarrow: pip install duckdb pyarrow")
+        self.path = Path(path or settings.HISTORY_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = duckdb.connect(str(self.path))
+        self._connection.execute(SCHEMA)
+        # One connection shared by the pipeline and Streamlit threads
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        comparison: DocumentComparison,
+        po_doc: ExtractedDocument,
+        invoice_doc: ExtractedDocument,
+        recorded_at: Optional[datetime] = None
+    ) -> str:
+        """Append (or replace) one comparison; returns its comparison_id"""
+        from src.columnar_report import item_comparison_table
+
+        key = comparison_id(po_doc, invoice_doc)
+        recorded_at = recorded_at or datetime.now()
+        vendor = po_doc.metadata.vendor_name
+        po_date = document_date(po_doc.metadata)
+
+        sides = [('po', po_doc), ('invoice', invoice_doc)]
+        documents = pa.table({
+            'comparison_id': [key] * 2,
+            'recorded_at': pa.array([recorded_at] * 2, type=pa.timestamp('us')),
+            'role': [role for role, _ in sides],
+            'document_id': [doc.metadata.document_id for _, doc in sides],
+            'doc_type': [doc.metadata.doc_type for _, doc in sides],
+            'vendor': [doc.metadata.vendor_name for _, doc in sides],
+            'customer': [doc.metadata.customer_name for _, doc in sides],
+            'doc_date': pa.array([document_date(doc.metadata) for _, doc in sides], type=pa.date32()),
+            'line_count': pa.array([len(doc.items) for _, doc in sides], type=pa.int64()),
+            **{
+                name: pa.array([float(getattr(doc, name)) for _, doc in sides], type=pa.float64())
+                for name in ('subtotal', 'total_discount', 'taxable_amount', 'tax', 'total')
+            },
+        })
+        items = item_comparison_table(comparison)
+
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN TRANSACTION")
+            try:
+                known = connection.execute(
+                    "SELECT count(*) FROM documents WHERE comparison_id = ?", [key]
+                ).fetchone()[0] > 0
+                # Line items depend only on the documents, which the id already
+                # covers, so a known pair keeps its lines; the comparison rows
+                # can differ with comparator settings and are replaced
+                if known:
+                    for table in ('documents', 'discrepancies'):
+                        connection.execute(f"DELETE FROM {table} WHERE comparison_id = ?", [key])
+
+                connection.register('batch_documents', documents)
+                connection.execute("INSERT INTO documents BY NAME SELECT * FROM batch_documents")
+
+                for role, doc in ([] if known else sides):
+                    connection.register('batch_lines', _line_items_table(doc))
+                    connection.execute(
+                        "INSERT INTO line_items BY NAME "
+                        "SELECT ? AS comparison_id, ? AS role, ? AS document_id, ? AS vendor, ? AS doc_date, * "
+                        "FROM batch_lines",
+                        [key, role, doc.metadata.document_id, doc.metadata.vendor_name,
+                         document_date(doc.metadata)]
+                    )
+                    connection.unregister('batch_lines')
+
+                connection.register('batch_items', items)
+                connection.execute(
+                    "INSERT INTO discrepancies BY NAME "
+                    "SELECT ? AS comparison_id, ? AS recorded_at, ? AS po_id, ? AS invoice_id, "
+                    "? AS vendor, ? AS doc_date, item_no AS sku, "
+                    f"{', '.join(_DISCREPANCY_COLUMNS[1:])} "
+                    "FROM batch_items WHERE status <> 'MATCH'",
+                    [key, recorded_at, comparison.po_doc_id, comparison.invoice_doc_id, vendor, po_date]
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            finally:
+                for view in ('batch_documents', 'batch_items'):
+                    try:
+                        connection.unregister(view)
+                    except Exception:
+                        pass
+        return key
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None):
+        """Run SQL against the store and return a pandas DataFrame"""
+        with self._lock:
+            return self._connection.execute(sql, params or []).df()
+
+    def sku_drift(self, vendor: Optional[str] = None, since: Optional[date] = None, limit: int = 20):
+        """SKUs with the most discrepancies (then the largest net line-total drift)"""
+        return self.query(
+            """
+            SELECT sku,
+                   any_value(description) AS description,
+                   count(*) AS discrepancies,
+                   count(DISTINCT comparison_id) AS comparisons,
+                   avg(price_variance_pct) AS avg_price_variance_pct,
+                   sum(total_diff) AS total_diff,
+                   max(doc_date) AS last_seen
+            FROM discrepancies
+            WHERE (CAST(? AS VARCHAR) IS NULL OR vendor = ?)
+              AND (CAST(? AS DATE) IS NULL OR doc_date >= ?)
+            GROUP BY sku
+            ORDER BY discrepancies DESC, abs(sum(total_diff)) DESC, sku
+            LIMIT ?
+            """,
+            [vendor, vendor, since, since, limit]
+        )
+
+    def vendor_summary(self, since: Optional[date] = None):
+        """Per vendor: comparisons recorded, discrepant lines and their net line-total difference"""
+        return self.query(
+            """
+            SELECT d.vendor,
+                   count(DISTINCT d.comparison_id) AS comparisons,
+                   CAST(coalesce(sum(x.discrepancies), 0) AS BIGINT) AS discrepancies,
+                   coalesce(sum(x.total_diff), 0) AS total_diff,
+                   max(d.doc_date) AS last_seen
+            FROM documents d
+            LEFT JOIN (
+                SELECT comparison_id, count(*) AS discrepancies, sum(total_diff) AS total_diff
+                FROM discrepancies GROUP BY comparison_id
+            ) x USING (comparison_id)
+            WHERE d.role = 'po' AND (CAST(? AS DATE) IS NULL OR d.doc_date >= ?)
+            GROUP BY d.vendor
+            ORDER BY discrepancies DESC, d.vendor
+            """,
+            [since, since]
+        )
+
+    def document_history(self, document_id: str):
+        """Every recorded comparison a PO or invoice id took part in, newest first"""
+        return self.query(
+            "SELECT * FROM documents WHERE document_id = ? ORDER BY recorded_at DESC, role",
+            [document_id]
+        )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "ReconciliationStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_history_store: Optional[ReconciliationStore] = None
+
+
+def get_history_store() -> Optional[ReconciliationStore]:
+    """
+    Process-wide store opened from settings, or None when HISTORY_STORE_ENABLED
+    is off or duckdb is not installed
+    """
+    global _history_store
+    if not settings.HISTORY_STORE_ENABLED or not HAS_DUCKDB:
+        return None
+    if _history_store is None:
+        _history_store = ReconciliationStore(settings.HISTORY_DB_PATH)
+    return _history_store
+
+
+def record_comparison(
+    comparison: DocumentComparison,
+    po_doc: ExtractedDocument,
+    invoice_doc: ExtractedDocument
+) -> Optional[str]:
+    """Record a comparison in the configured store; returns its comparison_id, or None when disabled"""
+    store = get_history_store()
+    if store is None:
+        return None
+    return store.record(comparison, po_doc, invoice_doc)
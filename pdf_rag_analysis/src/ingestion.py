@@ -0,0 +1,365 @@
+"""
+Watch-folder ingestion for the PO / proforma invoice pipeline.
+
+IngestionDaemon polls a directory for PDFs, waits until a file has stopped
+changing (debounce) and extracts it on a bounded process pool. Extracted
+documents are paired the way BatchReconciler pairs a batch (document ID,
+then vendor and date, then vendor alone); as soon as a PO has its
+invoice(s), the group is compared and its reports are written to a folder
+named after the PO, as in batch mode. A file that changes again later is
+re-extracted and its group re-compared, and an invoice joining a PO that was
+already compared (a split shipment) re-compares the merged delivery.
+
+Only the most recently ingested max_documents documents are kept for
+pairing; older ones are dropped, so memory stays bounded however long the
+daemon runs. If a worker process dies, the pool is shut down and the files
+it was extracting are resubmitted once, one at a time, to a fresh pool; a
+file that breaks the pool again is counted as failed.
+
+Queue depth, in-flight extractions, backpressure and throughput are kept in
+IngestionStats and written to ingestion_stats.json in the reports directory.
+"""
+
+import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from src.config import settings
+from src.pdf_extractor import ExtractedDocument, _extract_pdf_worker
+from src.extraction_cache import get_extraction_cache
+from src.table_strategy import TableStrategyMemo, get_table_strategy_memo
+from src.comparator import compare_po_with_invoice
+from src.reconciliation import BatchReconciler, ReconciliationGroup, merge_shipments
+from src.report_generator import generate_all_reports
+from src.history_store import record_comparison
+
+FileSignature = Tuple[int, float]
+
+# Times a file may be resubmitted after the pool broke while extracting it
+MAX_CRASH_RETRIES = 1
+
+
+@dataclass
+class IngestionStats:
+    """Counters for a running IngestionDaemon"""
+    started_at: float = field(default_factory=time.time)
+    files_seen: int = 0
+    files_queued: int = 0
+    files_extracted: int = 0
+    files_failed: int = 0
+    files_retried: int = 0
+    pairs_compared: int = 0
+    # Documents held for pairing, and those dropped to stay under max_documents
+    documents_retained: int = 0
+    documents_evicted: int = 0
+    pool_restarts: int = 0
+    # Stable files waiting for a worker slot, and extractions submitted
+    backlog: int = 0
+    in_flight: int = 0
+    max_backlog: int = 0
+    # Polling ticks that ended with files held back because the pool was full
+    backpressure_ticks: int = 0
+    extract_seconds: float = 0.0
+    compare_seconds: float = 0.0
+
+    def snapshot(self) -> Dict:
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        record = asdict(self)
+        record['uptime_seconds'] = round(elapsed, 1)
+        record['documents_per_minute'] = round(self.files_extracted * 60 / elapsed, 2)
+        record['pairs_per_minute'] = round(self.pairs_compared * 60 / elapsed, 2)
+        return record
+
+
+class IngestionDaemon:
+    def __init__(
+        self,
+        watch_dir: Path,
+        reports_dir: Path,
+        max_workers: int = 1,
+        max_pending: int = 8,
+        poll_interval: float = 2.0,
+        debounce_seconds: float = 3.0,
+        cache=None,
+        strategy_memo: Optional[TableStrategyMemo] = None,
+        max_documents: int = 128,
+        date_window_days: int = 45
+    ):
+        self.watch_dir = Path(watch_dir)
+        self.reports_dir = Path(reports_dir)
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max(1, max_workers)
+        # Extractions submitted to the pool at once; further stable files wait
+        # in the backlog instead of piling up in the pool's unbounded queue
+        self.max_pending = max(1, max_pending)
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self.max_documents = max(2, max_documents)
+        self.stats = IngestionStats()
+        # PO name -> report paths of its latest comparison
+        self.reports: Dict[str, Dict[str, str]] = {}
+
+        self._worker = partial(_extract_pdf_worker, cache=cache, strategy_memo=strategy_memo)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # path -> (signature, time it was first seen with that signature)
+        self._observed: Dict[Path, Tuple[FileSignature, float]] = {}
+        # path -> signature of the version last ingested
+        self._ingested: Dict[Path, FileSignature] = {}
+        self._backlog: Deque[Tuple[Path, FileSignature]] = deque()
+        self._pending: Set[Path] = set()
+        self._futures: Dict[Future, Tuple[Path, FileSignature, float]] = {}
+        # path -> times it was resubmitted after the pool broke
+        self._crashes: Dict[Path, int] = {}
+        # Documents arrive one at a time, so a lone PO and invoice are not
+        # assumed to belong together until something actually links them
+        self._reconciler = BatchReconciler(date_window_days=date_window_days, pair_sole_documents=False)
+        # name -> document, least recently ingested first
+        self._documents: "OrderedDict[str, ExtractedDocument]" = OrderedDict()
+        # PO name -> invoice names of the group last compared
+        self._compared: Dict[str, Tuple[str, ...]] = {}
+        self._running = False
+
+    def run(self, max_seconds: Optional[float] = None, status_interval: float = 60.0):
+        """Poll until stop() is called, Ctrl+C, or max_seconds have passed"""
+        print(f"\n👀 Watching {self.watch_dir} (workers={self.max_workers}, "
+              f"max pending={self.max_pending}, debounce={self.debounce_seconds}s)")
+        self._running = True
+        started = time.time()
+        last_status = started
+        try:
+            while self._running:
+                self.run_once()
+                now = time.time()
+                if now - last_status >= status_interval:
+                    self._report_status()
+                    last_status = now
+                if max_seconds is not None and now - started >= max_seconds:
+                    break
+        except KeyboardInterrupt:
+            print("\n⏹  Stopping ingestion")
+        finally:
+            self._running = False
+            self.close()
+            self._report_status()
+
+    def stop(self):
+        self._running = False
+
+    def run_once(self, timeout: Optional[float] = None):
+        """One polling tick: scan, submit what fits, then wait up to timeout for results"""
+        self._scan(time.time())
+        self._submit()
+        self._collect(self.poll_interval if timeout is None else timeout)
+
+        self.stats.backlog = len(self._backlog)
+        self.stats.in_flight = len(self._futures)
+        self.stats.max_backlog = max(self.stats.max_backlog, self.stats.backlog)
+
+    def drain(self, timeout: float = 300.0) -> bool:
+        """Tick until nothing is observed, queued or in flight; False on timeout"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            self.run_once(timeout=min(self.poll_interval, 0.2))
+            if not (self._observed or self._backlog or self._futures):
+                return True
+        return False
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _scan(self, now: float):
+        for path in sorted(self.watch_dir.glob("*.pdf")):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime)
+            if path in self._pending or self._ingested.get(path) == signature:
+                continue
+
+            observed = self._observed.get(path)
+            if observed is None or observed[0] != signature:
+                # New file or still being written - restart its debounce window
+                if observed is None:
+                    self.stats.files_seen += 1
+                self._observed[path] = (signature, now)
+                continue
+
+            if now - observed[1] >= self.debounce_seconds:
+                del self._observed[path]
+                self._backlog.append((path, signature))
+                self._pending.add(path)
+
+        # Files deleted before they settled
+        for path in [p for p in self._observed if not p.exists()]:
+            del self._observed[path]
+
+    def _submit(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        while self._backlog and len(self._futures) < self.max_pending:
+            path, signature = self._backlog[0]
+            # Files caught in a pool crash are resubmitted one at a time, so a
+            # second crash is pinned on the file that caused it
+            isolated = path in self._crashes
+            if isolated and self._futures:
+                break
+            self._backlog.popleft()
+            future = self._pool.submit(self._worker, path)
+            self._futures[future] = (path, signature, time.perf_counter())
+            self.stats.files_queued += 1
+            if isolated:
+                break
+
+        if self._backlog:
+            self.stats.backpressure_ticks += 1
+
+    def _collect(self, timeout: float):
+        if not self._futures:
+            time.sleep(timeout)
+            return
+
+        done, _ = wait(list(self._futures), timeout=timeout, return_when=FIRST_COMPLETED)
+        broken = None
+        for future in done:
+            path, signature, submitted = self._futures.pop(future)
+            self.stats.extract_seconds += time.perf_counter() - submitted
+
+            try:
+                name, doc, error, _ = future.result()
+            except BrokenProcessPool as e:
+                broken = e
+                self._retry_or_fail(path, signature, e)
+                continue
+            except Exception as e:
+                name, doc, error = path.stem, None, f"{type(e).__name__}: {e}"
+
+            self._pending.discard(path)
+            self._ingested[path] = signature
+            self._crashes.pop(path, None)
+            if error is not None:
+                self.stats.files_failed += 1
+                print(f"  ❌ {path.name}: {error}")
+                continue
+
+            self.stats.files_extracted += 1
+            print(f"  ✅ {path.name}: {len(doc.items)} items, Total: ${doc.total:.2f}")
+            self._add_document(name, doc)
+
+        if broken is not None:
+            self._restart_pool(broken)
+
+    def _restart_pool(self, error: BaseException):
+        """A worker died: shut the broken pool down and resubmit everything still in flight on it"""
+        print(f"  ⚠️  Extraction pool broke ({error}), restarting it")
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.stats.pool_restarts += 1
+        for path, signature, _ in list(self._futures.values()):
+            self._retry_or_fail(path, signature, error)
+        self._futures.clear()
+
+    def _retry_or_fail(self, path: Path, signature: FileSignature, error: BaseException):
+        attempts = self._crashes.get(path, 0)
+        if attempts < MAX_CRASH_RETRIES:
+            self._crashes[path] = attempts + 1
+            self.stats.files_retried += 1
+            # Stays in _pending; goes back to the front of the queue
+            self._backlog.appendleft((path, signature))
+            return
+
+        self._crashes.pop(path, None)
+        self._pending.discard(path)
+        self._ingested[path] = signature
+        self.stats.files_failed += 1
+        print(f"  ❌ {path.name}: {type(error).__name__}: {error}")
+
+    def _add_document(self, name: str, doc: ExtractedDocument):
+        doc_type = doc.metadata.doc_type
+        if 'PURCHASE_ORDER' not in doc_type and 'INVOICE' not in doc_type:
+            print(f"  ⚠️  {name}: document type {doc_type}, not paired")
+            return
+
+        self._documents[name] = doc
+        self._documents.move_to_end(name)
+        self._evict_documents()
+
+        # Pair everything retained, as BatchReconciler would for this batch,
+        # and compare the groups this document joined or changed
+        groups = self._reconciler.pair(self._documents).groups
+        for group in groups:
+            members = tuple(group.invoice_names)
+            if name != group.po_name and name not in members and self._compared.get(group.po_name) == members:
+                continue
+            self._compare_group(group)
+        # POs whose invoices were claimed by a better match are compared afresh if re-paired
+        paired = {group.po_name for group in groups}
+        for po_name in [po_name for po_name in self._compared if po_name not in paired]:
+            del self._compared[po_name]
+
+    def _evict_documents(self):
+        while len(self._documents) > self.max_documents:
+            evicted, _ = self._documents.popitem(last=False)
+            self._compared.pop(evicted, None)
+            self.reports.pop(evicted, None)
+            self.stats.documents_evicted += 1
+        self.stats.documents_retained = len(self._documents)
+
+    def _compare_group(self, group: ReconciliationGroup):
+        invoice_doc = merge_shipments([self._documents[name] for name in group.invoice_names])
+        self._compared[group.po_name] = tuple(group.invoice_names)
+        self._compare_pair(group.po_name, self._documents[group.po_name], invoice_doc)
+
+    def _compare_pair(self, key: str, po_doc: ExtractedDocument, invoice_doc: ExtractedDocument):
+        start = time.perf_counter()
+        try:
+            comparison = compare_po_with_invoice(po_doc, invoice_doc)
+            output_dir = self.reports_dir / key
+            self.reports[key] = generate_all_reports(comparison, output_dir, po_doc, invoice_doc)
+        except Exception as e:
+            print(f"  ❌ Comparison failed for {key}: {e}")
+            return
+        finally:
+            self.stats.compare_seconds += time.perf_counter() - start
+
+        self.stats.pairs_compared += 1
+        print(f"  📑 {key}: {comparison.matching_items} matching, "
+              f"{comparison.discrepant_items} discrepant -> {output_dir}")
+
+        try:
+            record_comparison(comparison, po_doc, invoice_doc)
+        except Exception as e:
+            print(f"  ⚠️  {key}: comparison history not recorded: {e}")
+
+    def _report_status(self):
+        snapshot = self.stats.snapshot()
+        print(f"  📈 extracted={snapshot['files_extracted']} failed={snapshot['files_failed']} "
+              f"pairs={snapshot['pairs_compared']} backlog={snapshot['backlog']} "
+              f"in_flight={snapshot['in_flight']} docs/min={snapshot['documents_per_minute']}")
+        (self.reports_dir / "ingestion_stats.json").write_text(json.dumps(snapshot, indent=2))
+
+
+def create_ingestion_daemon(watch_dir: Path = None, reports_dir: Path = None) -> IngestionDaemon:
+    """Daemon configured from settings"""
+    return IngestionDaemon(
+        watch_dir or settings.DATA_DIR,
+        reports_dir or settings.REPORTS_DIR,
+        max_workers=settings.EXTRACTION_WORKERS,
+        max_pending=settings.WATCH_MAX_PENDING,
+        poll_interval=settings.WATCH_POLL_SECONDS,
+        debounce_seconds=settings.WATCH_DEBOUNCE_SECONDS,
+        cache=get_extraction_cache(),
+        strategy_memo=get_table_strategy_memo(),
+        max_documents=settings.WATCH_MAX_DOCUMENTS,
+        date_window_days=settings.RECONCILE_DATE_WINDOW_DAYS
+    )
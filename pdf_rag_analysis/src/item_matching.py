@@ -0,0 +1,227 @@
+"""
+Line matching between a purchase order and an invoice.
+
+match_line_items pairs the rows of two LineItemTables in three passes:
+
+1. exact SKU (item_no, ignoring case, whitespace and separators such as
+   '-' or '.'; rows without a SKU, or with the extractor's "UNKNOWN"
+   placeholder, skip this pass);
+2. exact lowercased description, the comparator's original key;
+3. fuzzy description match for whatever is still unpaired. Candidates come
+   from a character n-gram blocking index over the remaining invoice rows, so
+   similarity is only scored inside small blocks instead of for all n*m
+   pairs; n-grams shared by more than max_block rows carry no signal and are
+   skipped. Descriptions whose numbers differ (sizes, model numbers) never
+   match; the rest are assigned greedily by descending Dice similarity.
+
+The exact passes are array operations over per-row key ids (normalised
+once per distinct string); the fuzzy pass is linear in the leftover rows
+times n-grams per description, which keeps matching near-linear on large
+catalogs.
+"""
+
+import re
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.pdf_extractor import LineItemTable
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+# Placeholder the extractor gives rows of tables without a SKU column
+PLACEHOLDER_SKU = 'unknown'
+
+
+def normalise_sku(text: str) -> str:
+    """SKU key ignoring case, whitespace and punctuation; '' for a missing or placeholder SKU"""
+    key = _NON_ALNUM.sub('', text.lower())
+    return '' if key == PLACEHOLDER_SKU else key
+
+
+def _ngrams(text: str, n: int) -> Set[str]:
+    normalised = f" {_NON_ALNUM.sub(' ', text.lower()).strip()} "
+    if len(normalised) <= n:
+        return {normalised} if normalised.strip() else set()
+    return {normalised[i:i + n] for i in range(len(normalised) - n + 1)}
+
+
+KeyIds = Tuple[np.ndarray, np.ndarray, List[str]]
+
+
+def _key_ids(
+    po: LineItemTable,
+    invoice: LineItemTable,
+    field: str,
+    normalise: Callable[[str], str],
+    ordered: bool = False
+) -> KeyIds:
+    """
+    Per-row ids of a normalised string column in a key space shared by both
+    tables (-1 for empty keys), plus the normalised key of every id. With
+    ordered=True ids are ranks in sorted key order.
+
+    Only distinct strings are normalised and looked up.
+    """
+    sides = []
+    for table in (po, invoice):
+        codes, pool = table.string_codes(field)
+        used = np.flatnonzero(np.bincount(codes, minlength=len(pool)))
+        sides.append((codes, len(pool), used, [normalise(pool[code]) for code in used.tolist()]))
+
+    keys = list(dict.fromkeys(key for *_, normalised in sides for key in normalised if key))
+    if ordered:
+        keys.sort()
+    index = {key: i for i, key in enumerate(keys)}
+    index[''] = -1
+
+    row_ids = []
+    for codes, pool_size, used, normalised in sides:
+        id_of_code = np.full(pool_size, -1, dtype=np.int64)
+        id_of_code[used] = np.fromiter(map(index.__getitem__, normalised), dtype=np.int64, count=len(normalised))
+        row_ids.append(id_of_code[codes])
+    return row_ids[0], row_ids[1], keys
+
+
+def description_key_ids(po: LineItemTable, invoice: LineItemTable) -> KeyIds:
+    """
+    Rank of each row's lowercased description among the sorted distinct
+    descriptions of both tables (-1 when empty), and the sorted descriptions
+    """
+    return _key_ids(po, invoice, 'description', str.lower, ordered=True)
+
+
+def _occurrence_rank(ids: np.ndarray) -> np.ndarray:
+    """0 for the first row with a given id, 1 for the second, ..."""
+    order = np.argsort(ids, kind='stable')
+    sorted_ids = ids[order]
+    positions = np.arange(len(ids))
+    starts = np.ones(len(ids), dtype=bool)
+    starts[1:] = sorted_ids[1:] != sorted_ids[:-1]
+    group_start = np.maximum.accumulate(np.where(starts, positions, 0))
+    rank = np.empty(len(ids), dtype=np.int64)
+    rank[order] = positions - group_start
+    return rank
+
+
+def _pair_exact(
+    po_ids: np.ndarray,
+    invoice_ids: np.ndarray,
+    po_match: np.ndarray,
+    invoice_match: np.ndarray
+):
+    """Pair still-unmatched rows with equal keys; repeated keys pair in order of appearance"""
+    po_rows = np.flatnonzero((po_match < 0) & (po_ids >= 0))
+    invoice_rows = np.flatnonzero((invoice_match < 0) & (invoice_ids >= 0))
+    if not len(po_rows) or not len(invoice_rows):
+        return
+
+    po_rank = _occurrence_rank(po_ids[po_rows])
+    invoice_rank = _occurrence_rank(invoice_ids[invoice_rows])
+    stride = int(max(po_rank.max(), invoice_rank.max())) + 1
+    po_keys = po_ids[po_rows] * stride + po_rank
+    invoice_keys = invoice_ids[invoice_rows] * stride + invoice_rank
+
+    order = np.argsort(invoice_keys)
+    sorted_keys = invoice_keys[order]
+    position = np.minimum(np.searchsorted(sorted_keys, po_keys), len(sorted_keys) - 1)
+    found = sorted_keys[position] == po_keys
+
+    matched_po = po_rows[found]
+    matched_invoice = invoice_rows[order[position[found]]]
+    po_match[matched_po] = matched_invoice
+    invoice_match[matched_invoice] = matched_po
+
+
+def _pair_fuzzy(
+    po_ids: np.ndarray,
+    invoice_ids: np.ndarray,
+    descriptions: List[str],
+    po_match: np.ndarray,
+    invoice_match: np.ndarray,
+    threshold: float,
+    n: int,
+    max_block: int,
+    max_candidates: int
+):
+    invoice_rows = np.flatnonzero((invoice_match < 0) & (invoice_ids >= 0)).tolist()
+    po_rows = np.flatnonzero((po_match < 0) & (po_ids >= 0)).tolist()
+    if not invoice_rows or not po_rows:
+        return
+
+    invoice_grams = {row: _ngrams(descriptions[invoice_ids[row]], n) for row in invoice_rows}
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for row, grams in invoice_grams.items():
+        for gram in grams:
+            blocks[gram].append(row)
+
+    scored = []
+    for row in po_rows:
+        description = descriptions[po_ids[row]]
+        numbers = _NUMBER.findall(description)
+        grams = _ngrams(description, n)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            block = blocks.get(gram)
+            if block and len(block) <= max_block:
+                for other in block:
+                    shared[other] += 1
+        if not shared:
+            continue
+
+        best = sorted(shared.items(), key=lambda item: (-item[1], item[0]))[:max_candidates]
+        for other, _ in best:
+            if _NUMBER.findall(descriptions[invoice_ids[other]]) != numbers:
+                continue
+            other_grams = invoice_grams[other]
+            score = 2 * len(grams & other_grams) / (len(grams) + len(other_grams))
+            if score >= threshold:
+                scored.append((-score, row, other))
+
+    for _, row, other in sorted(scored):
+        if po_match[row] < 0 and invoice_match[other] < 0:
+            po_match[row] = other
+            invoice_match[other] = row
+
+
+def match_line_items(
+    po: LineItemTable,
+    invoice: LineItemTable,
+    fuzzy_threshold: Optional[float] = 0.6,
+    ngram: int = 3,
+    max_block: int = 64,
+    max_candidates: int = 5,
+    description_ids: Optional[KeyIds] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pair PO rows with invoice rows.
+
+    description_ids may pass in description_key_ids(po, invoice) when the
+    caller has already computed it. Returns aligned (po_rows, invoice_rows) index arrays: every PO row in
+    order with its invoice row (or -1), followed by the unmatched invoice
+    rows with -1 on the PO side.
+    """
+    po_match = np.full(len(po), -1, dtype=np.int64)
+    invoice_match = np.full(len(invoice), -1, dtype=np.int64)
+
+    if len(po) and len(invoice):
+        po_skus, invoice_skus, _ = _key_ids(po, invoice, 'item_no', normalise_sku)
+        _pair_exact(po_skus, invoice_skus, po_match, invoice_match)
+
+        po_descriptions, invoice_descriptions, descriptions = (
+            description_ids or description_key_ids(po, invoice)
+        )
+        _pair_exact(po_descriptions, invoice_descriptions, po_match, invoice_match)
+        if fuzzy_threshold is not None:
+            _pair_fuzzy(
+                po_descriptions, invoice_descriptions, descriptions, po_match, invoice_match,
+                fuzzy_threshold, ngram, max_block, max_candidates
+            )
+
+    extra = np.flatnonzero(invoice_match < 0)
+    po_rows = np.concatenate([np.arange(len(po), dtype=np.int64), np.full(len(extra), -1, dtype=np.int64)])
+    invoice_rows = np.concatenate([po_match, extra])
+    return po_rows, invoice_rows
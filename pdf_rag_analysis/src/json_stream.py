@@ -0,0 +1,230 @@
+"""
+Streaming JSON output for the discrepancy report.
+
+write_json encodes a report whose large sections are iterators rather than
+lists - a RowStream of item tuples, or any other iterable - so the file is
+written row by row and neither the nested item dicts nor the document text
+are ever held whole. Styles:
+
+- pretty: byte-for-byte what json.dump(report, f, indent=2) writes
+- compact: as json.dump(report, f, separators=(',', ':'))
+
+write_ndjson writes the same sections as newline-delimited JSON: one line
+per element of a list section and one line for any other section, each
+tagged with a "section" key.
+
+open_report_file opens the target for text, optionally through gzip or
+zstd (zstd needs the optional zstandard package).
+"""
+
+import gzip
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import zstandard
+    HAS_ZSTANDARD = True
+except ImportError:
+    HAS_ZSTANDARD = False
+
+JSON_STYLES = ('pretty', 'compact', 'ndjson')
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+_INFINITY = float('inf')
+
+# Rows are buffered into writes of about this many items
+_WRITE_BATCH = 512
+
+
+class RowStream:
+    """A list of JSON objects given as column labels plus an iterable of value tuples"""
+
+    def __init__(self, labels: Sequence[str], rows: Iterable[tuple]):
+        self.labels = tuple(labels)
+        self.rows = rows
+
+
+def _encode_float(value: float) -> str:
+    # Same spellings json uses with allow_nan=True
+    if value != value:
+        return 'NaN'
+    if value == _INFINITY:
+        return 'Infinity'
+    if value == -_INFINITY:
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+def _encode_scalar(value: Any) -> str:
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        return _encode_float(value)
+    raise TypeError(f'Object of type {value.__class__.__name__} is not JSON serializable')
+
+
+_ENCODERS = {
+    str: encode_basestring_ascii,
+    float: _encode_float,
+    int: int.__repr__,
+    bool: lambda value: 'true' if value else 'false',
+    type(None): lambda value: 'null',
+}
+
+
+def _encode_value(value: Any) -> str:
+    encoder = _ENCODERS.get(type(value))
+    return encoder(value) if encoder is not None else _encode_scalar(value)
+
+
+class _Layout:
+    """Whitespace of one output style"""
+
+    def __init__(self, pretty: bool):
+        self.pretty = pretty
+        self.key_separator = ': ' if pretty else ':'
+
+    def newline(self, level: int) -> str:
+        return '\n' + '  ' * level if self.pretty else ''
+
+
+def _iter_encode(value: Any, level: int, layout: _Layout) -> Iterator[str]:
+    if isinstance(value, (str, int, float)) or value is None:
+        yield _encode_scalar(value)
+    elif isinstance(value, RowStream):
+        yield from _iter_rows(value, level, layout)
+    elif isinstance(value, dict):
+        if not value:
+            yield '{}'
+            return
+        inner = layout.newline(level + 1)
+        separator = '{'
+        for key, item in value.items():
+            yield separator + inner + encode_basestring_ascii(str(key)) + layout.key_separator
+            separator = ','
+            yield from _iter_encode(item, level + 1, layout)
+        yield layout.newline(level) + '}'
+    else:
+        inner = layout.newline(level + 1)
+        separator = '['
+        for item in value:
+            yield separator + inner
+            separator = ','
+            yield from _iter_encode(item, level + 1, layout)
+        yield '[]' if separator == '[' else layout.newline(level) + ']'
+
+
+def _iter_rows(stream: RowStream, level: int, layout: _Layout) -> Iterator[str]:
+    """A RowStream as a list of objects, with the per-key text computed once"""
+    field_indent = layout.newline(level + 2)
+    prefixes = [
+        (',' if i else '') + field_indent + encode_basestring_ascii(label) + layout.key_separator
+        for i, label in enumerate(stream.labels)
+    ]
+    row_open = layout.newline(level + 1) + '{'
+    row_close = layout.newline(level + 1) + '}'
+    empty_row = layout.newline(level + 1) + '{}'
+
+    separator = '['
+    batch: List[str] = []
+    for row in stream.rows:
+        if prefixes:
+            body = ''.join([prefix + _encode_value(value) for prefix, value in zip(prefixes, row)])
+            batch.append(separator + row_open + body + row_close)
+        else:
+            batch.append(separator + empty_row)
+        separator = ','
+        if len(batch) >= _WRITE_BATCH:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+    yield '[]' if separator == '[' else layout.newline(level) + ']'
+
+
+def write_json(f, report: Any, style: str = 'pretty'):
+    """Stream report to the text file f in the pretty or compact style"""
+    if style not in ('pretty', 'compact'):
+        raise ValueError(f"write_json style must be 'pretty' or 'compact', not {style!r}")
+    layout = _Layout(pretty=style == 'pretty')
+    for chunk in _iter_encode(report, 0, layout):
+        f.write(chunk)
+
+
+def _section_lines(section: str, value: Any) -> Iterator[str]:
+    layout = _Layout(pretty=False)
+    head = '{"section":' + encode_basestring_ascii(section)
+
+    def record(item: Any) -> str:
+        if isinstance(item, dict):
+            fields = ''.join(
+                ',' + encode_basestring_ascii(str(key)) + ':' + ''.join(_iter_encode(v, 1, layout))
+                for key, v in item.items()
+            )
+        else:
+            fields = ',"value":' + ''.join(_iter_encode(item, 1, layout))
+        return head + fields + '}\n'
+
+    if isinstance(value, RowStream):
+        prefixes = [',' + encode_basestring_ascii(label) + ':' for label in value.labels]
+        batch: List[str] = []
+        for row in value.rows:
+            batch.append(head + ''.join([p + _encode_value(v) for p, v in zip(prefixes, row)]) + '}\n')
+            if len(batch) >= _WRITE_BATCH:
+                yield ''.join(batch)
+                batch = []
+        if batch:
+            yield ''.join(batch)
+    elif isinstance(value, dict) or isinstance(value, (str, int, float)) or value is None:
+        yield record(value)
+    else:
+        for item in value:
+            yield record(item)
+
+
+def write_ndjson(f, sections: Iterable[Tuple[str, Any]]):
+    """
+    Stream (section, value) pairs as NDJSON: a list section (or RowStream)
+    gives one line per element, merged into {"section": ...} when the
+    element is an object and under "value" otherwise; a dict section gives
+    one merged line and a scalar one "value" line.
+    """
+    for section, value in sections:
+        for chunk in _section_lines(section, value):
+            f.write(chunk)
+
+
+def report_path(path: Path, style: str = 'pretty', compression: Optional[str] = None) -> Path:
+    """path with a .ndjson extension for the ndjson style and the compression suffix appended"""
+    path = Path(path)
+    if style == 'ndjson' and path.suffix == '.json':
+        path = path.with_suffix('.ndjson')
+    if compression:
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression {compression!r}; expected one of {sorted(COMPRESSION_SUFFIXES)}")
+        suffix = COMPRESSION_SUFFIXES[compression]
+        if not path.name.endswith(suffix):
+            path = path.with_name(path.name + suffix)
+    return path
+
+
+def open_report_file(path: Path, compression: Optional[str] = None):
+    """Text file handle for path, compressing through gzip or zstd if asked"""
+    if not compression:
+        return open(path, 'w')
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+    if compression == 'zstd':
+        if not HAS_ZSTANDARD:
+            raise ImportError("zstd compression needs the zstandard package: pip install zstandard")
+        return zstandard.open(path, 'wt', cctx=zstandard.ZstdCompressor(level=3), encoding='utf-8')
+    raise ValueError(f"Unknown compression {compression!r}; expected one of {sorted(COMPRESSION_SUFFIXES)}")
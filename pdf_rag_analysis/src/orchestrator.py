@@ -239,8 +239,12 @@ import json
 
 from src.config import settings
 from src.pdf_extractor import extract_all_pdfs, ExtractedDocument
-from src.comparator import compare_po_with_invoice
+from src.extraction_cache import get_extraction_cache
+from src.extraction_profiler import ExtractionProfiler
+from src.table_strategy import get_table_strategy_memo
+from src.reconciliation import reconcile_documents
 from src.report_generator import generate_all_reports
+from src.history_store import record_comparison
 
 try:
     from src.rag_system import initialize_rag_system
@@ -259,9 +263,14 @@ class PDFAnalysisOrchestrator:
         self.reports_dir.mkdir(parents=True, exist_ok=True)
 
         self.extracted_documents = {}
+        # File stem -> error of every PDF the last extract_documents could not read
+        self.extraction_errors: Dict[str, str] = {}
         self.po_doc = None
         self.invoice_doc = None
         self.comparison_result = None
+        self.reconciliation = None
+        # Format (or "<po>/<format>") -> path of every report the last generate_reports wrote
+        self.report_paths: Dict[str, str] = {}
 
         self.rag_system = None
         self.analysis_agent = None
@@ -293,7 +302,20 @@ class PDFAnalysisOrchestrator:
         return self.get_pipeline_summary()
 
     def extract_documents(self) -> Dict[str, ExtractedDocument]:
-        self.extracted_documents = extract_all_pdfs(self.data_dir)
+        profiler = ExtractionProfiler() if settings.EXTRACTION_PROFILING else None
+        self.extraction_errors = {}
+        self.extracted_documents = extract_all_pdfs(
+            self.data_dir,
+            max_workers=settings.EXTRACTION_WORKERS,
+            cache=get_extraction_cache(),
+            profiler=profiler,
+            strategy_memo=get_table_strategy_memo(),
+            errors=self.extraction_errors
+        )
+
+        if profiler is not None:
+            profile_path = profiler.write_json(self.reports_dir / "extraction_profile.json")
+            print(f"  [OK] Extraction profile: {Path(profile_path).name}")
 
         for name, doc in self.extracted_documents.items():
             print(f"  [OK] Extracted {name}")
@@ -305,20 +327,34 @@ class PDFAnalysisOrchestrator:
             if len(doc.items) == 0:
                 print(f"    ⚠️  WARNING: No line items extracted from {name}!")
 
+        for name, error in self.extraction_errors.items():
+            print(f"  [ERR] Could not extract {name}: {error}")
+
         return self.extracted_documents
 
     def compare_documents(self):
         self.po_doc = None
         self.invoice_doc = None
+        self.comparison_result = None
 
-        for name, doc in self.extracted_documents.items():
-            if 'PURCHASE_ORDER' in doc.metadata.doc_type:
-                self.po_doc = doc
-            elif 'PROFORMA_INVOICE' in doc.metadata.doc_type:
-                self.invoice_doc = doc
+        # Every PO is paired with its invoice(s) and compared; po_doc /
+        # invoice_doc / comparison_result hold the first compared pair
+        self.reconciliation = reconcile_documents(self.extracted_documents)
+        compared = [group for group in self.reconciliation.groups if group.comparison is not None]
+        for group in self.reconciliation.groups:
+            if group.error:
+                print(f"  [ERR] Comparison failed for {group.po_name}: {group.error}")
+
+        if len(self.reconciliation.groups) > 1 or self.reconciliation.unmatched_invoices:
+            self._print_reconciliation()
 
-        if self.po_doc and self.invoice_doc:
-            self.comparison_result = compare_po_with_invoice(self.po_doc, self.invoice_doc)
+        self._record_history(compared)
+
+        if compared:
+            first = compared[0]
+            self.po_doc = self.extracted_documents[first.po_name]
+            self.invoice_doc = first.invoice_doc
+            self.comparison_result = first.comparison
 
             # ✅ FIXED: Use correct field names from DocumentComparison dataclass
             print(f"  [OK] Comparison completed")
@@ -338,21 +374,82 @@ class PDFAnalysisOrchestrator:
         else:
             print("  [ERR] Could not find both PO and Invoice documents")
 
+    def _record_history(self, groups):
+        """Append compared pairs to the history store (when HISTORY_STORE_ENABLED)"""
+        try:
+            recorded = [
+                record_comparison(group.comparison, self.extracted_documents[group.po_name], group.invoice_doc)
+                for group in groups
+            ]
+        except Exception as e:
+            print(f"  [WARN] Comparison history not recorded: {e}")
+            return
+        recorded_count = sum(map(bool, recorded))
+        if recorded_count:
+            print(f"  [OK] Recorded {recorded_count} comparison(s) in {settings.HISTORY_DB_PATH.name}")
+
+    def _print_reconciliation(self):
+        rollup = self.reconciliation.rollup
+        print(f"  [OK] Reconciled {rollup['purchase_orders']} POs against {rollup['invoices']} invoices")
+        for group in self.reconciliation.groups:
+            if group.comparison is None:
+                continue
+            split = f" (split shipment: {len(group.invoice_names)} invoices)" if group.split_shipment else ""
+            print(f"    - {group.po_name} <- {', '.join(group.invoice_names)}{split}: "
+                  f"{group.comparison.discrepant_items} discrepant, "
+                  f"${group.comparison.summary_metrics.grand_total_difference:.2f} difference")
+        if rollup['unmatched_pos']:
+            print(f"    ⚠️  POs without invoice: {', '.join(rollup['unmatched_pos'])}")
+        if rollup['unmatched_invoices']:
+            print(f"    ⚠️  Invoices without PO: {', '.join(rollup['unmatched_invoices'])}")
+        print(f"    - Net difference across batch: ${rollup['net_difference']:.2f}")
+
     def generate_reports(self) -> Dict[str, str]:
+        self.report_paths = {}
         if not self.comparison_result:
             print("  [ERR] No comparison result to report")
             return {}
 
+        compared = [group for group in self.reconciliation.groups if group.comparison is not None]
+        if len(compared) > 1:
+            self.report_paths = self._generate_batch_reports(compared)
+            return self.report_paths
+
+        timings = {}
         report_paths = generate_all_reports(
             self.comparison_result, 
             self.reports_dir, 
             self.po_doc, 
-            self.invoice_doc
+            self.invoice_doc,
+            timings=timings
         )
 
         for format_type, path in report_paths.items():
-            print(f"  [OK] Generated {format_type.upper()} report: {Path(path).name}")
+            print(f"  [OK] Generated {format_type.upper()} report: {Path(path).name} "
+                  f"({timings.get(format_type, 0.0):.2f}s)")
 
+        self.report_paths = report_paths
+        return report_paths
+
+    def _generate_batch_reports(self, groups) -> Dict[str, str]:
+        """One report set per PO in its own folder, plus the batch roll-up"""
+        report_paths = {}
+        for group in groups:
+            paths = generate_all_reports(
+                group.comparison,
+                self.reports_dir / group.po_name,
+                self.extracted_documents[group.po_name],
+                group.invoice_doc
+            )
+            for format_type, path in paths.items():
+                report_paths[f"{group.po_name}/{format_type}"] = path
+
+        rollup_path = self.reports_dir / "reconciliation_summary.json"
+        rollup_path.write_text(json.dumps(self.reconciliation.rollup, indent=2))
+        report_paths['reconciliation'] = str(rollup_path)
+
+        print(f"  [OK] Generated reports for {len(groups)} PO/invoice groups")
+        print(f"  [OK] Reconciliation roll-up: {rollup_path.name}")
         return report_paths
 
     def initialize_rag(self):
@@ -393,6 +490,14 @@ class PDFAnalysisOrchestrator:
             except Exception as e2:
                 print(f"  [ERR] Chatbot initialization failed: {e2}")
 
+    def watch(self, max_seconds: float = None) -> Dict:
+        """Long-running mode: ingest PDFs as they land in data_dir, comparing each PO/invoice pair once both are in"""
+        from src.ingestion import create_ingestion_daemon
+
+        daemon = create_ingestion_daemon(self.data_dir, self.reports_dir)
+        daemon.run(max_seconds=max_seconds)
+        return daemon.stats.snapshot()
+
     def analyze_with_agent(self, query: str) -> Dict:
         if not self.analysis_agent:
             return {'error': 'Agent not initialized'}
@@ -410,11 +515,13 @@ class PDFAnalysisOrchestrator:
         return {
             'status': 'complete',
             'documents_extracted': len(self.extracted_documents),
+            'extraction_errors': dict(self.extraction_errors),
             'items_compared': len(self.comparison_result.item_level_comparison) if self.comparison_result else 0,
             'matching_items': self.comparison_result.matching_items if self.comparison_result else 0,
             'discrepant_items': discrepancies,
             'total_variance': self.comparison_result.summary_metrics.grand_total_difference if self.comparison_result else 0,
-            'reports_generated': 3,  # JSON, CSV, Excel
+            'pairs_reconciled': len(self.reconciliation.groups) if self.reconciliation else 0,
+            'reports_generated': len(self.report_paths),
             'rag_ready': self.rag_system is not None,
             'agent_ready': self.analysis_agent is not None,
             'chatbot_ready': self.chatbot is not None,
@@ -1079,19 +1079,38 @@
 
 #     return documents
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+import hashlib
+import io
+import os
+import threading
+import time
+import numpy as np
 import pypdf
 import json
 import re
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+from src.extraction_profiler import ExtractionProfiler, DocumentProfile
+from src.table_strategy import TABLE_STRATEGIES, TableStrategyMemo
+
 try:
     import pdfplumber
     HAS_PDFPLUMBER = True
 except ImportError:
     HAS_PDFPLUMBER = False
 
+# Bump whenever parsing output changes so cached extractions are invalidated
+EXTRACTOR_VERSION = 3
+
+# _extract_vendor's fallback when no vendor line is found
+UNKNOWN_VENDOR = "Unknown Vendor"
+
 @dataclass
 class LineItem:
     item_no: str
@@ -1115,6 +1134,159 @@ class LineItem:
         if self.total_price == 0.0:
             self.total_price = self.taxable_amount
 
+LINE_ITEM_STRING_FIELDS = ('item_no', 'description', 'unit')
+LINE_ITEM_NUMERIC_FIELDS = (
+    'quantity', 'unit_price', 'discount_pct', 'discount_amount', 'taxable_amount', 'total_price'
+)
+LINE_ITEM_FIELDS = LINE_ITEM_STRING_FIELDS + LINE_ITEM_NUMERIC_FIELDS
+
+class LineItemRow:
+    """Read-only view of one row of a LineItemTable with LineItem's attributes"""
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: "LineItemTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        table = object.__getattribute__(self, '_table')
+        index = object.__getattribute__(self, '_index')
+        if name in LINE_ITEM_NUMERIC_FIELDS:
+            return float(table._numeric[name][index])
+        if name in LINE_ITEM_STRING_FIELDS:
+            return table._strings[table._codes[name][index]]
+        raise AttributeError(name)
+
+    def to_item(self) -> LineItem:
+        return LineItem(**{name: getattr(self, name) for name in LINE_ITEM_STRING_FIELDS + LINE_ITEM_NUMERIC_FIELDS})
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LineItemRow, LineItem)):
+            return all(
+                getattr(self, name) == getattr(other, name)
+                for name in LINE_ITEM_STRING_FIELDS + LINE_ITEM_NUMERIC_FIELDS
+            )
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"LineItemRow({self.item_no!r}, {self.description!r}, qty={self.quantity}, unit_price={self.unit_price})"
+
+
+class LineItemTable:
+    """
+    Columnar storage for a document's line items.
+
+    Numeric fields are float64 NumPy arrays; SKU, description and unit are
+    int32 codes into one shared string pool. Iterating or indexing yields
+    LineItemRow views, so item.quantity style access keeps working, while
+    column() hands comparator/report code the whole array at once.
+    """
+
+    def __init__(self, numeric: Dict[str, np.ndarray], codes: Dict[str, np.ndarray], strings: List[str]):
+        self._numeric = numeric
+        self._codes = codes
+        self._strings = strings
+        self._string_array: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_items(cls, items: Iterable) -> "LineItemTable":
+        """Build from LineItems (or anything with the same attributes), consuming iterators once"""
+        numeric = {name: [] for name in LINE_ITEM_NUMERIC_FIELDS}
+        codes = {name: [] for name in LINE_ITEM_STRING_FIELDS}
+        pool: Dict[str, int] = {}
+        for item in items:
+            for name in LINE_ITEM_NUMERIC_FIELDS:
+                numeric[name].append(getattr(item, name))
+            for name in LINE_ITEM_STRING_FIELDS:
+                codes[name].append(pool.setdefault(getattr(item, name), len(pool)))
+        return cls._build(numeric, codes, pool)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List]) -> "LineItemTable":
+        """Build from per-field value lists (as stored by the extraction cache)"""
+        pool: Dict[str, int] = {}
+        codes = {
+            name: [pool.setdefault(value, len(pool)) for value in columns[name]]
+            for name in LINE_ITEM_STRING_FIELDS
+        }
+        numeric = {name: columns[name] for name in LINE_ITEM_NUMERIC_FIELDS}
+        return cls._build(numeric, codes, pool)
+
+    @classmethod
+    def _build(cls, numeric: Dict[str, List], codes: Dict[str, List], pool: Dict[str, int]) -> "LineItemTable":
+        return cls(
+            numeric={name: np.asarray(values, dtype=np.float64) for name, values in numeric.items()},
+            codes={name: np.asarray(values, dtype=np.int32) for name, values in codes.items()},
+            strings=list(pool)
+        )
+
+    def column(self, name: str) -> np.ndarray:
+        """Whole column: float64 array for numeric fields, object array for string fields"""
+        if name in LINE_ITEM_NUMERIC_FIELDS:
+            return self._numeric[name]
+        if name in LINE_ITEM_STRING_FIELDS:
+            return self._pool_array()[self._codes[name]]
+        raise KeyError(name)
+
+    def take(self, name: str, rows: np.ndarray) -> np.ndarray:
+        """column(name)[rows] without materialising the whole column"""
+        if name in LINE_ITEM_NUMERIC_FIELDS:
+            return self._numeric[name][rows]
+        if name in LINE_ITEM_STRING_FIELDS:
+            return self._pool_array()[self._codes[name][rows]]
+        raise KeyError(name)
+
+    def _pool_array(self) -> np.ndarray:
+        if self._string_array is None:
+            self._string_array = np.asarray(self._strings, dtype=object)
+        return self._string_array
+
+    def __getstate__(self):
+        # The pool array is a cache; don't ship it to worker processes
+        return {**self.__dict__, '_string_array': None}
+
+    def string_codes(self, name: str) -> Tuple[np.ndarray, List[str]]:
+        """Pool codes of a string column plus the pool, for grouping rows without building strings"""
+        if name not in LINE_ITEM_STRING_FIELDS:
+            raise KeyError(name)
+        return self._codes[name], self._strings
+
+    def to_items(self) -> List[LineItem]:
+        return [row.to_item() for row in self]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (string pool excluded)"""
+        return sum(a.nbytes for a in self._numeric.values()) + sum(a.nbytes for a in self._codes.values())
+
+    def __len__(self) -> int:
+        return len(self._codes[LINE_ITEM_STRING_FIELDS[0]])
+
+    def __iter__(self) -> Iterator[LineItemRow]:
+        for index in range(len(self)):
+            yield LineItemRow(self, index)
+
+    def __getitem__(self, key: Union[int, slice]):
+        if isinstance(key, slice):
+            return [LineItemRow(self, index) for index in range(*key.indices(len(self)))]
+        length = len(self)
+        index = key + length if key < 0 else key
+        if not 0 <= index < length:
+            raise IndexError("LineItemTable index out of range")
+        return LineItemRow(self, index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LineItemTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"LineItemTable(rows={len(self)}, strings={len(self._strings)})"
+
 @dataclass
 class DocumentMetadata:
     doc_type: str
@@ -1122,11 +1294,76 @@ class DocumentMetadata:
     date: str
     vendor_name: str
     customer_name: str
+    # False when no date was found in the text and date is the extraction day
+    date_found: bool = True
+
+class DocumentText:
+    """
+    Page-indexed view of a document's text.
+
+    Pages are kept as extracted. The full string is only built when a consumer
+    calls str(); len() and slicing (e.g. raw_text[:500]) walk the pages.
+    """
+    __slots__ = ('pages',)
+
+    def __init__(self, pages: Iterable[str] = ()):
+        self.pages = tuple(pages)
+
+    def __str__(self) -> str:
+        return "".join(self.pages)
+
+    def __repr__(self) -> str:
+        return f"DocumentText(pages={len(self.pages)}, chars={len(self)})"
+
+    def __len__(self) -> int:
+        return sum(len(page) for page in self.pages)
+
+    def __bool__(self) -> bool:
+        return any(self.pages)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DocumentText):
+            return self.pages == other.pages or str(self) == str(other)
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getitem__(self, key: Union[int, slice]) -> str:
+        if isinstance(key, int):
+            length = len(self)
+            index = key + length if key < 0 else key
+            if not 0 <= index < length:
+                raise IndexError("DocumentText index out of range")
+            return self[index:index + 1]
+
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            return str(self)[key]
+
+        parts = []
+        offset = 0
+        for page in self.pages:
+            page_end = offset + len(page)
+            if page_end > start and offset < stop:
+                parts.append(page[max(start - offset, 0):min(stop, page_end) - offset])
+            if page_end >= stop:
+                break
+            offset = page_end
+        return "".join(parts)
+
+    def iter_pages(self) -> Iterator[str]:
+        return iter(self.pages)
+
+    def page(self, index: int) -> str:
+        return self.pages[index]
+
 
 @dataclass
 class ExtractedDocument:
     metadata: DocumentMetadata
-    items: List[LineItem]
+    items: Union[LineItemTable, List[LineItem]]
     subtotal: float
     total_discount: float = 0.0
     taxable_amount: float = 0.0
@@ -1134,35 +1371,456 @@ class ExtractedDocument:
     tax_rate: float = 0.0
     total: float = 0.0
     notes: str = ""
-    raw_text: str = ""
+    raw_text: Union[str, DocumentText] = ""
+
+@dataclass
+class BatchExtractionResult:
+    """Outcome of a bulk extraction run, keyed by file stem in file-name order"""
+    documents: Dict[str, ExtractedDocument]
+    errors: Dict[str, str]
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """Line-item column indices resolved from one table header layout"""
+    sku: Optional[int]
+    description: Optional[int]
+    quantity: Optional[int]
+    unit_price: Optional[int]
+    discount_pct: Optional[int]
+    discount_amount: Optional[int]
+    taxable_amount: Optional[int]
+    total_price: Optional[int]
+
+# Header signature (normalized header cells) -> ColumnPlan, shared by all
+# extractors; least recently used layouts are dropped beyond MAX_COLUMN_PLANS
+MAX_COLUMN_PLANS = 256
+_COLUMN_PLANS: "OrderedDict[Tuple[str, ...], ColumnPlan]" = OrderedDict()
+_COLUMN_PLANS_LOCK = threading.Lock()
+
+# Everything except digits, '.', '-' (and the '\n' column separator) is stripped
+_NUMBER_CLEANUP = re.compile(r'[^\d.\n-]')
+
+# A path on disk, the PDF bytes themselves, or a binary file object (e.g. a Streamlit upload)
+PDFSource = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+def read_pdf_source(source: PDFSource) -> Tuple[bytes, str]:
+    """Return (PDF bytes, display name) for any PDFSource without touching the disk for in-memory input"""
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        return path.read_bytes(), path.name
+    if isinstance(source, memoryview):
+        # A contiguous view over a whole bytes object needs no copy
+        # (a reversed or strided view can span it all yet read in another order)
+        if source.contiguous and isinstance(source.obj, bytes) and source.nbytes == len(source.obj):
+            return source.obj, "<memory>"
+        return bytes(source), "<memory>"
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source), "<memory>"
+
+    name = Path(getattr(source, 'name', None) or "<stream>").name
+    if hasattr(source, 'getvalue'):
+        # BytesIO / UploadedFile: whole buffer regardless of the current position
+        return source.getvalue(), name
+    return source.read(), name
+
+class PDFParseSession:
+    """
+    Single parse of one PDF shared by every extraction stage.
+
+    The PDF is read once (from disk, or taken as-is from bytes / a file
+    object); the pypdf reader (page text) and the pdfplumber handle (tables)
+    are both opened over that one buffer on first use, and each page's text
+    and tables are extracted at most once. Callers that already hold the
+    bytes pass them as data; a path source is still kept so parallel table
+    workers open the file themselves instead of receiving a copy.
+    """
+
+    def __init__(self, source: PDFSource, name: Optional[str] = None, data: Optional[bytes] = None):
+        self.pdf_path = Path(source) if isinstance(source, (str, Path)) else None
+        if data is None:
+            data, default_name = read_pdf_source(source)
+        else:
+            default_name = self.pdf_path.name if self.pdf_path is not None else "<memory>"
+        self._data = data
+        self.name = name or default_name
+        self._reader = None
+        self._plumber = None
+        self._page_texts: Dict[int, str] = {}
+        self._page_tables: Dict[Any, List[List[List[str]]]] = {}
+        self._page_hashes: Dict[int, str] = {}
+        self.pages_touched = set()
+        # Set when prefetch_tables' process pool failed
+        self.page_pool_failed = False
+
+    def __enter__(self) -> "PDFParseSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        self._reader = None
+
+    @property
+    def reader(self) -> pypdf.PdfReader:
+        if self._reader is None:
+            self._reader = pypdf.PdfReader(io.BytesIO(self._data))
+        return self._reader
+
+    @property
+    def plumber(self):
+        if not HAS_PDFPLUMBER:
+            return None
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(io.BytesIO(self._data))
+        return self._plumber
+
+    @property
+    def page_count(self) -> int:
+        return len(self.reader.pages)
+
+    def page_text(self, index: int) -> str:
+        """Text of one page (pypdf), cached"""
+        if index not in self._page_texts:
+            self.pages_touched.add(index)
+            self._page_texts[index] = self.reader.pages[index].extract_text() or ""
+        return self._page_texts[index]
+
+    def page_tables(self, index: int, table_settings: Optional[Dict] = None) -> List[List[List[str]]]:
+        """Tables of one page (pdfplumber), cached per table_settings"""
+        key = self._tables_key(index, table_settings)
+        if key not in self._page_tables:
+            pdf = self.plumber
+            if pdf is None or index >= len(pdf.pages):
+                return []
+            self.pages_touched.add(index)
+            page = pdf.pages[index]
+            if table_settings:
+                tables = page.extract_tables(table_settings=table_settings)
+            else:
+                tables = page.extract_tables()
+            self._page_tables[key] = tables or []
+        return self._page_tables[key]
+
+    def page_hash(self, index: int) -> str:
+        """
+        Content hash of one page: decoded content streams, page box, font
+        names and every XObject (form or image) the page draws, including
+        those nested in form XObjects. An unchanged page of a revised
+        document hashes the same.
+        """
+        if index not in self._page_hashes:
+            page = self.reader.pages[index]
+            digest = hashlib.sha256()
+            contents = page.get_contents()
+            if contents is not None:
+                digest.update(contents.get_data())
+            digest.update(repr([float(v) for v in page.mediabox]).encode())
+            self._hash_resources(digest, page.get('/Resources'), set())
+            self._page_hashes[index] = digest.hexdigest()
+        return self._page_hashes[index]
+
+    @classmethod
+    def _hash_resources(cls, digest, resources, seen: set):
+        """Feed font names and XObject streams of a resource dictionary into digest"""
+        if resources is None:
+            return
+        resources = resources.get_object()
+        fonts = resources.get('/Font')
+        if fonts is not None:
+            fonts = fonts.get_object()
+            for font_name in sorted(fonts):
+                base_font = fonts[font_name].get_object().get('/BaseFont')
+                digest.update(f"{font_name}={base_font};".encode())
+
+        xobjects = resources.get('/XObject')
+        if xobjects is None:
+            return
+        xobjects = xobjects.get_object()
+        for xobject_name in sorted(xobjects):
+            reference = xobjects[xobject_name]
+            xobject = reference.get_object()
+            header = (xobject_name, xobject.get('/Subtype'), xobject.get('/BBox'), xobject.get('/Matrix'))
+            digest.update(repr(header).encode())
+            # Shared forms are hashed once; a form referring back to itself ends the walk
+            object_id = getattr(reference, 'idnum', None) or id(xobject)
+            if object_id in seen:
+                continue
+            seen.add(object_id)
+            try:
+                digest.update(xobject.get_data())
+            except Exception:
+                # Filters pypdf cannot decode: the encoded stream changes just the same
+                digest.update(getattr(xobject, '_data', b'') or b'')
+            if xobject.get('/Subtype') == '/Form':
+                cls._hash_resources(digest, xobject.get('/Resources'), seen)
+
+    @staticmethod
+    def _tables_key(index: int, table_settings: Optional[Dict]) -> Tuple:
+        return (index, tuple(sorted(table_settings.items())) if table_settings else None)
+
+    def prefetch_tables(
+        self,
+        max_workers: int,
+        pages_per_task: int = 4,
+        table_settings: Optional[Dict] = None,
+        skip: Iterable[int] = (),
+        pool: Optional[ProcessPoolExecutor] = None
+    ) -> Iterator[int]:
+        """
+        Extract tables for every page on a process pool.
+
+        Each worker opens the document itself (by path, or from the buffer
+        handed over once at worker start-up for in-memory input) and runs
+        pdfplumber on a run of consecutive pages. Results are merged in page
+        order: each page index is yielded as soon as its tables are in the
+        session cache, so callers can start consuming early pages while later
+        ones are still being laid out. If the pool fails, the remaining pages
+        are yielded uncached, page_pool_failed is set and page_tables()
+        extracts them in-process. Pages in skip (e.g. ones reused from the
+        page cache) are yielded in their place without being extracted.
+
+        A document read from a path runs on pool when one is given, so an
+        extractor can keep one pool for many documents; in-memory input
+        always gets its own pool. Closing the iterator early cancels the
+        pages still queued instead of waiting for them.
+        """
+        page_count = self.page_count
+        if not HAS_PDFPLUMBER or page_count == 0:
+            yield from range(page_count)
+            return
+
+        skip = set(skip)
+        pending = [index for index in range(page_count) if index not in skip]
+        tasks = [pending[start:start + pages_per_task] for start in range(0, len(pending), pages_per_task)]
+        path = str(self.pdf_path) if self.pdf_path is not None else None
+
+        next_page = 0
+        own_pool = None
+        futures = []
+        completed = False
+        try:
+            if tasks:
+                if pool is None or path is None:
+                    pool = own_pool = ProcessPoolExecutor(
+                        max_workers=max_workers,
+                        initializer=_init_page_table_worker,
+                        initargs=(self._data if path is None else None,)
+                    )
+                futures = [
+                    pool.submit(_page_tables_worker, page_indices, table_settings, path)
+                    for page_indices in tasks
+                ]
+                for page_indices, future in zip(tasks, futures):
+                    for index, tables in zip(page_indices, future.result()):
+                        self.pages_touched.add(index)
+                        self._page_tables[self._tables_key(index, table_settings)] = tables
+                    # Skipped pages before this run are released in order with it
+                    for index in range(next_page, page_indices[-1] + 1):
+                        next_page = index + 1
+                        yield index
+            completed = True
+        except Exception as e:
+            self.page_pool_failed = True
+            print(f"  ⚠️  Parallel table extraction failed ({e}), continuing in-process")
+        finally:
+            for future in futures:
+                future.cancel()
+            if own_pool is not None:
+                own_pool.shutdown(wait=completed, cancel_futures=True)
+        yield from range(next_page, page_count)
+
+    def release_page(self, index: int):
+        """Drop cached tables and pdfplumber layout objects for a finished page"""
+        for key in [k for k in self._page_tables if k[0] == index]:
+            del self._page_tables[key]
+        if self._plumber is not None and index < len(self._plumber.pages):
+            page = self._plumber.pages[index]
+            if hasattr(page, 'close'):
+                page.close()
+
+
+# In-memory document for page-table worker processes, set once per worker
+_PAGE_WORKER_SOURCE = None
+
+def _init_page_table_worker(source: Optional[bytes]):
+    global _PAGE_WORKER_SOURCE
+    _PAGE_WORKER_SOURCE = source
+
+def _page_tables_worker(
+    page_indices: List[int],
+    table_settings: Optional[Dict] = None,
+    path: Optional[str] = None
+) -> List[List[List[List[str]]]]:
+    """Tables for a run of pages, opened from path or else the worker's in-memory source"""
+    handle = path if path is not None else io.BytesIO(_PAGE_WORKER_SOURCE)
+    results = []
+    with pdfplumber.open(handle) as pdf:
+        for index in page_indices:
+            page = pdf.pages[index]
+            if table_settings:
+                results.append(page.extract_tables(table_settings=table_settings) or [])
+            else:
+                results.append(page.extract_tables() or [])
+            if hasattr(page, 'close'):
+                page.close()
+    return results
 
 class PDFExtractor:
-    def __init__(self):
+    def __init__(
+        self,
+        cache=None,
+        profiler: Optional[ExtractionProfiler] = None,
+        page_workers: int = 1,
+        parallel_page_threshold: int = 8,
+        strategy_memo: Optional[TableStrategyMemo] = None
+    ):
+        # Optional ExtractionCache (src.extraction_cache); hits skip parsing entirely
+        self.cache = cache
+        # Documents with at least parallel_page_threshold pages have their tables
+        # laid out on page_workers processes (only when page_workers > 1); the
+        # pool is started once and shared by every document read from a path
+        self.page_workers = page_workers
+        self.parallel_page_threshold = parallel_page_threshold
+        self._page_pool: Optional[ProcessPoolExecutor] = None
+        # With a TableStrategyMemo, table strategies are tried cheapest-first
+        # (after the one remembered for the supplier) until one yields items
+        self.strategy_memo = strategy_memo
+        # Per-page records (text, rows per table strategy) loaded from the cache
+        # for the document being extracted, keyed by page index
+        self._page_records: Dict[int, Dict] = {}
+        self._dirty_pages = set()
+        # Optional ExtractionProfiler; receives one DocumentProfile per extract_pdf call
+        self.profiler = profiler
+        self._profile: Optional[DocumentProfile] = None
         self.currency_pattern = r'\$?\s*[\d,]+\.?\d*'
         self.date_pattern = r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}'
         self.quantity_pattern = r'^\s*(\d+(?:\.\d+)?)\s*'
 
-    def extract_pdf(self, pdf_path: Path) -> ExtractedDocument:
-        """Extract complete document with enhanced line item parsing"""
-        pdf_reader = pypdf.PdfReader(str(pdf_path))
-        raw_text = self._extract_raw_text(pdf_reader)
-
-        doc_type = self._detect_document_type(raw_text)
-        metadata = self._extract_metadata(raw_text, doc_type)
+    def extract_pdf(self, pdf_path: PDFSource, name: Optional[str] = None) -> ExtractedDocument:
+        """Extract complete document with enhanced line item parsing
 
-        # Try table extraction first, fallback to text parsing
-        items = self._extract_line_items_from_tables(pdf_path)
+        pdf_path may also be the PDF's bytes, a memoryview or a binary file
+        object; in-memory input is parsed straight from that buffer.
+        """
+        profile = self.profiler.begin_document(name or "") if self.profiler is not None else None
+        self._profile = profile
+        start = time.perf_counter()
+        try:
+            with self._stage('open'):
+                data, default_name = read_pdf_source(pdf_path)
+            name = name or default_name
+            if profile is not None:
+                profile.document = name
+
+            key = None
+            if self.cache is not None:
+                key = self.cache.key_for(data, self._cache_variant())
+                doc = self.cache.get(key)
+                if doc is not None:
+                    print(f"⚡ Cache hit: {name} ({len(doc.items)} line items)")
+                    self._finish_profile(doc)
+                    return doc
+
+            with PDFParseSession(pdf_path, name=name, data=data) as session:
+                with self._stage('open'):
+                    session.reader
+                    session.plumber
+                doc = self.extract_session(session)
+                if profile is not None:
+                    profile.pages_touched = len(session.pages_touched)
+
+            if self.cache is not None:
+                self.cache.put(key, doc)
+            self._finish_profile(doc)
+            return doc
+        except Exception as e:
+            if profile is not None:
+                profile.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._profile = None
+            if profile is not None:
+                profile.total_seconds = time.perf_counter() - start
+                self.profiler.record(profile)
+
+    def close(self):
+        """Shut down the page-table pool, if one was started"""
+        if self._page_pool is not None:
+            self._page_pool.shutdown(wait=False, cancel_futures=True)
+            self._page_pool = None
+
+    def __enter__(self) -> "PDFExtractor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _shared_page_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        if self._page_pool is None:
+            self._page_pool = ProcessPoolExecutor(max_workers=max_workers)
+        return self._page_pool
+
+    def _cache_variant(self) -> str:
+        """Extraction mode folded into whole-document cache keys; table strategies can change the result"""
+        return 'adaptive' if self.strategy_memo is not None else ''
+
+    def _stage(self, name: str):
+        """Time a stage against the current document profile (no-op when not profiling)"""
+        if self._profile is None:
+            return nullcontext()
+        return self._profile.stage(name)
+
+    def _finish_profile(self, doc: ExtractedDocument):
+        if self._profile is not None:
+            self._profile.items_extracted = len(doc.items)
+            self._profile.doc_type = doc.metadata.doc_type
+            self._profile.vendor = doc.metadata.vendor_name
+
+    def extract_session(self, session: PDFParseSession) -> ExtractedDocument:
+        """Run every extraction stage against an already opened parse session
+
+        With a cache, pages whose content hash was seen before (e.g. the
+        untouched pages of a revised proforma) reuse their stored text and
+        line items; only new or changed pages are parsed.
+        """
+        self._page_records = self._load_page_records(session)
+        self._dirty_pages = set()
+
+        with self._stage('text'):
+            document_text = self._extract_raw_text(session)
+            # Joined once for the regex stages below and dropped afterwards;
+            # the document keeps only the page-indexed view
+            raw_text = str(document_text)
+
+        with self._stage('metadata'):
+            doc_type = self._detect_document_type(raw_text)
+            metadata = self._extract_metadata(raw_text, doc_type)
+
+        # Try table extraction first, fallback to text parsing.
+        # Line items and the totals table are collected in the same page pass.
+        totals = self._empty_totals()
+        if self.strategy_memo is not None:
+            items = self._extract_items_adaptive(session, metadata, totals)
+        else:
+            items = LineItemTable.from_items(self.iter_line_items(session, totals))
         if not items:
             print(f"⚠️  WARNING: Table extraction failed, trying text parsing...")
-            items = self._extract_line_items(raw_text)
+            with self._stage('tables'):
+                items = LineItemTable.from_items(self._extract_line_items(raw_text))
 
-        totals = self._extract_totals_from_tables(pdf_path)
-        if not totals or totals['total'] == 0.0:
-            totals = self._extract_totals(raw_text)
+        with self._stage('totals'):
+            if not totals or totals['total'] == 0.0:
+                totals = self._extract_totals(raw_text)
 
-        notes = self._extract_notes(raw_text)
+        with self._stage('notes'):
+            notes = self._extract_notes(raw_text)
 
-        print(f"✅ Extracted {len(items)} line items from {pdf_path.name}")
+        print(f"✅ Extracted {len(items)} line items from {session.name}")
+        self._store_page_records(session)
 
         return ExtractedDocument(
             metadata=metadata,
@@ -1174,41 +1832,241 @@ class PDFExtractor:
             tax_rate=totals.get('tax_rate', 7.5),
             total=totals['total'],
             notes=notes,
-            raw_text=raw_text
+            raw_text=document_text
         )
 
-    def _extract_raw_text(self, pdf_reader) -> str:
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
+    def _extract_raw_text(self, session: PDFParseSession) -> DocumentText:
+        return DocumentText(self._page_text(session, i) for i in range(session.page_count))
+
+    def _page_text(self, session: PDFParseSession, index: int) -> str:
+        record = self._page_records.get(index)
+        if record is not None:
+            return record['text']
+        text = session.page_text(index)
+        if self.cache is not None:
+            self._page_records[index] = {'text': text, 'tables': {}}
+            self._dirty_pages.add(index)
         return text
 
-    def _extract_line_items_from_tables(self, pdf_path: Path) -> List[LineItem]:
+    def _load_page_records(self, session: PDFParseSession) -> Dict[int, Dict]:
+        if self.cache is None:
+            return {}
+        records = {}
+        with self._stage('page_cache'):
+            for index in range(session.page_count):
+                record = self.cache.get_page(session.page_hash(index))
+                if record is not None:
+                    records[index] = record
+        return records
+
+    def _store_page_records(self, session: PDFParseSession):
+        if self.cache is None or not self._dirty_pages:
+            return
+        with self._stage('page_cache'):
+            self.cache.put_pages({
+                session.page_hash(index): self._page_records[index]
+                for index in sorted(self._dirty_pages)
+            })
+        self._dirty_pages = set()
+
+    def _extract_line_items_from_tables(self, session: PDFParseSession) -> List[LineItem]:
         """CUSTOMIZED for your PDF format"""
-        items = []
+        return list(self.iter_line_items(session))
+
+    def _extract_items_adaptive(
+        self,
+        session: PDFParseSession,
+        metadata: DocumentMetadata,
+        totals: Dict[str, float]
+    ) -> LineItemTable:
+        """
+        Try TABLE_STRATEGIES in order, stopping at the first one whose tables
+        yield valid line items. The strategy remembered for this supplier's
+        fingerprint goes first; the winner is stored back in the memo.
+        Each attempt collects totals into a dict of its own and only the
+        winner's are copied into totals.
+        """
+        fingerprint = self._layout_fingerprint(session, metadata)
+        remembered = self.strategy_memo.get(fingerprint)
+        # Stable sort: remembered strategy first, the rest stay cheapest-first
+        strategies = sorted(TABLE_STRATEGIES, key=lambda strategy: strategy[0] != remembered)
+
+        items = LineItemTable.from_items([])
+        for name, table_settings in strategies:
+            attempt_totals = self._empty_totals()
+            items = LineItemTable.from_items(self.iter_line_items(session, attempt_totals, table_settings))
+            if items:
+                totals.update(attempt_totals)
+                if name != remembered:
+                    print(f"  🧭 Table strategy '{name}' selected for {fingerprint}")
+                self.strategy_memo.set(fingerprint, name)
+                if self._profile is not None:
+                    self._profile.table_strategy = name
+                break
+            print(f"  ↪️  Table strategy '{name}' found no line items")
+        return items
+
+    def _layout_fingerprint(self, session: PDFParseSession, metadata: DocumentMetadata) -> str:
+        """Supplier key for the strategy memo: vendor name, else document type and page size"""
+        vendor = ' '.join(metadata.vendor_name.split()).lower()
+        if vendor and vendor != UNKNOWN_VENDOR.lower():
+            return f"vendor:{vendor}"
+        size = "0x0"
+        if session.page_count:
+            box = session.reader.pages[0].mediabox
+            size = f"{round(float(box.width))}x{round(float(box.height))}"
+        return f"layout:{metadata.doc_type}:{size}"
+
+    def iter_line_items(
+        self,
+        session: PDFParseSession,
+        totals: Optional[Dict[str, float]] = None,
+        table_settings: Optional[Dict] = None
+    ) -> Iterator[LineItem]:
+        """
+        Stream line items page by page.
+
+        A line-item table that starts without a header row (a page break in
+        the middle of the table) is parsed with the header carried over from
+        the previous page. The summary table may sit on any page; when a
+        totals dict is passed it is filled in place as soon as that table is
+        seen. Each page is released once consumed, so memory does not grow
+        with page count. Pages with a cached record for this strategy and the
+        same incoming header replay their stored rows instead of being parsed.
+        """
         if not HAS_PDFPLUMBER:
             print("⚠️  pdfplumber not available, skipping table extraction")
-            return items
+            return
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Only process first page (line items are on page 1)
-                if len(pdf.pages) > 0:
-                    page = pdf.pages[0]
-
-                    try:
-                        tables = page.extract_tables()
-                        if tables and len(tables) > 0:
-                            # Get the first table (line items table)
-                            table = tables[0]
-                            items = self._parse_table_custom(table)
-                            print(f"  📊 Parsed {len(items)} items from table")
-                    except Exception as e:
-                        print(f"  ⚠️  Error extracting table: {e}")
+            page_count = session.page_count
         except Exception as e:
             print(f"  ⚠️  Error opening PDF: {e}")
+            return
 
-        return items
+        strategy_key = json.dumps(table_settings, sort_keys=True) if table_settings else 'default'
+        reusable = {
+            index for index, record in self._page_records.items()
+            if strategy_key in record['tables']
+        }
+
+        page_order = iter(range(page_count))
+        page_workers = min(self.page_workers, os.cpu_count() or 1)
+        if page_workers > 1 and page_count - len(reusable) >= self.parallel_page_threshold:
+            pool = self._shared_page_pool(page_workers) if session.pdf_path is not None else None
+            page_order = session.prefetch_tables(
+                page_workers, table_settings=table_settings, skip=reusable, pool=pool
+            )
+
+        try:
+            yield from self._iter_page_items(session, page_order, strategy_key, totals, table_settings)
+        finally:
+            # Stops the page pool's queued work when iteration ends early
+            if hasattr(page_order, 'close'):
+                page_order.close()
+            if session.page_pool_failed:
+                self.close()
+
+    def _iter_page_items(
+        self,
+        session: PDFParseSession,
+        page_order: Iterator[int],
+        strategy_key: str,
+        totals: Optional[Dict[str, float]],
+        table_settings: Optional[Dict]
+    ) -> Iterator[LineItem]:
+        """iter_line_items' page loop over the page indices page_order yields"""
+        header = None
+        while True:
+            # Waiting on the page pool counts towards the tables stage
+            with self._stage('tables'):
+                page_index = next(page_order, None)
+            if page_index is None:
+                break
+
+            record = self._page_records.get(page_index)
+            cached = record['tables'].get(strategy_key) if record is not None else None
+            if cached is not None and cached['header_in'] == header:
+                if totals is not None:
+                    totals.update(cached['totals'])
+                header = cached['header_out']
+                if self._profile is not None:
+                    self._profile.pages_reused += 1
+                yield from LineItemTable.from_columns(cached['items']).to_items()
+                continue
+
+            header_in = header
+            page_rows = []
+            page_totals = {}
+            # Released however the page ends: parse error, exception, or the
+            # consumer closing the generator mid-page
+            try:
+                try:
+                    with self._stage('tables'):
+                        tables = session.page_tables(page_index, table_settings)
+                except Exception as e:
+                    print(f"  ⚠️  Error extracting table on page {page_index + 1}: {e}")
+                    continue
+
+                for table in tables:
+                    if not table or not table[0]:
+                        continue
+
+                    if self._is_line_item_header(table[0]):
+                        header = table[0]
+                        rows = table[1:]
+                    elif self._is_totals_table(table):
+                        page_totals.update(self._parse_totals_table(table))
+                        if totals is not None:
+                            totals.update(page_totals)
+                        continue
+                    elif header is not None and len(table[0]) == len(header):
+                        rows = table
+                    else:
+                        # Text strategies fold the letterhead into the same table,
+                        # so the header row can sit anywhere inside it
+                        start = next(
+                            (i for i, row in enumerate(table) if row and self._is_line_item_header(row)),
+                            None
+                        )
+                        if start is None:
+                            continue
+                        header = table[start]
+                        rows = table[start + 1:]
+
+                    with self._stage('tables'):
+                        page_items = self._parse_table_custom([header] + rows)
+                    if self._profile is not None:
+                        self._profile.rows_parsed += len(rows)
+                    print(f"  📊 Parsed {len(page_items)} items from table (page {page_index + 1})")
+                    page_rows.extend(page_items)
+                    yield from page_items
+            finally:
+                session.release_page(page_index)
+
+            if page_index in self._page_records:
+                self._page_records[page_index]['tables'][strategy_key] = {
+                    'header_in': header_in,
+                    'header_out': header,
+                    'totals': page_totals,
+                    'items': {name: [getattr(item, name) for item in page_rows] for name in LINE_ITEM_FIELDS},
+                }
+                self._dirty_pages.add(page_index)
+
+    def _is_line_item_header(self, row: List[str]) -> bool:
+        header_lower = [str(h).lower().strip() if h else "" for h in row]
+        has_qty = self._find_exact_column(header_lower, ['qty']) is not None
+        has_price = any('unit price' in h for h in header_lower)
+        return has_qty and has_price
+
+    def _is_totals_table(self, table: List[List[str]]) -> bool:
+        """Two-column Metric/Amount summary table"""
+        if len(table[0]) != 2:
+            return False
+        return any(
+            row and row[0] and 'total' in str(row[0]).lower()
+            for row in table
+        )
 
     def _parse_table_custom(self, table: List[List[str]]) -> List[LineItem]:
         """
@@ -1226,129 +2084,158 @@ class PDFExtractor:
         if not table or len(table) < 2:
             return items
 
-        header = table[0]
-        header_lower = [str(h).lower().strip() if h else "" for h in header]
-
-        # Find column indices (works for both PO and PI formats)
-        sku_idx = self._find_exact_column(header_lower, ['sku'])
-        desc_idx = self._find_exact_column(header_lower, ['description'])
-        qty_idx = self._find_exact_column(header_lower, ['qty'])
-
-        # Unit price (handles both "unit price" and "unit price (pi)")
-        price_idx = None
-        for i, h in enumerate(header_lower):
-            if 'unit price' in h:
-                price_idx = i
-                break
-
-        # Discount % (handles both "discount %" and "discount % (pi)")
-        discount_pct_idx = None
-        for i, h in enumerate(header_lower):
-            if 'discount %' in h:
-                discount_pct_idx = i
-                break
-
-        # Discount Amount (handles both formats)
-        discount_amt_idx = None
-        for i, h in enumerate(header_lower):
-            if 'discount amount' in h:
-                discount_amt_idx = i
-                break
+        # Column indices are resolved once per header layout (PO, PI, ...)
+        plan = self._column_plan(table[0])
 
-        # Taxable Amount
-        taxable_idx = None
-        for i, h in enumerate(header_lower):
-            if 'taxable amount' in h:
-                taxable_idx = i
-                break
-
-        # Line Total
-        total_idx = None
-        for i, h in enumerate(header_lower):
-            if 'line total' in h:
-                total_idx = i
-                break
+        # Drop blank rows
+        rows = [
+            row for row in table[1:]
+            if row and not all(not cell or str(cell).strip() == '' for cell in row)
+        ]
+        if not rows:
+            return items
 
-        # Parse data rows (skip header)
-        for row_num, row in enumerate(table[1:], start=1):
-            if not row or all(not cell or str(cell).strip() == '' for cell in row):
+        # Numeric columns are parsed a whole column at a time
+        quantities = self._parse_number_column(rows, plan.quantity)
+        unit_prices = self._parse_number_column(rows, plan.unit_price)
+        discount_pcts = self._parse_number_column(rows, plan.discount_pct)
+        discount_amounts = self._parse_number_column(rows, plan.discount_amount)
+        taxable_amounts = self._parse_number_column(rows, plan.taxable_amount)
+        total_prices = self._parse_number_column(rows, plan.total_price)
+
+        sku_idx = plan.sku
+        desc_idx = plan.description
+        for i, row in enumerate(rows):
+            qty = quantities[i]
+            unit_price = unit_prices[i]
+
+            # Only add if we have valid quantity and price
+            if not (qty > 0 and unit_price > 0):
                 continue
 
-            try:
-                # Extract values with None checks
-                sku = str(row[sku_idx]).strip() if sku_idx is not None and sku_idx < len(row) and row[sku_idx] else "UNKNOWN"
-                desc = str(row[desc_idx]).strip() if desc_idx is not None and desc_idx < len(row) and row[desc_idx] else sku
-
-                qty = self._parse_number(str(row[qty_idx])) if qty_idx is not None and qty_idx < len(row) else 0.0
-                unit_price = self._parse_number(str(row[price_idx])) if price_idx is not None and price_idx < len(row) else 0.0
-
-                discount_pct = self._parse_number(str(row[discount_pct_idx])) if discount_pct_idx is not None and discount_pct_idx < len(row) else 0.0
-                discount_amt = self._parse_number(str(row[discount_amt_idx])) if discount_amt_idx is not None and discount_amt_idx < len(row) else 0.0
-
-                taxable = self._parse_number(str(row[taxable_idx])) if taxable_idx is not None and taxable_idx < len(row) else 0.0
-                total_price = self._parse_number(str(row[total_idx])) if total_idx is not None and total_idx < len(row) else 0.0
-
-                # Only add if we have valid quantity and price
-                if qty > 0 and unit_price > 0:
-                    items.append(LineItem(
-                        item_no=sku,
-                        description=desc,
-                        unit="EA",
-                        quantity=qty,
-                        unit_price=unit_price,
-                        discount_pct=discount_pct,
-                        discount_amount=discount_amt,
-                        taxable_amount=taxable,
-                        total_price=total_price
-                    ))
-            except Exception as e:
-                print(f"  ⚠️  Error parsing row {row_num}: {e}")
-                continue
+            sku = str(row[sku_idx]).strip() if sku_idx is not None and sku_idx < len(row) and row[sku_idx] else "UNKNOWN"
+            desc = str(row[desc_idx]).strip() if desc_idx is not None and desc_idx < len(row) and row[desc_idx] else sku
+
+            items.append(LineItem(
+                item_no=sku,
+                description=desc,
+                unit="EA",
+                quantity=qty,
+                unit_price=unit_price,
+                discount_pct=discount_pcts[i],
+                discount_amount=discount_amounts[i],
+                taxable_amount=taxable_amounts[i],
+                total_price=total_prices[i]
+            ))
 
         return items
 
-    def _extract_totals_from_tables(self, pdf_path: Path) -> Dict[str, float]:
-        """Extract totals from the summary table on page 2"""
-        totals = {'subtotal': 0.0, 'discount': 0.0, 'taxable_amount': 0.0, 'tax': 0.0, 'tax_rate': 7.5, 'total': 0.0}
+    def _empty_totals(self) -> Dict[str, float]:
+        return {'subtotal': 0.0, 'discount': 0.0, 'taxable_amount': 0.0, 'tax': 0.0, 'tax_rate': 7.5, 'total': 0.0}
+
+    def _extract_totals_from_tables(self, session: PDFParseSession) -> Dict[str, float]:
+        """Extract totals from the summary table, whichever page it is on"""
+        totals = self._empty_totals()
 
         if not HAS_PDFPLUMBER:
             return totals
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Page 2 has the summary table
-                if len(pdf.pages) > 1:
-                    page = pdf.pages[1]
-
-                    try:
-                        tables = page.extract_tables()
-                        if tables and len(tables) > 0:
-                            table = tables[0]
-
-                            # Parse summary table
-                            # Format: ['Metric', 'Amount']
-                            for row in table[1:]:  # Skip header
-                                if row and len(row) >= 2:
-                                    metric = str(row[0]).strip().lower()
-                                    amount = self._parse_number(str(row[1]))
-
-                                    if 'subtotal' in metric:
-                                        totals['subtotal'] = amount
-                                    elif 'discount' in metric:
-                                        totals['discount'] = amount
-                                    elif 'taxable' in metric:
-                                        totals['taxable_amount'] = amount
-                                    elif 'tax' in metric and 'grand' not in metric:
-                                        totals['tax'] = amount
-                                    elif 'grand total' in metric or 'total' in metric:
-                                        totals['total'] = amount
-                    except Exception as e:
-                        print(f"  ⚠️  Error extracting totals table: {e}")
+            for page_index in range(session.page_count):
+                try:
+                    for table in session.page_tables(page_index):
+                        if table and table[0] and self._is_totals_table(table):
+                            totals.update(self._parse_totals_table(table))
+                            return totals
+                except Exception as e:
+                    print(f"  ⚠️  Error extracting totals table: {e}")
         except Exception as e:
             print(f"  ⚠️  Error opening PDF for totals: {e}")
 
         return totals
 
+    def _parse_totals_table(self, table: List[List[str]]) -> Dict[str, float]:
+        """Parse summary table rows. Format: ['Metric', 'Amount']"""
+        totals = {}
+        for row in table:
+            if row and len(row) >= 2:
+                metric = str(row[0]).strip().lower()
+                amount = self._parse_number(str(row[1]))
+
+                if 'subtotal' in metric:
+                    totals['subtotal'] = amount
+                elif 'discount' in metric:
+                    totals['discount'] = amount
+                elif 'taxable' in metric:
+                    totals['taxable_amount'] = amount
+                elif 'tax' in metric and 'grand' not in metric:
+                    totals['tax'] = amount
+                elif 'grand total' in metric or 'total' in metric:
+                    totals['total'] = amount
+        return totals
+
+    def _column_plan(self, header: List[str]) -> "ColumnPlan":
+        """Resolve (or fetch the cached) column mapping for a header row"""
+        signature = tuple(str(h).lower().strip() if h else "" for h in header)
+        with _COLUMN_PLANS_LOCK:
+            plan = _COLUMN_PLANS.get(signature)
+            if plan is not None:
+                _COLUMN_PLANS.move_to_end(signature)
+        if plan is None:
+            header_lower = list(signature)
+            plan = ColumnPlan(
+                sku=self._find_exact_column(header_lower, ['sku']),
+                description=self._find_exact_column(header_lower, ['description']),
+                quantity=self._find_exact_column(header_lower, ['qty']),
+                # Substring matches handle both "unit price" and "unit price (pi)" etc.
+                unit_price=self._find_column_containing(header_lower, 'unit price'),
+                discount_pct=self._find_column_containing(header_lower, 'discount %'),
+                discount_amount=self._find_column_containing(header_lower, 'discount amount'),
+                taxable_amount=self._find_column_containing(header_lower, 'taxable amount'),
+                total_price=self._find_column_containing(header_lower, 'line total'),
+            )
+            with _COLUMN_PLANS_LOCK:
+                _COLUMN_PLANS[signature] = plan
+                while len(_COLUMN_PLANS) > MAX_COLUMN_PLANS:
+                    _COLUMN_PLANS.popitem(last=False)
+        return plan
+
+    def _find_column_containing(self, headers: List[str], fragment: str) -> Optional[int]:
+        """Find first column whose header contains fragment"""
+        for i, header in enumerate(headers):
+            if fragment in header:
+                return i
+        return None
+
+    def _parse_number_column(self, rows: List[List[str]], idx: Optional[int]) -> List[float]:
+        """
+        Parse one numeric column for all rows.
+
+        Cells are cleaned with a single regex pass over the joined column and
+        converted with one map(float); only a column containing an empty or
+        malformed cell falls back to per-cell parsing. Same results as
+        _parse_number applied cell by cell.
+        """
+        if idx is None:
+            return [0.0] * len(rows)
+
+        cells = [str(row[idx]) if idx < len(row) else '' for row in rows]
+        cleaned = _NUMBER_CLEANUP.sub('', '\n'.join(cells)).split('\n')
+        if len(cleaned) != len(cells):
+            # A cell contained a line break - keep rows aligned
+            return [self._parse_number(cell) for cell in cells]
+
+        try:
+            return list(map(float, cleaned))
+        except ValueError:
+            return [self._parse_cleaned_number(value) for value in cleaned]
+
+    def _parse_cleaned_number(self, cleaned: str) -> float:
+        try:
+            return float(cleaned) if cleaned and cleaned != '-' else 0.0
+        except ValueError:
+            return 0.0
+
     def _find_exact_column(self, headers: List[str], keywords: List[str]) -> Optional[int]:
         """Find column by exact keyword match"""
         for i, header in enumerate(headers):
@@ -1380,7 +2267,8 @@ class PDFExtractor:
 
     def _extract_metadata(self, text: str, doc_type: str) -> DocumentMetadata:
         doc_id = self._extract_id(text, doc_type)
-        date = self._extract_date(text)
+        found_date = self._find_date(text)
+        date = found_date or self._extract_date(text)
         vendor = self._extract_vendor(text)
         customer = self._extract_customer(text)
 
@@ -1389,7 +2277,8 @@ class PDFExtractor:
             document_id=doc_id,
             date=date,
             vendor_name=vendor,
-            customer_name=customer
+            customer_name=customer,
+            date_found=found_date is not None
         )
 
     def _extract_id(self, text: str, doc_type: str) -> str:
@@ -1405,6 +2294,9 @@ class PDFExtractor:
         return "UNKNOWN"
 
     def _extract_date(self, text: str) -> str:
+        return self._find_date(text) or datetime.now().strftime("%Y-%m-%d")
+
+    def _find_date(self, text: str) -> Optional[str]:
         # Look for dates in filename or text
         filename_date = re.search(r'(\d{4}-\d{2}-\d{2})', text)
         if filename_date:
@@ -1413,7 +2305,7 @@ class PDFExtractor:
         match = re.search(self.date_pattern, text)
         if match:
             return match.group(0)
-        return datetime.now().strftime("%Y-%m-%d")
+        return None
 
     def _extract_vendor(self, text: str) -> str:
         # Your PDFs have "Infinity Supplies"
@@ -1428,7 +2320,7 @@ class PDFExtractor:
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 return match.group(1).strip()
-        return "Unknown Vendor"
+        return UNKNOWN_VENDOR
 
     def _extract_customer(self, text: str) -> str:
         patterns = [
@@ -1488,25 +2380,130 @@ class PDFExtractor:
         return ""
 
 
-def extract_all_pdfs(data_dir: Path) -> Dict[str, ExtractedDocument]:
-    """Extract all PDFs from directory"""
-    extractor = PDFExtractor()
+def _extract_pdf_worker(
+    pdf_path: Path,
+    cache=None,
+    track_allocations: Optional[bool] = None,
+    strategy_memo: Optional[TableStrategyMemo] = None
+) -> Tuple[str, Optional[ExtractedDocument], Optional[str], Optional[DocumentProfile]]:
+    """Process-pool entry point: errors are returned to the parent, not raised.
+
+    track_allocations None disables profiling; otherwise the document's
+    profile is sent back for the parent's profiler.
+    """
+    profiler = ExtractionProfiler(track_allocations=track_allocations) if track_allocations is not None else None
+    try:
+        doc = PDFExtractor(cache=cache, profiler=profiler, strategy_memo=strategy_memo).extract_pdf(pdf_path)
+        doc, error = doc, None
+    except Exception as e:
+        doc, error = None, f"{type(e).__name__}: {e}"
+    profile = profiler.profiles[0] if profiler and profiler.profiles else None
+    return pdf_path.stem, doc, error, profile
+
+
+def extract_pdfs_parallel(
+    pdf_files: Iterable[Path],
+    max_workers: Optional[int] = None,
+    chunksize: int = 1,
+    cache=None,
+    profiler: Optional[ExtractionProfiler] = None,
+    strategy_memo: Optional[TableStrategyMemo] = None
+) -> BatchExtractionResult:
+    """Extract PDFs across a process pool, keeping input order in the result"""
+    pdf_files = [Path(f) for f in pdf_files]
     documents = {}
+    errors = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        worker = partial(
+            _extract_pdf_worker,
+            cache=cache,
+            track_allocations=profiler.track_allocations if profiler is not None else None,
+            strategy_memo=strategy_memo
+        )
+        results = pool.map(worker, pdf_files, chunksize=chunksize)
+        while True:
+            try:
+                name, doc, error, profile = next(results)
+            except StopIteration:
+                break
+            except Exception as e:
+                # Pool broke (e.g. a worker was killed) - remaining files fail with it
+                for pdf_file in pdf_files:
+                    if pdf_file.stem not in documents and pdf_file.stem not in errors:
+                        errors[pdf_file.stem] = f"{type(e).__name__}: {e}"
+                break
+
+            if profiler is not None and profile is not None:
+                profiler.record(profile)
+            if error is None:
+                documents[name] = doc
+            else:
+                errors[name] = error
+
+    return BatchExtractionResult(documents=documents, errors=errors)
+
+
+def extract_all_pdfs(
+    data_dir: Path,
+    max_workers: int = 1,
+    cache=None,
+    profiler: Optional[ExtractionProfiler] = None,
+    strategy_memo: Optional[TableStrategyMemo] = None,
+    errors: Optional[Dict[str, str]] = None
+) -> Dict[str, ExtractedDocument]:
+    """Extract all PDFs from directory
+
+    With max_workers > 1 files are spread over a process pool. Either way a
+    file that fails gets one error line rather than a traceback; pass a dict
+    as errors to have it filled with file stem -> "ExceptionType: message"
+    for every such file. With a profiler, its JSON summary is printed at the
+    end.
+    """
+    extractor = PDFExtractor(cache=cache, profiler=profiler, strategy_memo=strategy_memo)
+    documents = {}
+    pdf_files = sorted(data_dir.glob("*.pdf"))
 
     print(f"\n{'='*80}")
     print("EXTRACTING PDFs")
     print('='*80)
 
-    for pdf_file in data_dir.glob("*.pdf"):
+    if max_workers > 1 and len(pdf_files) > 1:
+        result = extract_pdfs_parallel(
+            pdf_files, max_workers=max_workers, cache=cache,
+            profiler=profiler, strategy_memo=strategy_memo
+        )
+        for name, doc in result.documents.items():
+            print(f"  ✅ {name}: {len(doc.items)} items, Total: ${doc.total:.2f}")
+        for name, error in result.errors.items():
+            print(f"  ❌ {name}: {error}")
+        if errors is not None:
+            errors.update(result.errors)
+        _print_profile_summary(profiler)
+        print(f"\n{'='*80}\n")
+        return result.documents
+
+    for pdf_file in pdf_files:
         try:
             print(f"\n📄 Processing: {pdf_file.name}")
             doc = extractor.extract_pdf(pdf_file)
             documents[pdf_file.stem] = doc
             print(f"  ✅ Success: {len(doc.items)} items, Total: ${doc.total:.2f}")
         except Exception as e:
-            print(f"  ❌ Error: {e}")
-            import traceback
-            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+            print(f"  ❌ {pdf_file.stem}: {error}")
+            if errors is not None:
+                errors[pdf_file.stem] = error
 
+    _print_profile_summary(profiler)
     print(f"\n{'='*80}\n")
     return documents
+
+
+def _print_profile_summary(profiler: Optional[ExtractionProfiler]):
+    if profiler is None or not profiler.profiles:
+        return
+    print(f"\n{'-'*80}")
+    print("EXTRACTION PROFILE")
+    print('-'*80)
+    print(profiler.summary_json())
@@ -107,7 +107,7 @@ class RAGSystem:
             'items_count': len(document.items)
         }
         
-        chunks = self.chunker.chunk_text(document.raw_text, document_metadata)
+        chunks = self.chunker.chunk_text(str(document.raw_text), document_metadata)
         
         chunk_ids = []
         chunk_documents = []
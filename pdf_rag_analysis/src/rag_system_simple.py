@@ -97,7 +97,7 @@ class SimpleRAGSystem:
             'items_count': len(document.items)
         }
         
-        chunks = self.chunker.chunk_text(document.raw_text, document_metadata)
+        chunks = self.chunker.chunk_text(str(document.raw_text), document_metadata)
         
         chunk_ids = []
         chunk_documents = []
@@ -0,0 +1,364 @@
+"""
+Many-to-many reconciliation of purchase orders against invoices.
+
+BatchReconciler takes every extracted document of a run (e.g. a month of
+POs and proforma invoices) and pairs each invoice with a PO through an
+index built once over the POs:
+
+1. document ID - an invoice quoting a PO's number belongs to it;
+2. vendor + date - otherwise the same vendor's PO dated nearest to the
+   invoice, within date_window_days (unclaimed POs preferred on ties);
+3. vendor alone - when dates are missing and the vendor has one PO;
+4. sole pair - as a last resort, when exactly one PO and one invoice are
+   left unclaimed they are paired with each other, so a folder holding a
+   single PO / invoice pair is always compared.
+
+The extractor's placeholders - "UNKNOWN" document IDs, "Unknown Vendor" and
+the extraction day standing in for a missing date - never count as a match.
+
+Several invoices landing on one PO are a split shipment: their lines are
+merged (same normalised SKU summed) and compared against the PO as one
+delivery. All PO/invoice groups are compared on a process pool, giving one
+DocumentComparison per group plus a roll-up over the batch.
+"""
+
+import os
+import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.pdf_extractor import (
+    DocumentMetadata,
+    ExtractedDocument,
+    LineItemTable,
+    LINE_ITEM_FIELDS,
+    UNKNOWN_VENDOR,
+)
+from src.comparator import DocumentComparison, compare_po_with_invoice
+from src.item_matching import normalise_sku
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%m-%d-%Y", "%d/%m/%y", "%m/%d/%y")
+
+# Summed when split-shipment lines with the same SKU are merged; the other
+# numeric fields (unit price, discount %) are taken from the first line
+SUMMED_FIELDS = ("quantity", "discount_amount", "taxable_amount", "total_price")
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def parse_date(value: str) -> Optional[date]:
+    """A document date string in any of DATE_FORMATS, or None"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+
+def document_date(metadata: DocumentMetadata) -> Optional[date]:
+    """The document's date, or None when it is unreadable or was not found in the text"""
+    return parse_date(metadata.date) if metadata.date_found else None
+
+
+_UNKNOWN_VENDOR_KEY = _NON_ALNUM.sub(' ', UNKNOWN_VENDOR.lower()).strip()
+
+
+def _normalise_vendor(name: str) -> str:
+    """Vendor key; '' when the vendor is missing or the extractor's placeholder"""
+    vendor = _NON_ALNUM.sub(' ', (name or '').lower()).strip()
+    return '' if vendor == _UNKNOWN_VENDOR_KEY else vendor
+
+
+def _known_id(document_id: str) -> Optional[str]:
+    document_id = (document_id or '').strip()
+    return document_id if document_id and document_id.upper() != "UNKNOWN" else None
+
+
+@dataclass
+class ReconciliationGroup:
+    """One PO and the invoice(s) billed against it"""
+    po_name: str
+    invoice_names: List[str]
+    # 'document_id', 'vendor_date', 'vendor' or 'sole_pair' - how the first invoice was paired
+    basis: str
+    # The invoice compared: the single invoice, or the merged split shipment
+    invoice_doc: Optional[ExtractedDocument] = None
+    comparison: Optional[DocumentComparison] = None
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return self.po_name
+
+    @property
+    def split_shipment(self) -> bool:
+        return len(self.invoice_names) > 1
+
+
+@dataclass
+class ReconciliationResult:
+    groups: List[ReconciliationGroup] = field(default_factory=list)
+    unmatched_pos: List[str] = field(default_factory=list)
+    unmatched_invoices: List[str] = field(default_factory=list)
+    rollup: Dict = field(default_factory=dict)
+
+    def comparisons(self) -> Dict[str, DocumentComparison]:
+        return {group.key: group.comparison for group in self.groups if group.comparison is not None}
+
+
+def merge_shipments(invoices: List[ExtractedDocument]) -> ExtractedDocument:
+    """
+    One invoice document for a split shipment: lines of all invoices, with
+    lines sharing a SKU (compared as the line matcher does) summed into one
+    (first line's SKU, price and description), and header totals added up.
+    Lines without a SKU or with the placeholder one are kept separate.
+    """
+    if len(invoices) == 1:
+        return invoices[0]
+
+    columns: Dict[str, List] = {name: [] for name in LINE_ITEM_FIELDS}
+    for doc in invoices:
+        items = doc.items if isinstance(doc.items, LineItemTable) else LineItemTable.from_items(doc.items)
+        for name in columns:
+            columns[name].extend(items.column(name).tolist())
+    merged = LineItemTable.from_columns(columns)
+
+    # Group rows by normalised SKU; rows without one stay as they are
+    codes, pool = merged.string_codes('item_no')
+    key_ids: Dict[str, int] = {}
+    id_of_code = np.array([
+        key_ids.setdefault(key, len(key_ids)) if key else -1
+        for key in map(normalise_sku, pool)
+    ], dtype=np.int64)
+    row_ids = id_of_code[codes] if len(codes) else np.empty(0, dtype=np.int64)
+    group_of = np.where(row_ids >= 0, row_ids, -1 - np.arange(len(codes)))
+    _, first_row, group_index = np.unique(group_of, return_index=True, return_inverse=True)
+    keep = np.sort(first_row)
+    if len(keep) < len(merged):
+        # Output groups in order of their first line
+        rank = np.empty(len(first_row), dtype=np.int64)
+        rank[np.argsort(first_row)] = np.arange(len(first_row))
+        group_index = rank[group_index]
+        columns = {name: merged.column(name)[keep].tolist() for name in columns}
+        for name in SUMMED_FIELDS:
+            columns[name] = np.bincount(group_index, weights=merged.column(name), minlength=len(keep)).tolist()
+        merged = LineItemTable.from_columns(columns)
+
+    first = invoices[0].metadata
+    metadata = DocumentMetadata(
+        doc_type=first.doc_type,
+        document_id="+".join(doc.metadata.document_id for doc in invoices),
+        date=first.date,
+        vendor_name=first.vendor_name,
+        customer_name=first.customer_name,
+        date_found=first.date_found
+    )
+    subtotal = sum(doc.subtotal for doc in invoices)
+    tax = sum(doc.tax for doc in invoices)
+    taxable = sum(doc.taxable_amount for doc in invoices)
+    return ExtractedDocument(
+        metadata=metadata,
+        items=merged,
+        subtotal=subtotal,
+        total_discount=sum(doc.total_discount for doc in invoices),
+        taxable_amount=taxable,
+        tax=tax,
+        tax_rate=round(tax / taxable * 100, 2) if taxable else invoices[0].tax_rate,
+        total=sum(doc.total for doc in invoices),
+        notes="\n".join(doc.notes for doc in invoices if doc.notes)
+    )
+
+
+def _compare_group_worker(po_doc: ExtractedDocument, invoice_doc: ExtractedDocument):
+    """Process-pool entry point; returns (comparison, error) so one bad pair doesn't sink the batch"""
+    try:
+        return compare_po_with_invoice(po_doc, invoice_doc), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class _PurchaseOrderIndex:
+    """POs by document ID and by vendor, each vendor's POs sorted by date for bisecting"""
+
+    def __init__(self, pos: Dict[str, DocumentMetadata], date_window_days: int):
+        self.date_window_days = date_window_days
+        self.by_id: Dict[str, List[str]] = {}
+        self.vendor_of: Dict[str, str] = {}
+        dated: Dict[str, List[Tuple[date, str]]] = {}
+        self.undated: Dict[str, List[str]] = {}
+        for name, metadata in pos.items():
+            document_id = _known_id(metadata.document_id)
+            if document_id:
+                self.by_id.setdefault(document_id, []).append(name)
+            vendor = self.vendor_of[name] = _normalise_vendor(metadata.vendor_name)
+            if not vendor:
+                # Only reachable by document ID
+                continue
+            po_date = document_date(metadata)
+            if po_date is None:
+                self.undated.setdefault(vendor, []).append(name)
+            else:
+                dated.setdefault(vendor, []).append((po_date, name))
+
+        # vendor -> (sorted dates, PO names in the same order)
+        self.by_vendor: Dict[str, Tuple[List[date], List[str]]] = {}
+        for vendor, entries in dated.items():
+            entries.sort()
+            self.by_vendor[vendor] = ([d for d, _ in entries], [name for _, name in entries])
+
+    def find(self, metadata: DocumentMetadata, claimed) -> Optional[Tuple[str, str]]:
+        """(PO name, pairing basis) for an invoice, or None"""
+        vendor = _normalise_vendor(metadata.vendor_name)
+
+        document_id = _known_id(metadata.document_id)
+        if document_id and document_id in self.by_id:
+            candidates = self.by_id[document_id]
+            same_vendor = [name for name in candidates if self.vendor_of[name] == vendor]
+            return (same_vendor or candidates)[0], 'document_id'
+
+        if not vendor:
+            return None
+        invoice_date = document_date(metadata)
+        dates, names = self.by_vendor.get(vendor, ([], []))
+        if invoice_date is not None and dates:
+            window = timedelta(days=self.date_window_days)
+            low = bisect_left(dates, invoice_date - window)
+            high = bisect_right(dates, invoice_date + window)
+            if low < high:
+                # Nearest date first, then a PO nothing is billed against yet, then the earlier PO
+                *_, po_name = min(
+                    (abs((dates[i] - invoice_date).days), names[i] in claimed, dates[i], names[i])
+                    for i in range(low, high)
+                )
+                return po_name, 'vendor_date'
+
+        vendor_pos = names + self.undated.get(vendor, [])
+        if len(vendor_pos) == 1 and (invoice_date is None or not dates):
+            return vendor_pos[0], 'vendor'
+        return None
+
+
+class BatchReconciler:
+    def __init__(self, max_workers: int = 1, date_window_days: int = 45, pair_sole_documents: bool = True):
+        self.max_workers = max(1, max_workers)
+        self.date_window_days = date_window_days
+        # Pair the last unclaimed PO with the last unclaimed invoice ('sole_pair')
+        self.pair_sole_documents = pair_sole_documents
+
+    def reconcile(self, documents: Dict[str, ExtractedDocument]) -> ReconciliationResult:
+        """Pair, compare every group and roll the results up"""
+        result = self.pair(documents)
+        self._compare_groups(result.groups, documents)
+        result.rollup = self._rollup(result, documents)
+        return result
+
+    def pair(self, documents: Dict[str, ExtractedDocument]) -> ReconciliationResult:
+        """Group invoices under POs without comparing anything"""
+        pos = sorted(name for name, doc in documents.items() if 'PURCHASE_ORDER' in doc.metadata.doc_type)
+        invoices = sorted(
+            (name for name, doc in documents.items() if 'INVOICE' in doc.metadata.doc_type),
+            key=lambda name: (document_date(documents[name].metadata) or date.max, name)
+        )
+        index = _PurchaseOrderIndex({name: documents[name].metadata for name in pos}, self.date_window_days)
+
+        groups: Dict[str, ReconciliationGroup] = {}
+        unmatched_invoices = []
+        for name in invoices:
+            match = index.find(documents[name].metadata, claimed=groups)
+            if match is None:
+                unmatched_invoices.append(name)
+                continue
+            po_name, basis = match
+            if po_name in groups:
+                groups[po_name].invoice_names.append(name)
+            else:
+                groups[po_name] = ReconciliationGroup(po_name, [name], basis)
+
+        unmatched_pos = [name for name in pos if name not in groups]
+        if self.pair_sole_documents and len(unmatched_pos) == 1 and len(unmatched_invoices) == 1:
+            groups[unmatched_pos[0]] = ReconciliationGroup(unmatched_pos[0], unmatched_invoices, 'sole_pair')
+            unmatched_invoices = []
+
+        return ReconciliationResult(
+            groups=[groups[name] for name in pos if name in groups],
+            unmatched_pos=[name for name in pos if name not in groups],
+            unmatched_invoices=unmatched_invoices
+        )
+
+    def _compare_groups(self, groups: List[ReconciliationGroup], documents: Dict[str, ExtractedDocument]):
+        for group in groups:
+            group.invoice_doc = merge_shipments([documents[name] for name in group.invoice_names])
+        tasks = [(documents[group.po_name], group.invoice_doc) for group in groups]
+        workers = min(self.max_workers, len(tasks), os.cpu_count() or 1)
+
+        results = None
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    chunksize = max(1, len(tasks) // (workers * 4))
+                    results = list(pool.map(_compare_group_worker, *zip(*tasks), chunksize=chunksize))
+            except Exception as e:
+                print(f"  ⚠️  Parallel comparison failed ({e}), continuing in-process")
+        if results is None:
+            results = [_compare_group_worker(po_doc, invoice_doc) for po_doc, invoice_doc in tasks]
+
+        for group, (comparison, error) in zip(groups, results):
+            group.comparison = comparison
+            group.error = error
+
+    def _rollup(self, result: ReconciliationResult, documents: Dict[str, ExtractedDocument]) -> Dict:
+        compared = [group for group in result.groups if group.comparison is not None]
+        by_vendor: Dict[str, Dict] = {}
+        for group in compared:
+            comparison = group.comparison
+            vendor = documents[group.po_name].metadata.vendor_name or "UNKNOWN"
+            entry = by_vendor.setdefault(vendor, {
+                'groups': 0, 'discrepant_items': 0, 'value_ordered': 0.0, 'value_invoiced': 0.0
+            })
+            entry['groups'] += 1
+            entry['discrepant_items'] += comparison.discrepant_items
+            entry['value_ordered'] += comparison.summary_metrics.grand_total_po
+            entry['value_invoiced'] += comparison.summary_metrics.grand_total_pi
+
+        return {
+            'purchase_orders': len(result.groups) + len(result.unmatched_pos),
+            'invoices': sum(len(g.invoice_names) for g in result.groups) + len(result.unmatched_invoices),
+            'groups_compared': len(compared),
+            'groups_failed': len(result.groups) - len(compared),
+            'split_shipments': sum(1 for g in result.groups if g.split_shipment),
+            'clean_groups': sum(1 for g in compared if g.comparison.discrepant_items == 0),
+            'groups_with_discrepancies': sum(1 for g in compared if g.comparison.discrepant_items > 0),
+            'unmatched_pos': list(result.unmatched_pos),
+            'unmatched_invoices': list(result.unmatched_invoices),
+            'items_compared': sum(len(g.comparison.item_level_comparison) for g in compared),
+            'matching_items': sum(g.comparison.matching_items for g in compared),
+            'discrepant_items': sum(g.comparison.discrepant_items for g in compared),
+            'value_ordered': round(sum(g.comparison.summary_metrics.grand_total_po for g in compared), 2),
+            'value_invoiced': round(sum(g.comparison.summary_metrics.grand_total_pi for g in compared), 2),
+            'net_difference': round(sum(g.comparison.summary_metrics.grand_total_difference for g in compared), 2),
+            'pairing_basis': {
+                basis: sum(1 for g in result.groups if g.basis == basis)
+                for basis in ('document_id', 'vendor_date', 'vendor', 'sole_pair')
+            },
+            'by_vendor': {
+                vendor: {**entry, 'value_ordered': round(entry['value_ordered'], 2),
+                         'value_invoiced': round(entry['value_invoiced'], 2)}
+                for vendor, entry in sorted(by_vendor.items())
+            },
+        }
+
+
+def reconcile_documents(documents: Dict[str, ExtractedDocument]) -> ReconciliationResult:
+    """Reconcile a batch with the settings' worker count and date window"""
+    reconciler = BatchReconciler(
+        max_workers=settings.RECONCILE_WORKERS,
+        date_window_days=settings.RECONCILE_DATE_WINDOW_DAYS
+    )
+    return reconciler.reconcile(documents)
@@ -858,15 +858,64 @@
 #     }
 
 #     return reports
-import json
 import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple, Union
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
-from src.comparator import DocumentComparison, ItemDiscrepancy, SummaryMetrics
+from src.config import settings
+from src.comparator import ComparisonStream, DocumentComparison, ItemDiscrepancy, SummaryMetrics
 from src.pdf_extractor import ExtractedDocument
+from src.report_rows import ReportRows
+from src.json_stream import RowStream, open_report_file, report_path, write_json, write_ndjson, JSON_STYLES
+from src.columnar_report import COLUMNAR_FORMATS, HAS_PYARROW, append_to_dataset, pair_file_stem, write_comparison
+
+JSON_ITEM_COLUMNS = (
+    'SKU', 'Description', 'Qty_Ordered', 'Qty_Invoiced',
+    'Unit_Price_Ordered', 'Unit_Price_Invoiced',
+    'Discount_Pct_Ordered', 'Discount_Pct_Invoiced',
+    'Line_Total_Ordered', 'Line_Total_Invoiced',
+    'Quantity_Discrepancy', 'Price_Discrepancy', 'Total_Discrepancy',
+    'Severity', 'Reason'
+)
+
+CSV_COLUMNS = (
+    'SKU', 'Description',
+    'Qty_Ordered', 'Qty_Invoiced', 'Qty_Diff',
+    'Unit_Price_Ordered', 'Unit_Price_Invoiced', 'Price_Diff',
+    'Discount_Pct_Ordered', 'Discount_Pct_Invoiced',
+    'Line_Total_Ordered', 'Line_Total_Invoiced', 'Total_Diff',
+    'Quantity_Discrepancy', 'Price_Discrepancy', 'Total_Discrepancy',
+    'Severity', 'Reason'
+)
+
+# (Excel header, ReportRows column) of the Item Comparison and Discrepancies sheets
+EXCEL_ITEM_COLUMNS = (
+    ('SKU', 'SKU'), ('Description', 'Description'),
+    ('PO_Qty', 'Qty_Ordered'), ('Invoice_Qty', 'Qty_Invoiced'), ('Qty_Match', 'Qty_Match'),
+    ('PO_Price', 'Unit_Price_Ordered'), ('Invoice_Price', 'Unit_Price_Invoiced'), ('Price_Match', 'Price_Match'),
+    ('PO_Total', 'Line_Total_Ordered'), ('Invoice_Total', 'Line_Total_Invoiced'), ('Total_Diff', 'Total_Diff'),
+    ('Severity', 'Severity'), ('Status', 'Reason')
+)
+
+REPORT_FORMATS = ('json', 'csv', 'excel')
+
+
+def default_report_formats() -> Tuple[str, ...]:
+    """
+    json, csv and excel, plus REPORT_COLUMNAR_FORMAT ('parquet' / 'arrow')
+    when pyarrow is installed and 'dataset' when REPORT_DATASET_ENABLED
+    """
+    formats = REPORT_FORMATS
+    if HAS_PYARROW and settings.REPORT_COLUMNAR_FORMAT:
+        formats += (settings.REPORT_COLUMNAR_FORMAT,)
+        if settings.REPORT_DATASET_ENABLED:
+            formats += ('dataset',)
+    return formats
 
 class EnhancedReportGenerator:
     """Generate reports in the exact format specified"""
@@ -874,34 +923,86 @@ class EnhancedReportGenerator:
     def __init__(self, output_dir: Path):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Seconds spent by the last generate_reports call, per format plus 'rows'
+        self.timings: Dict[str, float] = {}
+
+    def generate_reports(
+        self,
+        comparison: DocumentComparison,
+        formats: Optional[Sequence[str]] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        Write several report formats at once.
+
+        The item rows are projected once and shared by every writer; the
+        writers then run concurrently on a thread pool. Returns once all of
+        them have finished - if any failed, the first error is raised after
+        the others complete.
+        """
+        formats = tuple(formats or default_report_formats())
+        start = time.perf_counter()
+        rows = ReportRows.from_comparison(comparison)
+        timings = {'rows': time.perf_counter() - start}
+
+        writers: Dict[str, Callable[[], str]] = {
+            'json': lambda: self.generate_complete_json_report(comparison, rows=rows),
+            'csv': lambda: self.generate_csv_report(comparison, rows=rows),
+            'excel': lambda: self.generate_excel_report(comparison, rows=rows),
+            'parquet': lambda: self.generate_columnar_report(comparison, fmt='parquet'),
+            'arrow': lambda: self.generate_columnar_report(comparison, fmt='arrow'),
+            'dataset': lambda: self.append_to_dataset(comparison),
+        }
+        unknown = [fmt for fmt in formats if fmt not in writers]
+        if unknown:
+            raise ValueError(f"Unknown report formats {unknown}; expected any of {sorted(writers)}")
+
+        def run(fmt: str) -> str:
+            start = time.perf_counter()
+            try:
+                return writers[fmt]()
+            finally:
+                timings[fmt] = time.perf_counter() - start
+
+        workers = min(max_workers or settings.REPORT_WORKERS, len(formats))
+        if workers <= 1:
+            reports = {fmt: run(fmt) for fmt in formats}
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report") as pool:
+                futures = {fmt: pool.submit(run, fmt) for fmt in formats}
+            reports = {fmt: future.result() for fmt, future in futures.items()}
+
+        self.timings = {name: timings[name] for name in ('rows', *formats) if name in timings}
+        return reports
 
     def generate_complete_json_report(
-        self, 
+        self,
         comparison: DocumentComparison,
-        filename: str = "discrepancy_report.json"
+        filename: str = "discrepancy_report.json",
+        rows: Optional[ReportRows] = None,
+        style: Optional[str] = None,
+        compression: Optional[str] = None
     ) -> str:
-        """Generate the complete JSON report with all required sections"""
+        """Generate the complete JSON report with all required sections
+
+        The report is streamed to the file item by item. style is 'pretty'
+        (indent=2, the default), 'compact' or 'ndjson' (one line per item,
+        mismatch and alert, the filename then ending in .ndjson);
+        compression is None, 'gzip' or 'zstd' and adds .gz / .zst. Both
+        default to REPORT_JSON_STYLE / REPORT_JSON_COMPRESSION.
+        """
+
+        style = style or settings.REPORT_JSON_STYLE
+        if style not in JSON_STYLES:
+            raise ValueError(f"Unknown JSON report style {style!r}; expected one of {JSON_STYLES}")
+        if compression is None:
+            compression = settings.REPORT_JSON_COMPRESSION or None
+
+        if rows is None:
+            rows = ReportRows.from_comparison(comparison)
 
         # Section 1: Item-Level Comparison
-        item_level_comparison = []
-        for item in comparison.item_level_comparison:
-            item_level_comparison.append({
-                "SKU": item.item_no,
-                "Description": item.description,
-                "Qty_Ordered": item.po_quantity,
-                "Qty_Invoiced": item.invoice_quantity,
-                "Unit_Price_Ordered": round(item.po_unit_price, 2),
-                "Unit_Price_Invoiced": round(item.invoice_unit_price, 2),
-                "Discount_Pct_Ordered": round(item.po_discount_pct, 2),
-                "Discount_Pct_Invoiced": round(item.invoice_discount_pct, 2),
-                "Line_Total_Ordered": round(item.po_line_total, 2),
-                "Line_Total_Invoiced": round(item.invoice_line_total, 2),
-                "Quantity_Discrepancy": item.quantity_discrepancy,
-                "Price_Discrepancy": item.price_discrepancy,
-                "Total_Discrepancy": item.total_discrepancy,
-                "Severity": item.severity,
-                "Reason": item.reason
-            })
+        item_level_comparison = RowStream(JSON_ITEM_COLUMNS, rows.rows(JSON_ITEM_COLUMNS))
 
         # Section 2: Summary Metrics
         metrics = comparison.summary_metrics
@@ -937,7 +1038,7 @@ class EnhancedReportGenerator:
         products_with_mismatches = comparison.products_with_mismatches
 
         # Section 4: Bonus Alerts
-        bonus_alerts = self._generate_bonus_alerts(comparison)
+        bonus_alerts = self._generate_bonus_alerts(comparison, rows)
 
         # Complete report structure
         report = {
@@ -962,17 +1063,29 @@ class EnhancedReportGenerator:
         }
 
         # Write to file
-        output_path = self.output_dir / filename
-        with open(output_path, 'w') as f:
-            json.dump(report, f, indent=2)
+        output_path = report_path(self.output_dir / filename, style, compression)
+        with open_report_file(output_path, compression) as f:
+            if style == 'ndjson':
+                write_ndjson(f, [*report["discrepancy_report"].items(), ("bonus_alerts", bonus_alerts)])
+            else:
+                write_json(f, report, style)
 
         return str(output_path)
 
-    def _generate_bonus_alerts(self, comparison: DocumentComparison) -> List[str]:
+    def _generate_bonus_alerts(
+        self,
+        comparison: DocumentComparison,
+        rows: Optional[ReportRows] = None
+    ) -> List[str]:
         """Generate automated alerts and recommendations"""
         alerts = []
 
         metrics = comparison.summary_metrics
+        if rows is None:
+            rows = ReportRows.from_comparison(comparison)
+        values = rows.arrays
+        skus = rows.columns['SKU']
+        descriptions = rows.columns['Description']
 
         # Alert 1: High-value discrepancy
         total_diff = metrics.grand_total_difference
@@ -988,39 +1101,42 @@ class EnhancedReportGenerator:
             )
 
         # Alert 2: Item-specific alerts
-        for item in comparison.item_level_comparison:
-            if not item.price_discrepancy and not item.quantity_discrepancy:
-                continue
-
-            if item.severity == "CRITICAL" or abs(item.price_diff) > 10:
-                price_change = "increase" if item.price_diff > 0 else "decrease"
-                alerts.append(
-                    f"ALERT: SKU {item.item_no} '{item.description}' has a price {price_change} "
-                    f"of ${abs(item.price_diff):.2f} per unit "
-                    f"(from ${item.po_unit_price:.2f} to ${item.invoice_unit_price:.2f}). "
-                    f"This changes the line total by ${abs(item.total_diff):.2f}."
-                )
+        flagged = (
+            (values['price_discrepancy'] | values['quantity_discrepancy'])
+            & ((values['severity'] == "CRITICAL") | (np.abs(values['price_diff']) > 10))
+        )
+        for i in np.flatnonzero(flagged).tolist():
+            price_diff = float(values['price_diff'][i])
+            price_change = "increase" if price_diff > 0 else "decrease"
+            alerts.append(
+                f"ALERT: SKU {skus[i]} '{descriptions[i]}' has a price {price_change} "
+                f"of ${abs(price_diff):.2f} per unit "
+                f"(from ${float(values['po_unit_price'][i]):.2f} to ${float(values['invoice_unit_price'][i]):.2f}). "
+                f"This changes the line total by ${abs(float(values['total_diff'][i])):.2f}."
+            )
 
         # Alert 3: Calculation error warnings
-        for item in comparison.item_level_comparison:
+        # Only amounts that are not a whole number of 1e-10 can print with more than 10 decimals
+        discount_amounts = values['invoice_discount_amount']
+        long_decimal = (discount_amounts > 0) & (np.round(discount_amounts, 10) != discount_amounts)
+        for i in np.flatnonzero(long_decimal).tolist():
             # Check for suspicious long decimals in discount amounts
-            if item.invoice_discount_amount > 0:
-                decimal_str = str(item.invoice_discount_amount)
-                if '.' in decimal_str and len(decimal_str.split('.')[1]) > 10:
-                    alerts.append(
-                        f"WARNING: The Proforma Invoice for SKU {item.item_no} '{item.description}' "
-                        f"shows an extremely long decimal for Discount Amount ({item.invoice_discount_amount}). "
-                        f"This may indicate a rounding or calculation error in the invoice system."
-                    )
+            amount = float(discount_amounts[i])
+            decimal_str = str(amount)
+            if '.' in decimal_str and len(decimal_str.split('.')[1]) > 10:
+                alerts.append(
+                    f"WARNING: The Proforma Invoice for SKU {skus[i]} '{descriptions[i]}' "
+                    f"shows an extremely long decimal for Discount Amount ({amount}). "
+                    f"This may indicate a rounding or calculation error in the invoice system."
+                )
 
         # Alert 4: Recommendations
-        critical_items = [
-            item for item in comparison.item_level_comparison 
-            if item.severity in ["CRITICAL", "HIGH"] and item.price_discrepancy
-        ]
+        critical_items = np.flatnonzero(
+            np.isin(values['severity'], ["CRITICAL", "HIGH"]) & values['price_discrepancy']
+        )
 
-        if critical_items:
-            sku_list = ", ".join([item.item_no for item in critical_items[:5]])
+        if len(critical_items):
+            sku_list = ", ".join([skus[i] for i in critical_items[:5].tolist()])
             alerts.append(
                 f"RECOMMENDATION: Contact the supplier to clarify pricing discrepancies "
                 f"for SKUs {sku_list} before payment. "
@@ -1028,153 +1144,218 @@ class EnhancedReportGenerator:
             )
 
         # Alert 5: Missing items
-        missing_items = [
-            item for item in comparison.item_level_comparison 
-            if item.status == "MISSING_FROM_INVOICE"
-        ]
+        missing_items = int(np.count_nonzero(values['status'] == "MISSING_FROM_INVOICE"))
 
         if missing_items:
             alerts.append(
-                f"CRITICAL: {len(missing_items)} item(s) from the Purchase Order are missing "
+                f"CRITICAL: {missing_items} item(s) from the Purchase Order are missing "
                 f"in the Invoice. Review delivery documentation."
             )
 
         return alerts
 
     def generate_csv_report(
-        self, 
-        comparison: DocumentComparison,
-        filename: str = "item_comparison.csv"
+        self,
+        comparison: Union[DocumentComparison, ComparisonStream],
+        filename: str = "item_comparison.csv",
+        rows: Optional[ReportRows] = None
     ) -> str:
-        """Generate CSV report for Excel analysis"""
+        """Generate CSV report for Excel analysis
+
+        Given a ComparisonStream, rows are written as the stream produces
+        them, so the file fills while the comparison is still running.
+        """
+
+        if rows is not None:
+            batches = [rows]
+        elif isinstance(comparison, ComparisonStream):
+            batches = (ReportRows.from_table(chunk) for chunk in comparison.chunks())
+        else:
+            batches = [ReportRows.from_comparison(comparison)]
 
         output_path = self.output_dir / filename
 
         with open(output_path, 'w', newline='') as f:
-            fieldnames = [
-                'SKU', 'Description',
-                'Qty_Ordered', 'Qty_Invoiced', 'Qty_Diff',
-                'Unit_Price_Ordered', 'Unit_Price_Invoiced', 'Price_Diff',
-                'Discount_Pct_Ordered', 'Discount_Pct_Invoiced',
-                'Line_Total_Ordered', 'Line_Total_Invoiced', 'Total_Diff',
-                'Quantity_Discrepancy', 'Price_Discrepancy', 'Total_Discrepancy',
-                'Severity', 'Reason'
-            ]
-
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for item in comparison.item_level_comparison:
-                writer.writerow({
-                    'SKU': item.item_no,
-                    'Description': item.description,
-                    'Qty_Ordered': item.po_quantity,
-                    'Qty_Invoiced': item.invoice_quantity,
-                    'Qty_Diff': round(item.quantity_diff, 2),
-                    'Unit_Price_Ordered': round(item.po_unit_price, 2),
-                    'Unit_Price_Invoiced': round(item.invoice_unit_price, 2),
-                    'Price_Diff': round(item.price_diff, 2),
-                    'Discount_Pct_Ordered': round(item.po_discount_pct, 2),
-                    'Discount_Pct_Invoiced': round(item.invoice_discount_pct, 2),
-                    'Line_Total_Ordered': round(item.po_line_total, 2),
-                    'Line_Total_Invoiced': round(item.invoice_line_total, 2),
-                    'Total_Diff': round(item.total_diff, 2),
-                    'Quantity_Discrepancy': item.quantity_discrepancy,
-                    'Price_Discrepancy': item.price_discrepancy,
-                    'Total_Discrepancy': item.total_discrepancy,
-                    'Severity': item.severity,
-                    'Reason': item.reason
-                })
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            for batch in batches:
+                writer.writerows(batch.rows(CSV_COLUMNS))
 
         return str(output_path)
 
     def generate_excel_report(
         self,
         comparison: DocumentComparison,
-        filename: str = "detailed_comparison.xlsx"
+        filename: str = "detailed_comparison.xlsx",
+        rows: Optional[ReportRows] = None,
+        fast: Optional[bool] = None
     ) -> str:
-        """Generate Excel report with multiple sheets"""
+        """Generate Excel report with multiple sheets
+
+        With fast (default REPORT_EXCEL_FAST_EXPORT) rows are streamed into a
+        write-only openpyxl workbook instead of going through pandas
+        DataFrames, so memory stays flat however many items there are. The
+        sheets hold the same values either way.
+        """
+
+        if rows is None:
+            rows = ReportRows.from_comparison(comparison)
+        if fast is None:
+            fast = settings.REPORT_EXCEL_FAST_EXPORT
 
         output_path = self.output_dir / filename
 
+        # Sheet 1: Summary
+        metrics = comparison.summary_metrics
+        summary_data = {
+            'Metric': ['Subtotal', 'Discounts', 'Taxable Amount', 'Tax', 'Grand Total'],
+            'Purchase_Order': [
+                round(metrics.subtotal_po, 2),
+                round(metrics.discounts_po, 2),
+                round(metrics.taxable_amount_po, 2),
+                round(metrics.tax_po, 2),
+                round(metrics.grand_total_po, 2)
+            ],
+            'Proforma_Invoice': [
+                round(metrics.subtotal_pi, 2),
+                round(metrics.discounts_pi, 2),
+                round(metrics.taxable_amount_pi, 2),
+                round(metrics.tax_pi, 2),
+                round(metrics.grand_total_pi, 2)
+            ],
+            'Difference': [
+                round(metrics.subtotal_difference, 2),
+                round(metrics.discounts_difference, 2),
+                round(metrics.taxable_difference, 2),
+                round(metrics.tax_difference, 2),
+                round(metrics.grand_total_difference, 2)
+            ]
+        }
+
+        # Sheet 3 only lists items with a discrepancy
+        discrepant = rows.arrays['severity'] != 'NONE'
+
+        if fast:
+            self._write_excel_streaming(output_path, summary_data, rows, discrepant)
+            return str(output_path)
+
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # Sheet 1: Summary
-            metrics = comparison.summary_metrics
-            summary_data = {
-                'Metric': ['Subtotal', 'Discounts', 'Taxable Amount', 'Tax', 'Grand Total'],
-                'Purchase_Order': [
-                    round(metrics.subtotal_po, 2),
-                    round(metrics.discounts_po, 2),
-                    round(metrics.taxable_amount_po, 2),
-                    round(metrics.tax_po, 2),
-                    round(metrics.grand_total_po, 2)
-                ],
-                'Proforma_Invoice': [
-                    round(metrics.subtotal_pi, 2),
-                    round(metrics.discounts_pi, 2),
-                    round(metrics.taxable_amount_pi, 2),
-                    round(metrics.tax_pi, 2),
-                    round(metrics.grand_total_pi, 2)
-                ],
-                'Difference': [
-                    round(metrics.subtotal_difference, 2),
-                    round(metrics.discounts_difference, 2),
-                    round(metrics.taxable_difference, 2),
-                    round(metrics.tax_difference, 2),
-                    round(metrics.grand_total_difference, 2)
-                ]
-            }
             summary_df = pd.DataFrame(summary_data)
             summary_df.to_excel(writer, sheet_name='Summary', index=False)
 
             # Sheet 2: Item Comparison
-            item_data = []
-            for item in comparison.item_level_comparison:
-                item_data.append({
-                    'SKU': item.item_no,
-                    'Description': item.description,
-                    'PO_Qty': item.po_quantity,
-                    'Invoice_Qty': item.invoice_quantity,
-                    'Qty_Match': "✓" if not item.quantity_discrepancy else "✗",
-                    'PO_Price': round(item.po_unit_price, 2),
-                    'Invoice_Price': round(item.invoice_unit_price, 2),
-                    'Price_Match': "✓" if not item.price_discrepancy else "✗",
-                    'PO_Total': round(item.po_line_total, 2),
-                    'Invoice_Total': round(item.invoice_line_total, 2),
-                    'Total_Diff': round(item.total_diff, 2),
-                    'Severity': item.severity,
-                    'Status': item.reason
-                })
-
-            items_df = pd.DataFrame(item_data)
+            item_data = {header: rows.columns[label] for header, label in EXCEL_ITEM_COLUMNS}
+
+            items_df = pd.DataFrame(item_data) if len(rows) else pd.DataFrame()
             items_df.to_excel(writer, sheet_name='Item Comparison', index=False)
 
             # Sheet 3: Discrepancies Only
-            discrepancy_data = [
-                item_dict for item_dict in item_data 
-                if item_dict['Severity'] != 'NONE'
-            ]
-
-            if discrepancy_data:
-                disc_df = pd.DataFrame(discrepancy_data)
+            if discrepant.any():
+                disc_df = items_df[discrepant]
                 disc_df.to_excel(writer, sheet_name='Discrepancies', index=False)
 
         return str(output_path)
 
+    def _write_excel_streaming(
+        self,
+        output_path: Path,
+        summary_data: Dict[str, List[Any]],
+        rows: ReportRows,
+        discrepant: np.ndarray
+    ):
+        """The Excel report through a write-only workbook, one row at a time"""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+
+        def write_sheet(title: str, headers, values):
+            sheet = workbook.create_sheet(title)
+            sheet.append(list(headers))
+            for row in values:
+                sheet.append(row)
+
+        write_sheet('Summary', summary_data, zip(*summary_data.values()))
+
+        headers = [header for header, _ in EXCEL_ITEM_COLUMNS]
+        labels = [label for _, label in EXCEL_ITEM_COLUMNS]
+        if len(rows):
+            write_sheet('Item Comparison', headers, rows.rows(labels))
+        else:
+            workbook.create_sheet('Item Comparison')
+
+        if discrepant.any():
+            # Every item is listed: reuse the item rows rather than filtering them
+            mask = None if discrepant.all() else discrepant
+            write_sheet('Discrepancies', headers, rows.rows(labels, mask))
+
+        workbook.save(output_path)
+
+    def generate_columnar_report(
+        self,
+        comparison: DocumentComparison,
+        filename: str = "item_comparison",
+        fmt: Optional[str] = None
+    ) -> str:
+        """Generate typed Parquet / Arrow IPC tables of the item comparison
+
+        Writes <filename>__<po_id>__<invoice_id>.parquet (or .arrow) with
+        every item field in its native type, and
+        summary_metrics__<po_id>__<invoice_id>.parquet beside it with the
+        document totals, so downstream jobs and DuckDB read results without
+        parsing. Both files are named after the pair, so comparisons written
+        to one directory do not overwrite each other's.
+        fmt defaults to REPORT_COLUMNAR_FORMAT.
+        """
+
+        fmt = fmt or settings.REPORT_COLUMNAR_FORMAT or 'parquet'
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format {fmt!r}; expected one of {sorted(COLUMNAR_FORMATS)}")
+        suffix = COLUMNAR_FORMATS[fmt]
+        stem = pair_file_stem(comparison)
+
+        items_path, _ = write_comparison(
+            comparison,
+            self.output_dir / f"{filename}__{stem}{suffix}",
+            self.output_dir / f"summary_metrics__{stem}{suffix}",
+            fmt
+        )
+        return str(items_path)
+
+    def append_to_dataset(
+        self,
+        comparison: DocumentComparison,
+        dataset_dir: Optional[Path] = None,
+        fmt: Optional[str] = None
+    ) -> str:
+        """Add this comparison to the date-partitioned dataset (default REPORT_DATASET_DIR)"""
+
+        items_path, _ = append_to_dataset(
+            comparison,
+            dataset_dir or settings.REPORT_DATASET_DIR,
+            fmt or settings.REPORT_COLUMNAR_FORMAT or 'parquet'
+        )
+        return str(items_path)
+
 def generate_all_reports(
     comparison: DocumentComparison,
     output_dir: Path,
     po_doc: ExtractedDocument = None,
-    invoice_doc: ExtractedDocument = None
+    invoice_doc: ExtractedDocument = None,
+    max_workers: Optional[int] = None,
+    timings: Optional[Dict[str, float]] = None
 ) -> Dict[str, str]:
-    """Generate all report formats"""
+    """Generate all report formats
+
+    The writers run concurrently over one shared row projection (see
+    EnhancedReportGenerator.generate_reports). Pass a dict as timings to
+    have it filled with the seconds spent on the projection ('rows') and on
+    each format.
+    """
 
     generator = EnhancedReportGenerator(output_dir)
+    reports = generator.generate_reports(comparison, max_workers=max_workers)
 
-    reports = {
-        'json': generator.generate_complete_json_report(comparison),
-        'csv': generator.generate_csv_report(comparison),
-        'excel': generator.generate_excel_report(comparison)
-    }
+    if timings is not None:
+        timings.update(generator.timings)
 
     return reports
@@ -0,0 +1,140 @@
+"""
+Row projection shared by the report writers.
+
+ReportRows is built once per comparison and holds, column by column, every
+item-level value the JSON, CSV and Excel reports print (rounded to 2 places
+where the reports round, plus Excel's match marks) as plain Python lists,
+and the raw arrays the bonus alerts select rows from. An ItemComparisonTable is projected with array
+operations; a per-item list is walked once. Values are exactly those the
+writers used to build item by item, including the int 0 on the side a line
+is missing from.
+"""
+
+from itertools import compress
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.comparator import DocumentComparison, ItemComparisonTable, ItemDiscrepancy
+
+# (report column, ItemDiscrepancy field, rounded to 2 places)
+REPORT_COLUMNS: Tuple[Tuple[str, str, bool], ...] = (
+    ('SKU', 'item_no', False),
+    ('Description', 'description', False),
+    ('Qty_Ordered', 'po_quantity', False),
+    ('Qty_Invoiced', 'invoice_quantity', False),
+    ('Qty_Diff', 'quantity_diff', True),
+    ('Unit_Price_Ordered', 'po_unit_price', True),
+    ('Unit_Price_Invoiced', 'invoice_unit_price', True),
+    ('Price_Diff', 'price_diff', True),
+    ('Discount_Pct_Ordered', 'po_discount_pct', True),
+    ('Discount_Pct_Invoiced', 'invoice_discount_pct', True),
+    ('Line_Total_Ordered', 'po_line_total', True),
+    ('Line_Total_Invoiced', 'invoice_line_total', True),
+    ('Total_Diff', 'total_diff', True),
+    ('Quantity_Discrepancy', 'quantity_discrepancy', False),
+    ('Price_Discrepancy', 'price_discrepancy', False),
+    ('Total_Discrepancy', 'total_discrepancy', False),
+    ('Severity', 'severity', False),
+    ('Reason', 'reason', False),
+)
+
+# The Excel ✓ / ✗ columns, derived from the discrepancy flags
+MATCH_MARKS = {False: "✓", True: "✗"}
+_MARK_COLUMNS = (('Qty_Match', 'Quantity_Discrepancy'), ('Price_Match', 'Price_Discrepancy'))
+
+# Unrounded fields the bonus alerts filter and quote
+ALERT_FIELDS = (
+    'price_diff', 'total_diff', 'po_unit_price', 'invoice_unit_price', 'invoice_discount_amount',
+    'quantity_discrepancy', 'price_discrepancy', 'severity', 'status',
+)
+
+
+def round2(values: np.ndarray) -> np.ndarray:
+    """round(x, 2) of every value, identical to Python's round"""
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 100
+    rounded = np.round(scaled) / 100
+    # x * 100 can land on the wrong side of a .5 tie, and past 2**52 it is no
+    # longer exact; Python's correctly rounded round() settles those rows
+    with np.errstate(invalid='ignore'):
+        recheck = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+    recheck |= np.abs(scaled) >= 2.0 ** 52
+    for index in np.flatnonzero(recheck).tolist():
+        rounded[index] = round(float(values[index]), 2)
+    return rounded
+
+
+class ReportRows:
+    """Item-level report columns for one comparison, shared by every writer"""
+
+    def __init__(self, columns: Dict[str, list], arrays: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.arrays = arrays
+        for label, flag in _MARK_COLUMNS:
+            if label not in columns:
+                columns[label] = [MATCH_MARKS[value] for value in columns[flag]]
+
+    @classmethod
+    def from_comparison(cls, comparison: DocumentComparison) -> "ReportRows":
+        return cls.from_items(comparison.item_level_comparison)
+
+    @classmethod
+    def from_items(cls, items: Iterable[ItemDiscrepancy]) -> "ReportRows":
+        if isinstance(items, ItemComparisonTable):
+            return cls.from_table(items)
+
+        items = list(items)
+        columns = {}
+        for label, field, rounded in REPORT_COLUMNS:
+            values = [getattr(item, field) for item in items]
+            columns[label] = [round(value, 2) for value in values] if rounded else values
+
+        arrays = {}
+        for field in ALERT_FIELDS:
+            values = [getattr(item, field) for item in items]
+            if field in ('severity', 'status'):
+                arrays[field] = np.array(values, dtype=object)
+            elif field.endswith('_discrepancy'):
+                arrays[field] = np.array(values, dtype=bool)
+            else:
+                arrays[field] = np.array(values, dtype=np.float64)
+        return cls(columns, arrays)
+
+    @classmethod
+    def from_table(cls, table: ItemComparisonTable) -> "ReportRows":
+        stored = table.to_columns()
+        # Rows whose PO / invoice side is absent, where the records read int 0
+        absent = {'po': np.flatnonzero(~stored['has_po']), 'invoice': np.flatnonzero(~stored['has_invoice'])}
+
+        columns = {}
+        for label, field, rounded in REPORT_COLUMNS:
+            values = table.column(field)
+            if values.dtype.kind in 'fi':
+                values = (round2(values) if rounded else values.astype(np.float64)).tolist()
+                side = field.split('_', 1)[0]
+                for index in absent.get(side, np.empty(0, dtype=np.int64)).tolist():
+                    values[index] = 0
+            else:
+                values = values.tolist()
+            columns[label] = values
+
+        arrays = {}
+        for field in ALERT_FIELDS:
+            values = table.column(field)
+            side = field.split('_', 1)[0]
+            if side in absent and len(absent[side]):
+                values = values.astype(np.float64)
+                values[absent[side]] = 0.0
+            arrays[field] = values
+        return cls(columns, arrays)
+
+    def __len__(self) -> int:
+        return len(self.columns['SKU'])
+
+    def rows(self, labels: Sequence[str], mask: Optional[np.ndarray] = None) -> Iterator[tuple]:
+        """Tuples of the given columns, one per item (or per item in mask)"""
+        rows = zip(*(self.columns[label] for label in labels))
+        if mask is None:
+            return rows
+        return compress(rows, mask.tolist())
@@ -0,0 +1,74 @@
+"""
+pdfplumber table strategies for PDFExtractor's adaptive mode.
+
+TABLE_STRATEGIES lists the settings diagnose_extraction.py probes, cheapest
+first: ruling lines only, then text-aligned columns between ruled rows, then
+pure text alignment. A TableStrategyMemo remembers which one produced line
+items for each supplier (or, without a vendor name, each page layout), so
+later documents from that supplier go straight to the winning strategy.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config import settings
+
+# (name, pdfplumber table_settings); None means pdfplumber's defaults
+TABLE_STRATEGIES = (
+    ('lines', None),
+    ('text_columns', {"vertical_strategy": "text", "horizontal_strategy": "lines"}),
+    ('text', {"vertical_strategy": "text", "horizontal_strategy": "text"}),
+)
+
+
+class TableStrategyMemo:
+    """Winning table strategy per supplier/layout fingerprint, optionally kept in a JSON file"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._winners: Dict[str, str] = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        return self._winners.get(fingerprint)
+
+    def set(self, fingerprint: str, strategy: str):
+        if self._winners.get(fingerprint) == strategy:
+            return
+        self._winners[fingerprint] = strategy
+        if self.path is None:
+            return
+
+        # Merge with entries written meanwhile (e.g. by other worker processes)
+        winners = self._load()
+        winners[fingerprint] = strategy
+        self._winners.update(winners)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._winners, f, indent=2, sort_keys=True)
+            os.replace(tmp_name, self.path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def __len__(self) -> int:
+        return len(self._winners)
+
+
+def get_table_strategy_memo() -> Optional[TableStrategyMemo]:
+    """Memo configured from settings, or None when ADAPTIVE_TABLE_STRATEGIES is off"""
+    if not settings.ADAPTIVE_TABLE_STRATEGIES:
+        return None
+    return TableStrategyMemo(settings.TABLE_STRATEGY_MEMO_PATH)
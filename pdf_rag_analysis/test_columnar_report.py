@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+import sys
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItem, LineItemTable
+from src.comparator import EnhancedDocumentComparator, ITEM_DISCREPANCY_FIELDS
+from src.columnar_report import append_to_dataset, item_comparison_table, pair_file_stem, write_comparison
+from src.report_generator import EnhancedReportGenerator, generate_all_reports
+
+
+def make_pair(po_id="PO-1", invoice_id="PI-1", invoiced_quantity=6):
+    def document(doc_type, document_id, items):
+        total = sum(item.total_price for item in items)
+        metadata = DocumentMetadata(doc_type, document_id, "2025-12-12", "Acme", "Buyer")
+        return ExtractedDocument(metadata, LineItemTable.from_items(items), subtotal=total, total=total)
+
+    po = document("PURCHASE_ORDER", po_id, [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", 5, 7.5, discount_pct=10),
+    ])
+    invoice = document("PROFORMA_INVOICE", invoice_id, [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", invoiced_quantity, 7.5, discount_pct=10),
+        LineItem("C-3", "Sprocket", "pcs", 1, 99.0),
+    ])
+    return po, invoice
+
+
+def read(path):
+    if path.suffix == ".parquet":
+        return pq.read_table(path)
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def test_both_engines_give_the_same_table():
+    po, invoice = make_pair()
+    vectorized = item_comparison_table(EnhancedDocumentComparator(vectorized=True).compare(po, invoice))
+    per_item = item_comparison_table(EnhancedDocumentComparator(vectorized=False).compare(po, invoice))
+    assert vectorized.column_names == ['po_id', 'invoice_id', *ITEM_DISCREPANCY_FIELDS]
+    assert vectorized.to_pylist() == per_item.to_pylist()
+    assert pa.types.is_dictionary(vectorized.schema.field('status').type)
+    assert pa.types.is_boolean(vectorized.schema.field('quantity_discrepancy').type)
+
+
+def test_written_files_round_trip(tmp_path):
+    po, invoice = make_pair()
+    comparison = EnhancedDocumentComparator().compare(po, invoice)
+    expected = [asdict(item) for item in comparison.item_level_comparison]
+    for fmt, suffix in (('parquet', '.parquet'), ('arrow', '.arrow')):
+        items_path, summary_path = write_comparison(
+            comparison, tmp_path / f"items{suffix}", tmp_path / f"summary{suffix}", fmt
+        )
+        rows = read(items_path).to_pylist()
+        assert [{name: row[name] for name in ITEM_DISCREPANCY_FIELDS} for row in rows] == expected
+        assert {row['po_id'] for row in rows} == {"PO-1"}
+        summary = read(summary_path).to_pylist()
+        assert len(summary) == 1
+        assert summary[0]['discrepant_items'] == comparison.discrepant_items
+        assert summary[0]['grand_total_difference'] == comparison.summary_metrics.grand_total_difference
+
+
+def test_different_pairs_do_not_overwrite(tmp_path):
+    generator = EnhancedReportGenerator(tmp_path)
+    first = EnhancedDocumentComparator().compare(*make_pair("PO-1", "PI-1"))
+    second = EnhancedDocumentComparator().compare(*make_pair("PO/2", "PI 2", invoiced_quantity=5))
+    first_items = Path(generator.generate_columnar_report(first, fmt='parquet'))
+    second_items = Path(generator.generate_columnar_report(second, fmt='parquet'))
+
+    assert pair_file_stem(second) == "PO_2__PI_2"
+    assert first_items.name == "item_comparison__PO-1__PI-1.parquet"
+    assert second_items.name == "item_comparison__PO_2__PI_2.parquet"
+    assert set(read(first_items).column('po_id').to_pylist()) == {"PO-1"}
+    assert set(read(second_items).column('po_id').to_pylist()) == {"PO/2"}
+    summaries = sorted(path.name for path in tmp_path.glob("summary_metrics*.parquet"))
+    assert summaries == ["summary_metrics__PO-1__PI-1.parquet", "summary_metrics__PO_2__PI_2.parquet"]
+    assert read(tmp_path / "summary_metrics__PO-1__PI-1.parquet").column('po_id').to_pylist() == ["PO-1"]
+
+
+def test_dataset_rerun_replaces_the_pair(tmp_path):
+    po, invoice = make_pair()
+    day = date(2025, 12, 12)
+    first = append_to_dataset(EnhancedDocumentComparator().compare(po, invoice), tmp_path, partition_date=day)
+    po, invoice = make_pair(invoiced_quantity=5)
+    second = append_to_dataset(EnhancedDocumentComparator().compare(po, invoice), tmp_path, partition_date=day)
+    assert first == second
+    assert first[0] == tmp_path / "item_comparison" / "date=2025-12-12" / "PO-1__PI-1.parquet"
+    assert len(list(tmp_path.rglob("*.parquet"))) == 2
+    assert 5.0 in read(second[0]).column('invoice_quantity').to_pylist()
+
+
+def test_generate_all_reports_returns_every_written_format(tmp_path):
+    po, invoice = make_pair()
+    comparison = EnhancedDocumentComparator().compare(po, invoice)
+    timings = {}
+    reports = generate_all_reports(comparison, tmp_path, po, invoice, timings=timings)
+    assert set(reports) == {'json', 'csv', 'excel', 'parquet'}
+    assert all(Path(path).exists() for path in reports.values())
+    assert set(timings) == {'rows', *reports}
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            if test.__code__.co_argcount:
+                with tempfile.TemporaryDirectory() as tmp:
+                    test(Path(tmp))
+            else:
+                test()
+            print(f"[OK] {name}")
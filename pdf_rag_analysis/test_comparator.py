@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+import random
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItem, LineItemTable
+from src.comparator import EnhancedDocumentComparator, ItemComparisonTable, stream_po_with_invoice
+
+DESCRIPTIONS = ["Steel bolt M8", "Hex nut M8", "Flat washer M8", "Spring washer", "Cable tie 200mm",
+                "Cable tie 300mm", "Wall plug", "Wood screw 4x40", "", "Hinge brass"]
+
+
+def make_document(doc_type, document_id, items):
+    metadata = DocumentMetadata(doc_type, document_id, "2025-12-12", "Acme Supplies", "Buyer Ltd")
+    total = sum(item.total_price for item in items)
+    return ExtractedDocument(metadata=metadata, items=LineItemTable.from_items(items), subtotal=total, total=total)
+
+
+def random_pair(seed):
+    """PO/invoice pair with duplicates, missing lines, placeholder SKUs and small variances"""
+    rng = random.Random(seed)
+    po_items = []
+    for _ in range(rng.randint(0, 25)):
+        description = rng.choice(DESCRIPTIONS)
+        sku = rng.choice(["UNKNOWN", f"SKU-{DESCRIPTIONS.index(description)}"])
+        po_items.append(LineItem(sku, description, "pcs", rng.randint(1, 50), rng.choice([0.1, 2.5, 9.99]),
+                                 discount_pct=rng.choice([0, 0, 5])))
+    invoice_items = []
+    for item in po_items:
+        if rng.random() < 0.15:
+            continue
+        quantity = item.quantity + rng.choice([0, 0, 0, 1, -1])
+        price = item.unit_price + rng.choice([0, 0, 0.005, 0.5])
+        invoice_items.append(LineItem(item.item_no, item.description, item.unit, quantity, price,
+                                      discount_pct=item.discount_pct))
+    for _ in range(rng.randint(0, 3)):
+        invoice_items.append(LineItem("UNKNOWN", rng.choice(DESCRIPTIONS) + " extra", "pcs", 1, 1.0))
+    rng.shuffle(invoice_items)
+    return make_document("PURCHASE_ORDER", "PO-1", po_items), make_document("PROFORMA_INVOICE", "PI-1", invoice_items)
+
+
+def flatten(comparison):
+    record = asdict(comparison)
+    record['item_level_comparison'] = [asdict(item) for item in comparison.item_level_comparison]
+    record['products_with_mismatches'] = list(comparison.products_with_mismatches)
+    return record
+
+
+def test_vectorized_matches_per_item_engine():
+    for seed in range(60):
+        po, invoice = random_pair(seed)
+        for match_by in ("sku", "description"):
+            for tolerance in (0.0, 0.01, 1.0):
+                options = dict(match_by=match_by, quantity_tolerance=tolerance, price_tolerance=tolerance)
+                baseline = EnhancedDocumentComparator(vectorized=False, **options).compare(po, invoice)
+                vectorized = EnhancedDocumentComparator(vectorized=True, **options).compare(po, invoice)
+                assert isinstance(vectorized.item_level_comparison, ItemComparisonTable)
+                assert flatten(vectorized) == flatten(baseline), (seed, match_by, tolerance)
+
+
+def test_plain_lists_and_tables_compare_the_same():
+    po, invoice = random_pair(7)
+    as_lists = (
+        ExtractedDocument(po.metadata, list(po.items), subtotal=po.subtotal, total=po.total),
+        ExtractedDocument(invoice.metadata, list(invoice.items), subtotal=invoice.subtotal, total=invoice.total),
+    )
+    for vectorized in (True, False):
+        comparator = EnhancedDocumentComparator(vectorized=vectorized)
+        assert flatten(comparator.compare(*as_lists)) == flatten(comparator.compare(po, invoice))
+
+
+def test_missing_and_extra_lines_are_flagged():
+    po = make_document("PURCHASE_ORDER", "PO-1", [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", 5, 7.5),
+    ])
+    invoice = make_document("PROFORMA_INVOICE", "PI-1", [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("C-3", "Sprocket", "pcs", 1, 99.0),
+    ])
+    for vectorized in (True, False):
+        comparison = EnhancedDocumentComparator(vectorized=vectorized).compare(po, invoice)
+        assert comparison.matching_items == 1
+        assert comparison.discrepant_items == 2
+        assert sorted(entry["SKU"] for entry in comparison.products_with_mismatches) == ["B-2", "C-3"]
+
+
+def test_stream_matches_compare_for_any_chunk_size():
+    for seed in range(20):
+        po, invoice = random_pair(seed)
+        expected = EnhancedDocumentComparator().compare(po, invoice)
+        for chunk_size in (1, 3, 10_000):
+            stream = EnhancedDocumentComparator().stream(po, invoice, chunk_size=chunk_size)
+            assert stream.summary_metrics == expected.summary_metrics
+            chunks = list(stream.chunks())
+            assert all(len(chunk) <= chunk_size for chunk in chunks)
+            assert stream.totals.matching_items == expected.matching_items
+            assert stream.totals.discrepant_items == expected.discrepant_items
+            assert stream.summary_text() == expected.summary_text
+            comparison = stream.to_comparison(ItemComparisonTable.concat(chunks))
+            assert flatten(comparison) == flatten(expected)
+
+
+def test_stream_records_match_compare():
+    po, invoice = random_pair(3)
+    expected = [asdict(item) for item in EnhancedDocumentComparator().compare(po, invoice).item_level_comparison]
+    assert [asdict(item) for item in stream_po_with_invoice(po, invoice, chunk_size=2)] == expected
+
+
+def test_stream_is_consumed_once():
+    po, invoice = random_pair(1)
+    stream = EnhancedDocumentComparator().stream(po, invoice)
+    try:
+        stream.to_comparison()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("to_comparison before consuming should raise")
+
+    list(stream)
+    try:
+        list(stream.chunks())
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("a second pass should raise")
+    # Without the collected chunks only header and totals are filled in
+    comparison = stream.to_comparison()
+    assert comparison.item_level_comparison == [] and comparison.products_with_mismatches == []
+
+
+def test_stream_of_empty_documents():
+    po = make_document("PURCHASE_ORDER", "PO-1", [])
+    invoice = make_document("PROFORMA_INVOICE", "PI-1", [])
+    stream = EnhancedDocumentComparator().stream(po, invoice)
+    chunks = list(stream.chunks())
+    assert len(chunks) == 1 and len(chunks[0]) == 0
+    comparison = stream.to_comparison(ItemComparisonTable.concat(chunks))
+    assert flatten(comparison) == flatten(EnhancedDocumentComparator().compare(po, invoice))
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
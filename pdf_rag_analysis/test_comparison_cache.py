@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItem, LineItemTable
+from src.comparator import EnhancedDocumentComparator, ItemComparisonTable
+from src.comparison_cache import ComparisonCache, comparison_from_bytes, comparison_to_bytes
+
+
+def make_pair():
+    po_items = [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", 5, 7.5, discount_pct=10),
+        LineItem("C-3", "Sprocket", "pcs", 1, 99.0),
+    ]
+    invoice_items = [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", 6, 7.5, discount_pct=10),
+        LineItem("D-4", "Flange", "pcs", 2, 3.0),
+    ]
+
+    def document(doc_type, document_id, items):
+        total = sum(item.total_price for item in items)
+        metadata = DocumentMetadata(doc_type, document_id, "2025-12-12", "Acme", "Buyer")
+        return ExtractedDocument(metadata, LineItemTable.from_items(items), subtotal=total, total=total)
+
+    return document("PURCHASE_ORDER", "PO-1", po_items), document("PROFORMA_INVOICE", "PI-1", invoice_items)
+
+
+def flatten(comparison):
+    record = asdict(comparison)
+    record['item_level_comparison'] = [asdict(item) for item in comparison.item_level_comparison]
+    record['products_with_mismatches'] = list(comparison.products_with_mismatches)
+    return record
+
+
+def test_cached_result_matches_cold():
+    po, invoice = make_pair()
+    for vectorized in (True, False):
+        cold = EnhancedDocumentComparator(vectorized=vectorized).compare(po, invoice)
+        comparator = EnhancedDocumentComparator(vectorized=vectorized, cache=ComparisonCache())
+        first = comparator.compare(po, invoice)
+        cached = comparator.compare(po, invoice)
+        assert comparator.cache.hits == 1
+        assert flatten(first) == flatten(cold)
+        assert flatten(cached) == flatten(cold)
+
+
+def test_engine_is_part_of_the_key():
+    po, invoice = make_pair()
+    cache = ComparisonCache()
+    vectorized = EnhancedDocumentComparator(vectorized=True, cache=cache).compare(po, invoice)
+    per_item = EnhancedDocumentComparator(vectorized=False, cache=cache).compare(po, invoice)
+    assert cache.hits == 0
+    assert isinstance(vectorized.item_level_comparison, ItemComparisonTable)
+    assert isinstance(per_item.item_level_comparison, list)
+    assert flatten(vectorized) == flatten(per_item)
+
+
+def test_callers_cannot_corrupt_cached_results():
+    po, invoice = make_pair()
+    for vectorized in (True, False):
+        comparator = EnhancedDocumentComparator(vectorized=vectorized, cache=ComparisonCache())
+        first = comparator.compare(po, invoice)
+        expected = flatten(first)
+
+        first.discrepant_items = -1
+        first.summary_metrics.grand_total_difference = 1e9
+        if vectorized:
+            first.item_level_comparison.column('po_quantity')[:] = 0
+        else:
+            first.item_level_comparison[0].po_quantity = 0
+            first.products_with_mismatches.clear()
+
+        hit = comparator.compare(po, invoice)
+        assert flatten(hit) == expected
+        hit.summary_metrics.grand_total_difference = -1
+        assert flatten(comparator.compare(po, invoice)) == expected
+
+
+def test_persisted_results_round_trip(tmp_path):
+    po, invoice = make_pair()
+    comparison = EnhancedDocumentComparator().compare(po, invoice)
+    assert flatten(comparison_from_bytes(comparison_to_bytes(comparison))) == flatten(comparison)
+
+    EnhancedDocumentComparator(cache=ComparisonCache(cache_dir=tmp_path)).compare(po, invoice)
+    fresh = EnhancedDocumentComparator(cache=ComparisonCache(cache_dir=tmp_path))
+    assert flatten(fresh.compare(po, invoice)) == flatten(comparison)
+    assert fresh.cache.hits == 1
+
+
+def test_stream_result_is_cached_under_the_array_engine():
+    po, invoice = make_pair()
+    cache = ComparisonCache()
+    comparator = EnhancedDocumentComparator(vectorized=False, cache=cache)
+    stream = comparator.stream(po, invoice, chunk_size=2)
+    streamed = stream.to_comparison(ItemComparisonTable.concat(list(stream.chunks())))
+
+    assert isinstance(comparator.compare(po, invoice).item_level_comparison, list)
+    assert cache.hits == 0
+    vectorized = EnhancedDocumentComparator(vectorized=True, cache=cache).compare(po, invoice)
+    assert cache.hits == 1
+    assert flatten(vectorized) == flatten(streamed)
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            if test.__code__.co_argcount:
+                with tempfile.TemporaryDirectory() as tmp:
+                    test(Path(tmp))
+            else:
+                test()
+            print(f"[OK] {name}")
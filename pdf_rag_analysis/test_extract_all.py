@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import extract_all_pdfs
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def make_folder(tmp_path):
+    for pdf in DATA_DIR.glob("*.pdf"):
+        shutil.copy(pdf, tmp_path / pdf.name)
+    (tmp_path / "broken.pdf").write_bytes(b"%PDF-1.4 not really a pdf")
+    return sorted(pdf.stem for pdf in DATA_DIR.glob("*.pdf"))
+
+
+def test_failed_files_are_reported_serially(tmp_path):
+    good = make_folder(tmp_path)
+    errors = {}
+    documents = extract_all_pdfs(tmp_path, errors=errors)
+    assert sorted(documents) == good
+    assert list(errors) == ["broken"]
+    assert errors["broken"].split(":")[0].endswith(("Error", "Exception"))
+
+
+def test_failed_files_are_reported_in_parallel(tmp_path):
+    good = make_folder(tmp_path)
+    errors = {}
+    documents = extract_all_pdfs(tmp_path, max_workers=2, errors=errors)
+    assert sorted(documents) == good
+    assert list(errors) == ["broken"]
+
+    # Both branches describe the failure the same way
+    serial_errors = {}
+    extract_all_pdfs(tmp_path, errors=serial_errors)
+    assert serial_errors == errors
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            with tempfile.TemporaryDirectory() as tmp:
+                test(Path(tmp))
+            print(f"[OK] {name}")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import PDFExtractor
+from src.extraction_cache import DiskBudget, ExtractionCache, document_from_bytes, document_to_bytes
+
+DATA_DIR = Path(__file__).parent / "data"
+PO_PDF = DATA_DIR / "Purchase_Order_2025-12-12.pdf"
+
+
+def as_record(doc):
+    return {
+        'metadata': asdict(doc.metadata),
+        'items': [item.to_item() if hasattr(item, 'to_item') else item for item in doc.items],
+        'totals': (doc.subtotal, doc.total_discount, doc.taxable_amount, doc.tax, doc.tax_rate, doc.total),
+        'notes': doc.notes,
+        'raw_text': str(doc.raw_text),
+    }
+
+
+def test_cached_extraction_matches_cold(tmp_path):
+    cold = PDFExtractor().extract_pdf(PO_PDF)
+    cache = ExtractionCache(tmp_path)
+    first = PDFExtractor(cache=cache).extract_pdf(PO_PDF)
+    cached = PDFExtractor(cache=cache).extract_pdf(PO_PDF)
+    assert as_record(first) == as_record(cold)
+    assert as_record(cached) == as_record(cold)
+    assert as_record(document_from_bytes(document_to_bytes(cold))) == as_record(cold)
+
+
+def test_page_records_are_reused(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    PDFExtractor(cache=cache).extract_pdf(PO_PDF)
+    # Drop the whole-document entries so only page records can help
+    for path in tmp_path.glob("*.pdfx"):
+        path.unlink()
+    extractor = PDFExtractor(cache=cache)
+    with_pages = extractor.extract_pdf(PO_PDF)
+    assert as_record(with_pages) == as_record(PDFExtractor().extract_pdf(PO_PDF))
+
+
+def test_budget_scans_only_when_over(tmp_path):
+    budget = DiskBudget(tmp_path, (".bin",), max_bytes=1000)
+    scans = []
+    original_scan = budget._scan
+    budget._scan = lambda: scans.append(1) or original_scan()
+
+    for index in range(9):
+        path = tmp_path / f"{index}.bin"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (index, index))
+        budget.wrote(100)
+    # Only the first write lists the directory
+    assert len(scans) == 1
+
+    for index in range(9, 12):
+        path = tmp_path / f"{index}.bin"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (index, index))
+        budget.wrote(100)
+    # The 11th write crossed the budget: one scan evicted down to 90%
+    assert len(scans) == 2
+    remaining = sum(path.stat().st_size for path in tmp_path.glob("*.bin"))
+    assert remaining == 1000
+    assert budget._total == remaining
+    assert not (tmp_path / "0.bin").exists() and not (tmp_path / "1.bin").exists()
+
+
+def test_cache_stays_under_budget(tmp_path):
+    data = PO_PDF.read_bytes()
+    doc = PDFExtractor().extract_pdf(PO_PDF)
+    record_size = len(document_to_bytes(doc))
+    cache = ExtractionCache(tmp_path, max_bytes=record_size * 3)
+    for index in range(10):
+        cache.put(cache.key_for(data + bytes([index])), doc)
+    stored = sum(path.stat().st_size for path in tmp_path.glob("*.pdfx"))
+    assert stored <= record_size * 3
+    assert cache.get(cache.key_for(data + bytes([9]))) is not None
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            with tempfile.TemporaryDirectory() as tmp:
+                test(Path(tmp))
+            print(f"[OK] {name}")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import PDFExtractor
+from src.extraction_profiler import ExtractionProfiler
+
+DATA_DIR = Path(__file__).parent / "data"
+PO_PDF = DATA_DIR / "Purchase_Order_2025-12-12.pdf"
+
+
+def test_allocation_tracking_stops_tracemalloc():
+    assert not tracemalloc.is_tracing()
+    profiler = ExtractionProfiler(track_allocations=True)
+    PDFExtractor(profiler=profiler).extract_pdf(PO_PDF)
+    assert not tracemalloc.is_tracing()
+
+    profile = profiler.profiles[0]
+    assert profile.stages['open'].calls >= 1
+    assert any(stats.peak_bytes > 0 for stats in profile.stages.values())
+    assert 'started_tracing' not in profile.to_dict()
+
+
+def test_existing_tracing_is_left_running():
+    tracemalloc.start()
+    try:
+        profiler = ExtractionProfiler(track_allocations=True)
+        PDFExtractor(profiler=profiler).extract_pdf(PO_PDF)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_failed_extraction_still_stops_tracemalloc():
+    profiler = ExtractionProfiler(track_allocations=True)
+    try:
+        PDFExtractor(profiler=profiler).extract_pdf(b"not a pdf", name="broken.pdf")
+    except Exception:
+        pass
+    assert not tracemalloc.is_tracing()
+    assert profiler.profiles[0].error
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
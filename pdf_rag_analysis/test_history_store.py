@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItem, LineItemTable
+from src.comparator import EnhancedDocumentComparator
+from src.history_store import ReconciliationStore, comparison_id
+
+
+def make_pair(vendor="Acme", po_date="2025-12-12", invoiced_quantity=6, date_found=True):
+    def document(doc_type, document_id, items):
+        total = sum(item.total_price for item in items)
+        metadata = DocumentMetadata(doc_type, document_id, po_date, vendor, "Buyer", date_found=date_found)
+        return ExtractedDocument(metadata, LineItemTable.from_items(items), subtotal=total, total=total)
+
+    po = document("PURCHASE_ORDER", f"PO-{vendor}", [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", 5, 7.5),
+    ])
+    invoice = document("PROFORMA_INVOICE", f"PI-{vendor}", [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", invoiced_quantity, 7.5),
+        LineItem("C-3", "Sprocket", "pcs", 1, 99.0),
+    ])
+    return po, invoice
+
+
+class RecordingConnection:
+    """Forwards to a DuckDB connection, keeping the SQL it was given"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.statements = []
+
+    def execute(self, sql, *args):
+        self.statements.append(sql)
+        return self.connection.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def count(store, table):
+    return int(store.query(f"SELECT count(*) AS n FROM {table}")['n'][0])
+
+
+def record(store, po, invoice, **kwargs):
+    comparator = EnhancedDocumentComparator(**kwargs)
+    return store.record(comparator.compare(po, invoice), po, invoice)
+
+
+def test_record_writes_every_table(tmp_path):
+    po, invoice = make_pair()
+    with ReconciliationStore(tmp_path / "history.duckdb") as store:
+        key = record(store, po, invoice)
+        assert key == comparison_id(po, invoice)
+        assert count(store, "documents") == 2
+        assert count(store, "line_items") == 5
+        # B-2 quantity differs and C-3 is not on the PO
+        rows = store.query("SELECT sku, vendor, doc_date FROM discrepancies ORDER BY sku")
+        assert rows['sku'].tolist() == ["B-2", "C-3"]
+        assert set(rows['vendor']) == {"Acme"}
+        assert rows['doc_date'][0].date() == date(2025, 12, 12)
+
+
+def test_first_record_only_inserts(tmp_path):
+    po, invoice = make_pair()
+    with ReconciliationStore(tmp_path / "history.duckdb") as store:
+        store._connection = RecordingConnection(store._connection)
+        record(store, po, invoice)
+        assert not [sql for sql in store._connection.statements if sql.startswith("DELETE")]
+
+        record(store, po, invoice, quantity_tolerance=50)
+        deletes = [sql for sql in store._connection.statements if sql.startswith("DELETE")]
+        assert deletes and not [sql for sql in deletes if "line_items" in sql]
+
+
+def test_recording_again_replaces_the_pair(tmp_path):
+    po, invoice = make_pair()
+    with ReconciliationStore(tmp_path / "history.duckdb") as store:
+        record(store, po, invoice)
+        # A looser tolerance keeps B-2 discrepant (its line total still differs) for another reason
+        record(store, po, invoice, quantity_tolerance=50)
+        assert count(store, "documents") == 2
+        assert count(store, "line_items") == 5
+        rows = store.query("SELECT sku, reason FROM discrepancies ORDER BY sku")
+        assert rows['sku'].tolist() == ["B-2", "C-3"]
+        assert rows['reason'][0] == "Line total mismatch"
+
+
+def test_placeholder_dates_are_stored_as_null(tmp_path):
+    po, invoice = make_pair(date_found=False)
+    with ReconciliationStore(tmp_path / "history.duckdb") as store:
+        record(store, po, invoice)
+        assert store.query("SELECT doc_date FROM documents")['doc_date'].isna().all()
+
+
+def test_queries(tmp_path):
+    with ReconciliationStore(tmp_path / "history.duckdb") as store:
+        record(store, *make_pair("Acme", "2025-01-10"))
+        record(store, *make_pair("Beta", "2025-03-10", invoiced_quantity=7))
+        record(store, *make_pair("Beta", "2025-03-11", invoiced_quantity=8))
+
+        # Three discrepancies each; B-2's net drift ranks it above the extra C-3 line
+        drift = store.sku_drift()
+        assert drift['sku'].tolist() == ["B-2", "C-3"]
+        assert drift['discrepancies'].tolist() == [3, 3]
+        assert drift['total_diff'][0] == 45.0
+        assert store.sku_drift(vendor="Acme")['comparisons'].tolist() == [1, 1]
+        assert len(store.sku_drift(since=date(2025, 3, 11))) == 2
+
+        summary = store.vendor_summary()
+        assert summary['vendor'].tolist() == ["Beta", "Acme"]
+        assert summary['comparisons'].tolist() == [2, 1]
+        assert summary['discrepancies'].tolist() == [4, 2]
+        assert store.vendor_summary(since=date(2025, 2, 1))['vendor'].tolist() == ["Beta"]
+
+        history = store.document_history("PO-Beta")
+        assert len(history) == 2 and set(history['role']) == {"po"}
+
+
+def test_store_reopens(tmp_path):
+    po, invoice = make_pair()
+    with ReconciliationStore(tmp_path / "history.duckdb") as store:
+        store.record(EnhancedDocumentComparator().compare(po, invoice), po, invoice,
+                     recorded_at=datetime(2025, 12, 13, 9, 0))
+    with ReconciliationStore(tmp_path / "history.duckdb") as store:
+        assert count(store, "documents") == 2
+        assert store.document_history("PO-Acme")['recorded_at'][0] == datetime(2025, 12, 13, 9, 0)
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            with tempfile.TemporaryDirectory() as tmp:
+                test(Path(tmp))
+            print(f"[OK] {name}")
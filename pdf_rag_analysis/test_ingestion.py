@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+import os
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItem, LineItemTable, _extract_pdf_worker
+from src.ingestion import IngestionDaemon
+from src.reconciliation import BatchReconciler
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def make_document(doc_type, document_id, date, vendor, quantity=10):
+    items = [LineItem("A-1", "Widget", "pcs", quantity, 2.0)]
+    metadata = DocumentMetadata(doc_type, document_id, date, vendor, "Buyer Ltd")
+    total = sum(item.total_price for item in items)
+    return ExtractedDocument(metadata=metadata, items=LineItemTable.from_items(items), subtotal=total, total=total)
+
+
+def make_daemon(tmp_path, **kwargs):
+    watch_dir = tmp_path / "watch"
+    watch_dir.mkdir(exist_ok=True)
+    return IngestionDaemon(watch_dir, tmp_path / "reports", poll_interval=0.05, debounce_seconds=0, **kwargs)
+
+
+def test_pairs_like_batch_reconciler(tmp_path):
+    documents = {
+        "PO_a": make_document("PURCHASE_ORDER", "1001", "2025-01-05", "Acme"),
+        "PO_b": make_document("PURCHASE_ORDER", "UNKNOWN", "2025-02-01", "Beta Parts"),
+        "PI_x": make_document("PROFORMA_INVOICE", "UNKNOWN", "2025-02-03", "beta parts"),
+        "PI_y": make_document("PROFORMA_INVOICE", "1001", "2025-01-09", "Acme"),
+    }
+    daemon = make_daemon(tmp_path)
+    for name, doc in documents.items():
+        daemon._add_document(name, doc)
+
+    batch = BatchReconciler(pair_sole_documents=False).pair(documents)
+    assert daemon._compared == {group.po_name: tuple(group.invoice_names) for group in batch.groups}
+    assert sorted(daemon.reports) == ["PO_a", "PO_b"]
+    assert (tmp_path / "reports" / "PO_a").is_dir()
+
+
+def test_late_invoice_recompares_split_shipment(tmp_path):
+    daemon = make_daemon(tmp_path)
+    daemon._add_document("PO_a", make_document("PURCHASE_ORDER", "1001", "2025-01-05", "Acme", quantity=10))
+    daemon._add_document("PI_1", make_document("PROFORMA_INVOICE", "1001", "2025-01-06", "Acme", quantity=4))
+    assert daemon.stats.pairs_compared == 1
+
+    daemon._add_document("PI_2", make_document("PROFORMA_INVOICE", "UNKNOWN", "2025-01-09", "Acme", quantity=6))
+    assert daemon._compared == {"PO_a": ("PI_1", "PI_2")}
+    assert daemon.stats.pairs_compared == 2
+
+    # Unrelated arrivals leave compared groups alone
+    daemon._add_document("PO_b", make_document("PURCHASE_ORDER", "2002", "2025-01-05", "Other"))
+    assert daemon.stats.pairs_compared == 2
+
+
+def test_retained_documents_are_bounded(tmp_path):
+    daemon = make_daemon(tmp_path, max_documents=2)
+    daemon._add_document("PO_a", make_document("PURCHASE_ORDER", "1001", "2025-01-05", "Acme"))
+    daemon._add_document("PI_a", make_document("PROFORMA_INVOICE", "1001", "2025-01-06", "Acme"))
+    daemon._add_document("PO_b", make_document("PURCHASE_ORDER", "2002", "2025-01-05", "Other"))
+    daemon._add_document("PI_b", make_document("PROFORMA_INVOICE", "2002", "2025-01-06", "Other"))
+
+    assert list(daemon._documents) == ["PO_b", "PI_b"]
+    assert daemon.stats.documents_evicted == 2
+    assert "PO_a" not in daemon._compared and "PO_a" not in daemon.reports
+    assert daemon._compared == {"PO_b": ("PI_b",)}
+
+
+def crashing_worker(pdf_path, **kwargs):
+    """Takes the whole worker process down for files named crash*"""
+    if pdf_path.name.startswith("crash"):
+        os._exit(1)
+    return _extract_pdf_worker(pdf_path, **kwargs)
+
+
+def test_broken_pool_resubmits_in_flight_files(tmp_path):
+    daemon = make_daemon(tmp_path, max_workers=2)
+    for pdf in DATA_DIR.glob("*.pdf"):
+        shutil.copy(pdf, daemon.watch_dir / pdf.name)
+    shutil.copy(next(DATA_DIR.glob("*.pdf")), daemon.watch_dir / "crash.pdf")
+    daemon._worker = crashing_worker
+    try:
+        assert daemon.drain(timeout=120)
+    finally:
+        daemon.close()
+
+    assert daemon.stats.pool_restarts >= 1
+    assert daemon.stats.files_failed == 1
+    assert daemon.stats.files_extracted == 2
+    assert daemon.stats.pairs_compared == 1
+    assert not daemon._pending and not daemon._futures
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            with tempfile.TemporaryDirectory() as tmp:
+                test(Path(tmp))
+            print(f"[OK] {name}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItem, LineItemTable
+from src.item_matching import match_line_items, normalise_sku
+from src.comparator import EnhancedDocumentComparator
+
+
+def make_document(doc_type, document_id, items):
+    metadata = DocumentMetadata(doc_type, document_id, "2025-12-12", "Acme Supplies", "Buyer Ltd")
+    return ExtractedDocument(
+        metadata=metadata,
+        items=LineItemTable.from_items(items),
+        subtotal=sum(item.total_price for item in items),
+        total=sum(item.total_price for item in items),
+    )
+
+
+def statuses(comparison):
+    return {item.description: item.status for item in comparison.item_level_comparison}
+
+
+def test_placeholder_sku_is_not_a_key():
+    assert normalise_sku("UNKNOWN") == ""
+    assert normalise_sku(" unknown ") == ""
+    assert normalise_sku("") == ""
+    assert normalise_sku("AB 12") == "ab12"
+    assert normalise_sku("ab-12") == "ab12"
+    assert normalise_sku("AB.12") == "ab12"
+
+
+def test_sku_match_ignores_case_whitespace_and_separators():
+    po = LineItemTable.from_items([LineItem("AB 12", "Widget", "pcs", 1, 5.0)])
+    invoice = LineItemTable.from_items([LineItem("ab-12", "Widget, blue", "pcs", 1, 5.0)])
+    po_rows, invoice_rows = match_line_items(po, invoice, fuzzy_threshold=None)
+    assert po_rows.tolist() == [0]
+    assert invoice_rows.tolist() == [0]
+
+
+def test_reordered_lines_without_skus_match_by_description():
+    po_items = [
+        LineItem("UNKNOWN", "Steel bolt M8", "pcs", 100, 0.25),
+        LineItem("UNKNOWN", "Hex nut M8", "pcs", 100, 0.10),
+        LineItem("UNKNOWN", "Flat washer M8", "pcs", 200, 0.05),
+    ]
+    invoice_items = list(reversed(po_items))
+
+    po_table = LineItemTable.from_items(po_items)
+    invoice_table = LineItemTable.from_items(invoice_items)
+    po_rows, invoice_rows = match_line_items(po_table, invoice_table)
+    assert po_rows.tolist() == [0, 1, 2]
+    assert invoice_rows.tolist() == [2, 1, 0]
+
+    po = make_document("PURCHASE_ORDER", "PO-1", po_items)
+    invoice = make_document("PROFORMA_INVOICE", "PI-1", invoice_items)
+    for vectorized in (True, False):
+        for match_by in ("sku", "description"):
+            comparator = EnhancedDocumentComparator(vectorized=vectorized, match_by=match_by)
+            comparison = comparator.compare(po, invoice)
+            assert set(statuses(comparison).values()) == {"MATCH"}, (vectorized, match_by)
+            assert comparison.discrepant_items == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
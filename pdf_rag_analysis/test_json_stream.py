@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+import gzip
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import DocumentMetadata, ExtractedDocument, LineItem, LineItemTable
+from src.comparator import EnhancedDocumentComparator
+from src.json_stream import (
+    HAS_ZSTANDARD, RowStream, open_report_file, report_path, write_json, write_ndjson
+)
+from src.report_generator import EnhancedReportGenerator
+
+LABELS = ("SKU", "Qty", "Price", "Match", "Note")
+ROWS = [
+    ("A-1", 10, 2.5, True, None),
+    ("B-2 \"quoted\"", 0, -0.0, False, "café ✓"),
+    ("C-3", -4, 1e-7, True, "tab\there"),
+    ("", 2 ** 40, 123456789.125, False, ""),
+]
+
+
+def sample_report(rows=ROWS, labels=LABELS):
+    return {
+        "discrepancy_report": {
+            "metadata": {"po_id": "PO-1", "count": len(rows), "ratio": 0.1, "ok": True, "missing": None},
+            "items": RowStream(labels, iter(rows)),
+            "empty_dict": {},
+            "empty_list": [],
+            "nested": [{"a": [1, 2, {"b": []}]}, "text", 3.0, [[], {}]],
+            "non_finite": [float("nan"), float("inf"), float("-inf")],
+        }
+    }
+
+
+def plain(report):
+    """The same report with every RowStream materialised as a list of dicts"""
+    if isinstance(report, RowStream):
+        return [dict(zip(report.labels, row)) for row in report.rows]
+    if isinstance(report, dict):
+        return {key: plain(value) for key, value in report.items()}
+    if isinstance(report, list):
+        return [plain(value) for value in report]
+    return report
+
+
+def streamed(report, style):
+    out = io.StringIO()
+    write_json(out, report, style)
+    return out.getvalue()
+
+
+def test_pretty_matches_json_dump():
+    expected = io.StringIO()
+    json.dump(plain(sample_report()), expected, indent=2)
+    assert streamed(sample_report(), 'pretty') == expected.getvalue()
+
+
+def test_compact_matches_json_dump():
+    expected = json.dumps(plain(sample_report()), separators=(',', ':'))
+    assert streamed(sample_report(), 'compact') == expected
+
+
+def test_large_and_empty_row_streams():
+    rows = [(f"SKU-{i}", i, i / 3, i % 2 == 0, None) for i in range(1300)]
+    for style, dump in (('pretty', dict(indent=2)), ('compact', dict(separators=(',', ':')))):
+        assert streamed(sample_report(rows), style) == json.dumps(plain(sample_report(rows)), **dump)
+        assert streamed(sample_report([]), style) == json.dumps(plain(sample_report([])), **dump)
+        assert streamed(sample_report([(), ()], ()), style) == \
+            json.dumps(plain(sample_report([(), ()], ())), **dump)
+
+
+def test_unknown_style_and_types_are_rejected():
+    for call in (lambda: write_json(io.StringIO(), {}, 'ndjson'),
+                 lambda: streamed({"when": object()}, 'pretty')):
+        try:
+            call()
+        except (ValueError, TypeError):
+            pass
+        else:
+            raise AssertionError("expected an error")
+
+
+def test_ndjson_sections():
+    out = io.StringIO()
+    write_ndjson(out, [
+        ("metadata", {"po_id": "PO-1"}),
+        ("items", RowStream(LABELS, iter(ROWS))),
+        ("alerts", ["late", {"level": "HIGH"}]),
+        ("count", 4),
+    ])
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert out.getvalue().endswith("\n")
+    assert lines[0] == {"section": "metadata", "po_id": "PO-1"}
+    assert lines[1:5] == [{"section": "items", **dict(zip(LABELS, row))} for row in ROWS]
+    assert lines[5:] == [
+        {"section": "alerts", "value": "late"},
+        {"section": "alerts", "level": "HIGH"},
+        {"section": "count", "value": 4},
+    ]
+
+
+def test_report_path_suffixes():
+    assert report_path(Path("r.json")) == Path("r.json")
+    assert report_path(Path("r.json"), 'ndjson') == Path("r.ndjson")
+    assert report_path(Path("r.json"), 'pretty', 'gzip') == Path("r.json.gz")
+    assert report_path(Path("r.json"), 'ndjson', 'zstd') == Path("r.ndjson.zst")
+
+
+def make_comparison():
+    def document(doc_type, document_id, items):
+        total = sum(item.total_price for item in items)
+        metadata = DocumentMetadata(doc_type, document_id, "2025-12-12", "Acme", "Buyer")
+        return ExtractedDocument(metadata, LineItemTable.from_items(items), subtotal=total, total=total)
+
+    po = document("PURCHASE_ORDER", "PO-1", [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", 5, 7.5),
+    ])
+    invoice = document("PROFORMA_INVOICE", "PI-1", [
+        LineItem("A-1", "Widget", "pcs", 10, 2.0),
+        LineItem("B-2", "Gadget", "pcs", 6, 7.5),
+    ])
+    return EnhancedDocumentComparator().compare(po, invoice)
+
+
+def load(path):
+    if path.suffix == ".gz":
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    if path.suffix == ".zst":
+        import zstandard
+        with zstandard.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+    return path.read_text()
+
+
+def test_report_styles_carry_the_same_items(tmp_path):
+    comparison = make_comparison()
+    generator = EnhancedReportGenerator(tmp_path)
+    compressions = [None, 'gzip'] + (['zstd'] if HAS_ZSTANDARD else [])
+
+    for compression in compressions:
+        pretty = Path(generator.generate_complete_json_report(comparison, style='pretty', compression=compression))
+        compact = Path(generator.generate_complete_json_report(comparison, style='compact', compression=compression))
+        ndjson = Path(generator.generate_complete_json_report(comparison, style='ndjson', compression=compression))
+        assert pretty == compact and pretty == report_path(tmp_path / "discrepancy_report.json", 'pretty', compression)
+        assert ndjson == report_path(tmp_path / "discrepancy_report.json", 'ndjson', compression)
+
+        report = json.loads(load(pretty))['discrepancy_report']
+        items = report['item_level_comparison']
+        assert len(items) == 2
+        lines = [json.loads(line) for line in load(ndjson).splitlines()]
+        ndjson_items = [line for line in lines if line['section'] == 'item_level_comparison']
+        assert [{k: v for k, v in line.items() if k != 'section'} for line in ndjson_items] == items
+
+
+def test_zstd_needs_zstandard(tmp_path):
+    if HAS_ZSTANDARD:
+        with open_report_file(tmp_path / "r.json.zst", 'zstd') as f:
+            write_json(f, sample_report(), 'compact')
+        assert load(tmp_path / "r.json.zst") == json.dumps(plain(sample_report()), separators=(',', ':'))
+        return
+    try:
+        open_report_file(tmp_path / "r.json.zst", 'zstd')
+    except ImportError:
+        pass
+    else:
+        raise AssertionError("zstd without zstandard should raise ImportError")
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            if test.__code__.co_argcount:
+                with tempfile.TemporaryDirectory() as tmp:
+                    test(Path(tmp))
+            else:
+                test()
+            print(f"[OK] {name}")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import PDFParseSession
+
+
+def build_pdf(form_content: bytes, nested_content: bytes = b"0 0 m 5 5 l S") -> bytes:
+    """One page drawing form /Fm0, which draws the nested form /Fm1"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] /Contents 4 0 R "
+        b"/Resources << /XObject << /Fm0 5 0 R >> >> >>",
+        b"q /Fm0 Do Q",
+        b"<< /Type /XObject /Subtype /Form /BBox [0 0 100 100] "
+        b"/Resources << /XObject << /Fm1 6 0 R >> >> >>",
+        b"<< /Type /XObject /Subtype /Form /BBox [0 0 10 10] >>",
+    ]
+    streams = {4: objects[3], 5: form_content, 6: nested_content}
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        if number in streams:
+            data = streams[number]
+            dictionary = body if number != 4 else b"<<>>"
+            dictionary = dictionary[:-2].rstrip() + b" /Length %d >>" % len(data)
+            out += b"%d 0 obj\n%s\nstream\n%s\nendstream\nendobj\n" % (number, dictionary, data)
+        else:
+            out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def page_hash(data: bytes) -> str:
+    with PDFParseSession(data) as session:
+        return session.page_hash(0)
+
+
+def test_unchanged_page_hashes_the_same():
+    assert page_hash(build_pdf(b"/Fm1 Do")) == page_hash(build_pdf(b"/Fm1 Do"))
+
+
+def test_form_xobject_edit_changes_hash():
+    assert page_hash(build_pdf(b"/Fm1 Do")) != page_hash(build_pdf(b"/Fm1 Do 1 0 0 RG"))
+
+
+def test_nested_form_xobject_edit_changes_hash():
+    original = page_hash(build_pdf(b"/Fm1 Do", b"0 0 m 5 5 l S"))
+    assert original != page_hash(build_pdf(b"/Fm1 Do", b"0 0 m 9 9 l S"))
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
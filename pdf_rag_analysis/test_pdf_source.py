@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import PDFExtractor, read_pdf_source
+
+DATA_DIR = Path(__file__).parent / "data"
+PO_PDF = DATA_DIR / "Purchase_Order_2025-12-12.pdf"
+
+
+def test_whole_bytes_view_is_not_copied():
+    data = PO_PDF.read_bytes()
+    read, name = read_pdf_source(memoryview(data))
+    assert read is data and name == "<memory>"
+
+
+def test_non_contiguous_views_keep_their_order():
+    data = b"0123456789"
+    assert read_pdf_source(memoryview(data)[::-1])[0] == b"9876543210"
+    assert read_pdf_source(memoryview(data)[::2])[0] == b"02468"
+    assert read_pdf_source(memoryview(data)[2:5])[0] == b"234"
+    assert read_pdf_source(memoryview(bytearray(data)))[0] == data
+
+
+def test_every_source_kind_reads_the_same():
+    data = PO_PDF.read_bytes()
+    stream = io.BytesIO(data)
+    stream.seek(100)
+    sources = [PO_PDF, str(PO_PDF), data, bytearray(data), memoryview(data), stream]
+    assert all(read_pdf_source(source)[0] == data for source in sources)
+    assert read_pdf_source(PO_PDF)[1] == PO_PDF.name
+
+
+def test_memory_input_extracts_like_the_file():
+    from_path = PDFExtractor().extract_pdf(PO_PDF)
+    from_view = PDFExtractor().extract_pdf(memoryview(PO_PDF.read_bytes()), name=PO_PDF.name)
+    assert len(from_view.items) == len(from_path.items)
+    assert from_view.total == from_path.total
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
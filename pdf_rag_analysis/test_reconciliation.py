@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import UNKNOWN_VENDOR, DocumentMetadata, ExtractedDocument, LineItem, LineItemTable
+from src.reconciliation import BatchReconciler, merge_shipments
+
+
+def make_document(doc_type, document_id, date, vendor, items=None, date_found=True):
+    items = items or [LineItem("A-1", "Widget", "pcs", 10, 2.0)]
+    metadata = DocumentMetadata(doc_type, document_id, date, vendor, "Buyer Ltd", date_found)
+    total = sum(item.total_price for item in items)
+    return ExtractedDocument(
+        metadata=metadata, items=LineItemTable.from_items(items), subtotal=total, total=total
+    )
+
+
+def po(document_id, date, vendor, **kwargs):
+    return make_document("PURCHASE_ORDER", document_id, date, vendor, **kwargs)
+
+
+def invoice(document_id, date, vendor, **kwargs):
+    return make_document("PROFORMA_INVOICE", document_id, date, vendor, **kwargs)
+
+
+def pairs(result):
+    return {group.po_name: (group.invoice_names, group.basis) for group in result.groups}
+
+
+def test_pairs_by_document_id():
+    documents = {
+        "po_a": po("1001", "2025-01-10", "Acme"),
+        "po_b": po("1002", "2025-01-10", "Acme"),
+        "pi_b": invoice("1002", "2025-03-01", "Other Vendor"),
+    }
+    result = BatchReconciler().pair(documents)
+    assert pairs(result) == {"po_b": (["pi_b"], "document_id")}
+    assert result.unmatched_pos == ["po_a"]
+
+
+def test_pairs_by_vendor_and_nearest_date():
+    documents = {
+        "po_jan": po("UNKNOWN", "2025-01-05", "Acme Supplies"),
+        "po_feb": po("UNKNOWN", "2025-02-01", "Acme Supplies"),
+        "po_other": po("UNKNOWN", "2025-02-01", "Beta Parts"),
+        "pi": invoice("UNKNOWN", "2025-02-03", "ACME supplies"),
+        "pi_late": invoice("UNKNOWN", "2025-06-01", "Acme Supplies"),
+    }
+    result = BatchReconciler(date_window_days=45).pair(documents)
+    assert pairs(result) == {"po_feb": (["pi"], "vendor_date")}
+    assert result.unmatched_invoices == ["pi_late"]
+
+
+def test_pairs_by_vendor_alone_when_undated():
+    documents = {
+        "po": po("UNKNOWN", "2025-01-05", "Acme"),
+        "pi": invoice("UNKNOWN", "2026-10-18", "Acme", date_found=False),
+    }
+    assert pairs(BatchReconciler().pair(documents)) == {"po": (["pi"], "vendor")}
+
+    documents["po_2"] = po("UNKNOWN", "2025-03-05", "Acme")
+    assert pairs(BatchReconciler().pair(documents)) == {}
+
+
+def test_extraction_day_is_not_a_date():
+    # A PO with no date carries the extraction day; it must not win by date
+    documents = {
+        "po_real": po("UNKNOWN", "2025-01-05", "Acme"),
+        "po_undated": po("UNKNOWN", "2025-02-01", "Acme", date_found=False),
+        "pi": invoice("UNKNOWN", "2025-02-01", "Acme"),
+    }
+    assert pairs(BatchReconciler(date_window_days=45).pair(documents)) == {"po_real": (["pi"], "vendor_date")}
+
+
+def test_unknown_vendor_is_never_paired():
+    documents = {
+        "po": po("UNKNOWN", "2025-01-05", UNKNOWN_VENDOR),
+        "pi_dated": invoice("UNKNOWN", "2025-01-06", UNKNOWN_VENDOR),
+        "pi_undated": invoice("UNKNOWN", "2025-01-06", UNKNOWN_VENDOR, date_found=False),
+    }
+    result = BatchReconciler().pair(documents)
+    assert result.groups == []
+    assert result.unmatched_pos == ["po"]
+    assert sorted(result.unmatched_invoices) == ["pi_dated", "pi_undated"]
+
+    # A quoted PO number still pairs them
+    documents["pi_dated"] = invoice("1001", "2025-01-06", UNKNOWN_VENDOR)
+    documents["po"] = po("1001", "2025-01-05", UNKNOWN_VENDOR)
+    assert pairs(BatchReconciler().pair(documents)) == {"po": (["pi_dated"], "document_id")}
+
+
+def test_sole_pair_is_always_compared():
+    documents = {
+        "po": po("UNKNOWN", "2025-01-05", "Acme Supplies"),
+        "pi": invoice("UNKNOWN", "2025-01-06", "ACME Supplies Ltd"),
+    }
+    result = BatchReconciler().reconcile(documents)
+    assert pairs(result) == {"po": (["pi"], "sole_pair")}
+    assert result.unmatched_pos == [] and result.unmatched_invoices == []
+    assert result.groups[0].comparison is not None
+    assert result.rollup['pairing_basis']['sole_pair'] == 1
+
+    # Also with no vendor on the invoice at all
+    documents["pi"] = invoice("UNKNOWN", "2025-01-06", UNKNOWN_VENDOR)
+    assert pairs(BatchReconciler().pair(documents)) == {"po": (["pi"], "sole_pair")}
+    assert BatchReconciler(pair_sole_documents=False).pair(documents).groups == []
+
+    # Only when exactly one of each is left over
+    documents["pi_2"] = invoice("UNKNOWN", "2025-01-07", "Someone Else")
+    assert BatchReconciler().pair(documents).groups == []
+
+
+def test_split_shipments_merge_by_normalised_sku():
+    first = invoice("2001", "2025-01-06", "Acme", items=[
+        LineItem("AB-12", "Widget", "pcs", 4, 2.0),
+        LineItem("UNKNOWN", "Bolt", "pcs", 10, 0.5),
+    ])
+    second = invoice("2002", "2025-01-09", "Acme", items=[
+        LineItem("ab12", "Widget", "pcs", 6, 2.0),
+        LineItem("UNKNOWN", "Nut", "pcs", 10, 0.1),
+        LineItem("", "Washer", "pcs", 5, 0.1),
+    ])
+    merged = merge_shipments([first, second])
+    rows = [(item.item_no, item.description, item.quantity) for item in merged.items]
+    assert rows == [
+        ("AB-12", "Widget", 10.0),
+        ("UNKNOWN", "Bolt", 10.0),
+        ("UNKNOWN", "Nut", 10.0),
+        ("", "Washer", 5.0),
+    ]
+    assert merged.metadata.document_id == "2001+2002"
+    assert merged.total == first.total + second.total
+
+
+def test_reconcile_compares_split_shipment_as_one_delivery():
+    documents = {
+        "po": po("3001", "2025-01-05", "Acme", items=[LineItem("AB-12", "Widget", "pcs", 10, 2.0)]),
+        "pi_1": invoice("3001", "2025-01-06", "Acme", items=[LineItem("AB-12", "Widget", "pcs", 4, 2.0)]),
+        "pi_2": invoice("UNKNOWN", "2025-01-09", "Acme", items=[LineItem("ab 12", "Widget", "pcs", 6, 2.0)]),
+    }
+    result = BatchReconciler().reconcile(documents)
+    assert pairs(result) == {"po": (["pi_1", "pi_2"], "document_id")}
+    assert result.rollup['split_shipments'] == 1
+    assert result.groups[0].comparison.discrepant_items == 0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
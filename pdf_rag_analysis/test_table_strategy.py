@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pdf_extractor import (
+    UNKNOWN_VENDOR, DocumentMetadata, LineItem, PDFExtractor, PDFParseSession
+)
+from src.extraction_cache import ExtractionCache
+from src.table_strategy import TABLE_STRATEGIES, TableStrategyMemo
+
+DATA_DIR = Path(__file__).parent / "data"
+PO_PDF = DATA_DIR / "Purchase_Order_2025-12-12.pdf"
+
+
+def test_unknown_vendor_falls_back_to_layout_fingerprint():
+    extractor = PDFExtractor(strategy_memo=TableStrategyMemo())
+    with PDFParseSession(PO_PDF) as session:
+        unknown = DocumentMetadata("PURCHASE_ORDER", "1", "2025-12-12", UNKNOWN_VENDOR, "")
+        known = DocumentMetadata("PURCHASE_ORDER", "1", "2025-12-12", "Acme  Supplies", "")
+        assert extractor._layout_fingerprint(session, unknown).startswith("layout:PURCHASE_ORDER:")
+        assert extractor._layout_fingerprint(session, known) == "vendor:acme supplies"
+
+
+def test_cache_key_depends_on_strategy_mode(tmp_path):
+    data = PO_PDF.read_bytes()
+    cache = ExtractionCache(tmp_path)
+    plain = PDFExtractor(cache=cache)
+    adaptive = PDFExtractor(cache=cache, strategy_memo=TableStrategyMemo())
+    assert cache.key_for(data, plain._cache_variant()) != cache.key_for(data, adaptive._cache_variant())
+
+    plain.extract_pdf(PO_PDF)
+    assert cache.get(cache.key_for(data, adaptive._cache_variant())) is None
+    adaptive.extract_pdf(PO_PDF)
+    assert cache.get(cache.key_for(data, adaptive._cache_variant())) is not None
+
+
+class _ScriptedExtractor(PDFExtractor):
+    """Each strategy reports its own totals table; only the last yields items"""
+
+    def iter_line_items(self, session, totals=None, table_settings=None):
+        name = next(name for name, settings in TABLE_STRATEGIES if settings == table_settings)
+        if name == 'lines':
+            totals.update({'total': 999.0, 'tax': 99.0})
+            return
+        totals.update({'total': 10.0})
+        if name == 'text':
+            yield LineItem("A1", "Widget", "pcs", 1, 10.0)
+
+
+def test_failed_strategy_totals_are_discarded():
+    extractor = _ScriptedExtractor(strategy_memo=TableStrategyMemo())
+    metadata = DocumentMetadata("PURCHASE_ORDER", "1", "2025-12-12", "Acme", "")
+    totals = extractor._empty_totals()
+    with PDFParseSession(PO_PDF) as session:
+        items = extractor._extract_items_adaptive(session, metadata, totals)
+    assert len(items) == 1
+    assert totals['total'] == 10.0
+    assert totals['tax'] == 0.0
+    assert extractor.strategy_memo.get("vendor:acme") == 'text'
+
+
+def test_path_source_reaches_the_session():
+    seen = []
+
+    class SpyExtractor(PDFExtractor):
+        def extract_session(self, session):
+            seen.append((session.pdf_path, session.name))
+            return super().extract_session(session)
+
+    from_path = SpyExtractor().extract_pdf(PO_PDF)
+    from_bytes = SpyExtractor().extract_pdf(PO_PDF.read_bytes(), name=PO_PDF.name)
+    # Page workers get the path to open, not a pickled copy of the bytes
+    assert seen == [(PO_PDF, PO_PDF.name), (None, PO_PDF.name)]
+    assert [item.to_item() if hasattr(item, 'to_item') else item for item in from_path.items] == \
+        [item.to_item() if hasattr(item, 'to_item') else item for item in from_bytes.items]
+
+
+def test_column_plans_are_bounded():
+    from src import pdf_extractor
+    saved = pdf_extractor.MAX_COLUMN_PLANS, pdf_extractor._COLUMN_PLANS
+    pdf_extractor.MAX_COLUMN_PLANS, pdf_extractor._COLUMN_PLANS = 3, pdf_extractor.OrderedDict()
+    try:
+        extractor = PDFExtractor()
+        headers = [["SKU", "Description", "Qty", f"Unit Price {i}"] for i in range(5)]
+        for header in headers[:3]:
+            extractor._column_plan(header)
+        # Using the first layout again keeps it over the second
+        first = extractor._column_plan(headers[0])
+        for header in headers[3:]:
+            extractor._column_plan(header)
+        assert len(pdf_extractor._COLUMN_PLANS) == 3
+        assert extractor._column_plan(headers[0]) is first
+        assert first.quantity == 2 and first.unit_price == 3
+        kept = {signature[3] for signature in pdf_extractor._COLUMN_PLANS}
+        assert kept == {"unit price 0", "unit price 3", "unit price 4"}
+    finally:
+        pdf_extractor.MAX_COLUMN_PLANS, pdf_extractor._COLUMN_PLANS = saved
+
+
+class ReleaseSpySession(PDFParseSession):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.released = []
+
+    def release_page(self, index):
+        self.released.append(index)
+        super().release_page(index)
+
+
+def test_pages_are_released_when_parsing_fails():
+    class FailingExtractor(PDFExtractor):
+        def _parse_table_custom(self, table):
+            raise ValueError("bad row")
+
+    with ReleaseSpySession(PO_PDF) as session:
+        try:
+            list(FailingExtractor().iter_line_items(session))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("the parse error should propagate")
+        assert session.released == [0]
+        assert not session._page_tables
+
+
+def test_pages_are_released_when_the_consumer_stops_early():
+    with ReleaseSpySession(PO_PDF) as session:
+        items = PDFExtractor().iter_line_items(session)
+        assert next(items) is not None
+        items.close()
+        assert session.released == [0]
+        assert not session._page_tables
+
+
+class HeldPool:
+    """Runs the first submitted task in-process and leaves the rest queued"""
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        if not self.futures:
+            future.set_result(fn(*args))
+        self.futures.append(future)
+        return future
+
+
+def test_closing_prefetch_cancels_queued_pages():
+    class ThreePageSession(PDFParseSession):
+        page_count = 3
+
+    pool = HeldPool()
+    with ThreePageSession(PO_PDF) as session:
+        pages = session.prefetch_tables(2, pages_per_task=1, pool=pool)
+        assert next(pages) == 0
+        pages.close()
+        assert [future.cancelled() for future in pool.futures] == [False, True, True]
+        assert session.pages_touched == {0} and not session.page_pool_failed
+
+
+def test_page_pool_is_shared_by_path_documents():
+    extractor = PDFExtractor(page_workers=2)
+    pool = extractor._shared_page_pool(2)
+    try:
+        assert extractor._shared_page_pool(2) is pool
+        for pdf in sorted(DATA_DIR.glob("*.pdf")):
+            with PDFParseSession(pdf) as session, PDFParseSession(pdf) as expected:
+                assert list(session.prefetch_tables(2, pool=pool)) == list(range(session.page_count))
+                assert not session.page_pool_failed
+                assert session._page_tables == {
+                    session._tables_key(index, None): expected.page_tables(index)
+                    for index in range(expected.page_count)
+                }
+        # In-memory input brings its own pool
+        with PDFParseSession(PO_PDF.read_bytes()) as session:
+            assert list(session.prefetch_tables(2, pool=pool)) == list(range(session.page_count))
+            assert session._page_tables
+    finally:
+        extractor.close()
+    assert extractor._page_pool is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            if test.__code__.co_argcount:
+                with tempfile.TemporaryDirectory() as tmp:
+                    test(Path(tmp))
+            else:
+                test()
+            print(f"[OK] {name}")
@@ -187,7 +187,6 @@ import os
 import sys
 import streamlit as st
 from pathlib import Path
-import tempfile
 import json
 
 # ✅ FIX PYTHON PATH FOR STREAMLIT
@@ -309,21 +308,15 @@ with st.sidebar:
         if st.button("🔄 Process PDFs", key="process_pdfs"):
             with st.spinner("Processing PDFs..."):
                 try:
+                    extractor = PDFExtractor()
                     for uploaded_file in uploaded_files:
-                        # Read file content
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                            tmp_file.write(uploaded_file.read())
-                            tmp_path = tmp_file.name
+                        # Extract straight from the upload buffer (no temp file)
+                        doc = extractor.extract_pdf(uploaded_file.getvalue(), name=uploaded_file.name)
                         
-                        # Extract content
-                        extractor = PDFExtractor()
-                        pdf_data = extractor.extract_from_file(tmp_path)
-                        
-                        # Store in session
-                        st.session_state.pdf_content[uploaded_file.name] = pdf_data
-                        
-                        # Clean up
-                        os.unlink(tmp_path)
+                        # Store in session; the page-indexed text is joined only when read
+                        st.session_state.pdf_content[uploaded_file.name] = {
+                            "document": doc,
+                        }
                     
                     st.success(f"✅ Processed {len(uploaded_files)} PDF(s)")
                 except Exception as e:
@@ -388,7 +381,7 @@ else:
                     for doc_name, content in st.session_state.pdf_content.items():
                         rag_system.add_document(
                             doc_id=doc_name.replace(".pdf", ""),
-                            content=content.get("text", ""),
+                            content=str(content["document"].raw_text),
                             metadata={"source": doc_name}
                         )
                     